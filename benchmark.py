@@ -0,0 +1,76 @@
+"""
+Benchmark model providers on real step 3 prompts
+
+Replays the step 3 prompts of the first industries in output/industry_videos.csv
+(synthetic prompts if it does not exist yet) against MODEL_CONFIGS entries at
+several concurrency levels, and reports latency percentiles, time to first
+token, output tokens/s, error and throttle rates and cost per prompt.
+
+Usage:
+    python benchmark.py nova claude deepseek
+    python benchmark.py nova --concurrency 1 8 16 --prompts 4 --repeat 2
+    python benchmark.py mock --csv output/benchmark.csv     # offline, against a simulated provider
+"""
+
+import os
+import sys
+import argparse
+import logging
+import pandas as pd
+from config.config import BENCHMARK_CONFIG, MODEL_CONFIGS
+from main import build_industry_prompt
+from src.artifacts import load_artifact
+from src.benchmark import MOCK_MODEL, ProviderBenchmark
+from src.video_records import VideoCollection
+
+logging.basicConfig(level=logging.WARNING)
+logger = logging.getLogger(__name__)
+
+def load_prompts(count):
+    """(industry, prefix, prompt) for the first `count` industries of industry_videos.csv"""
+    filepath = os.path.join('output', 'industry_videos.csv')
+    if os.path.exists(filepath):
+        videos = VideoCollection.from_dataframe(load_artifact(filepath, columns=['industry', 'title', 'description']))
+    else:
+        print(f"{filepath} not found; using synthetic prompts (run main.py steps 1-2 for real ones)\n")
+        videos = VideoCollection.from_records(
+            {'industry': f"IND{i}", 'title': f"Synthetic session {i}-{j}",
+             'description': "How a customer built an analytics platform on Amazon S3, AWS Glue and Amazon Bedrock. " * 8}
+            for i in range(count) for j in range(4))
+    prompts = []
+    for industry, industry_videos in list(videos.group_by_industry().items())[:count]:
+        prefix, prompt = build_industry_prompt(industry, industry_videos)
+        prompts.append((industry, prefix, prompt))
+    return prompts
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark latency, throughput and cost of model providers")
+    parser.add_argument('models', nargs='+', help=f"Models to benchmark: {', '.join(MODEL_CONFIGS)}, or {MOCK_MODEL} (simulated, offline)")
+    parser.add_argument('--concurrency', type=int, nargs='+', default=BENCHMARK_CONFIG['concurrency_levels'],
+                        help="Concurrency levels (default: %(default)s)")
+    parser.add_argument('--prompts', type=int, default=BENCHMARK_CONFIG['prompts'],
+                        help="Number of step 3 prompts (default: %(default)s)")
+    parser.add_argument('--repeat', type=int, default=BENCHMARK_CONFIG['repeat'],
+                        help="Times each prompt is sent per level (default: %(default)s)")
+    parser.add_argument('--csv', help="Also write every request's measurements to this CSV file")
+    args = parser.parse_args()
+
+    unknown = [model for model in args.models if model not in MODEL_CONFIGS and model != MOCK_MODEL]
+    if unknown:
+        parser.error(f"Unknown models: {', '.join(unknown)}")
+
+    prompts = load_prompts(args.prompts)
+    benchmark = ProviderBenchmark(prompts, {'repeat': args.repeat})
+    rows, samples = benchmark.run(args.models, args.concurrency)
+    if not rows:
+        print("No model could be benchmarked (see errors above)")
+        sys.exit(1)
+
+    print(f"{len(prompts)} prompts x {args.repeat} per level\n")
+    print(ProviderBenchmark.format_report(rows))
+    if args.csv:
+        pd.DataFrame(samples).to_csv(args.csv, index=False)
+        print(f"\nPer-request measurements written to {args.csv}")
+
+if __name__ == "__main__":
+    main()
@@ -11,30 +11,63 @@ AWS_SECRET_ACCESS_KEY = os.getenv('AWS_SECRET_ACCESS_KEY')
 AWS_REGION = os.getenv('AWS_REGION')
 
 # Model configurations
+# 'price_per_1k_tokens' holds on-demand USD list prices used for cost reports and estimates;
+# update them if your pricing differs.
 MODEL_CONFIGS = {
     'nova': {
         'name': 'nova',
         'type': 'bedrock',
         'model_id': 'us.amazon.nova-pro-v1:0',
         'max_tokens': 4000,
+        'prompt_caching': True,  # emit Bedrock cachePoint after the static prompt prefix
         'content_type': 'application/json',
-        'accept': 'application/json'
+        'accept': 'application/json',
+        'price_per_1k_tokens': {'input': 0.0008, 'output': 0.0032, 'cache_read': 0.0002},
+        # Step 3 jobs at or below both limits go to the cheaper model; larger ones stay on this one
+        'tiering': {'small_model': 'nova-lite', 'max_videos': 5, 'max_input_tokens': 4000}
+    },
+    'nova-lite': {
+        'name': 'nova-lite',  # cheaper/faster Nova: transcript summaries and small step 3 jobs
+        'type': 'bedrock',
+        'request_format': 'nova',
+        'model_id': 'us.amazon.nova-lite-v1:0',
+        'max_tokens': 4000,
+        'prompt_caching': True,
+        'content_type': 'application/json',
+        'accept': 'application/json',
+        'price_per_1k_tokens': {'input': 0.00006, 'output': 0.00024, 'cache_read': 0.000015}
     },
     'claude': {
         'name': 'claude',
         'type': 'bedrock',
         'model_id': 'us.anthropic.claude-3-5-sonnet-20241022-v2:0', # e.g., us.anthropic.claude-3-sonnet-20240229-v1:0 or us.anthropic.claude-3-5-sonnet-20241022-v2:0
         'max_tokens': 4000,
+        'prompt_caching': False,  # Bedrock prompt caching is not generally available for Claude 3.5 Sonnet v2; enable for 3.7+
         'anthropic_version': 'bedrock-2023-05-31',
         'content_type': 'application/json',
-        'accept': 'application/json'
+        'accept': 'application/json',
+        'price_per_1k_tokens': {'input': 0.003, 'output': 0.015, 'cache_read': 0.0003},
+        'tiering': {'small_model': 'haiku', 'max_videos': 5, 'max_input_tokens': 4000}
+    },
+    'haiku': {
+        'name': 'haiku',
+        'type': 'bedrock',
+        'request_format': 'claude',
+        'model_id': 'us.anthropic.claude-3-5-haiku-20241022-v1:0',
+        'max_tokens': 4000,
+        'prompt_caching': True,  # emit cache_control after the static prompt prefix
+        'anthropic_version': 'bedrock-2023-05-31',
+        'content_type': 'application/json',
+        'accept': 'application/json',
+        'price_per_1k_tokens': {'input': 0.0008, 'output': 0.004, 'cache_read': 0.00008}
     },
     'qwen': {
         'name': 'qwen', # https://qwenlm.github.io/blog/qwen2.5/ for more information about context length and output max tokens, 7B supports 128K context length and 8k output max tokens
         'type': 'sagemaker',
         'endpoint_name': 'DMAA-Model-qwen2-5-7b-instruct-endpoint',
         'max_tokens': 4000, # 8196 is the max tokens for qwen2.5 7B
-        'request_format': 'qwen'
+        'request_format': 'qwen',
+        'price_per_1k_tokens': {'input': 0, 'output': 0}  # self-hosted endpoint, billed per instance-hour
     },
     'openai': {
         'name': 'openai', # we are actually using DeepSeek v3
@@ -42,7 +75,8 @@ MODEL_CONFIGS = {
         'model_id': 'gpt-4-turbo-preview',  # Need to test
         'max_tokens': 4000,
         'api_key': os.getenv('OPENAI_API_KEY', 'sk-default-key-please-replace-with-real-key'), 
-        'temperature': 0.7
+        'temperature': 0.7,
+        'price_per_1k_tokens': {'input': 0.01, 'output': 0.03}
     },
     'deepseek': {
         'name': 'deepseek',
@@ -51,7 +85,8 @@ MODEL_CONFIGS = {
         'max_tokens': 4000,
         'api_key': os.getenv('DEEPSEEK_API_KEY'),
         'temperature': 0.7,
-        'base_url': 'https://api.deepseek.com'  # You can also use https://api.deepseek.com/v1
+        'base_url': 'https://api.deepseek.com',  # You can also use https://api.deepseek.com/v1
+        'price_per_1k_tokens': {'input': 0.00027, 'output': 0.0011, 'cache_read': 0.00007}
     },
     'openrouter': {
         'name': 'openrouter',
@@ -60,7 +95,8 @@ MODEL_CONFIGS = {
         'max_tokens': 4000,
         'api_key': os.getenv('OPENROUTER_API_KEY'),
         'base_url': 'https://openrouter.ai/api/v1',
-        'temperature': 0.7
+        'temperature': 0.7,
+        'price_per_1k_tokens': {'input': 0.00027, 'output': 0.0011}
     },
     # #add new Openai-compatible model here
     # 'new_model': {
@@ -94,4 +130,198 @@ INDUSTRY_KEYWORDS = [
     "(SPT",  # Sports
     "(TLC",  # Telecom
     "(WPS",  # Government
-]
\ No newline at end of file
+]
+
+# Local full-text search index over videos, transcripts and insights (see search.py)
+SEARCH_INDEX_PATH = os.path.join('output', 'search_index.db')
+
+# Async API (ModelManager.agenerate_response) limits
+ASYNC_MAX_IN_FLIGHT = 256  # concurrent requests per event loop / pooled HTTP connections
+ASYNC_EXECUTOR_WORKERS = 32  # threads serving blocking Bedrock/SageMaker calls
+
+# Cache for intermediate LLM results (transcript summaries, ...)
+CACHE_DB_PATH = os.path.join('output', 'cache', 'results.db')
+
+# Batch transcript summarization (runs between step 2 and step 3 when enabled)
+SUMMARY_CONFIG = {
+    'enabled': False,  # fetch transcripts and feed dense per-video summaries to step 3
+    'method': 'llm',  # 'llm': summarize with 'model'; 'extractive': local sentence ranking, no model calls
+    'model': 'nova-lite',  # any MODEL_CONFIGS entry; a small model is usually enough
+    'chunk_tokens': 3000,  # transcripts longer than this are split and summarized chunk by chunk
+    'summary_words': 150,  # target length of the final per-video summary
+    'max_concurrency': 8,  # chunk summaries in flight at once
+    'max_videos_in_flight': 32,  # videos whose source text is loaded at once
+    'transcript_delay_seconds': 1  # pause between transcript API calls
+}
+
+# Hierarchical (tree) reduce used by InsightGenerator.generate_insights
+REDUCE_CONFIG = {
+    'batch_tokens': 6000,  # input budget of a single reduce call
+    'boundary_divisor': 8,  # content-defined batch boundary every ~8 summaries on average
+    'partial_words': 400,  # target length of intermediate syntheses
+    'max_concurrency': 8  # reduce calls in flight at once within a level
+}
+
+# Declared column dtypes of the step outputs, used when loading them back (src/artifacts.py)
+ARTIFACT_SCHEMAS = {
+    'all_videos.csv': {'title': str, 'video_id': str, 'description': str,
+                       'duration_seconds': 'float64', 'view_count': 'float64', 'published_at': str},
+    'industry_videos.csv': {'industry': 'category', 'title': str, 'video_id': str, 'description': str,
+                            'duration_seconds': 'float64', 'view_count': 'float64', 'published_at': str},
+    'video_summaries.csv': {'industry': 'category', 'video_id': str, 'title': str, 'summary': str,
+                            'source': 'category', 'source_tokens': 'int64', 'summary_tokens': 'int64',
+                            'chunks': 'int32', 'content_hash': str},
+    'industry_insights.csv': {'industry': 'category', 'video_count': 'int32', 'video_titles': str, 'insights': str},
+    'video_insights.csv': {'industry': 'category', 'video_id': str, 'title': str, 'use_case': str,
+                           'aws_services': str, 'customer': str},
+}
+
+# Memory-mapped binary copies of loaded CSVs so warm reruns skip CSV parsing
+ARTIFACT_SIDECARS_ENABLED = True
+ARTIFACT_SIDECAR_DIR = os.path.join('output', 'cache', 'sidecars')
+
+# Coalesce concurrent identical LLM requests (same model + whitespace-normalized prompt) into one call
+SINGLE_FLIGHT_ENABLED = True
+
+# Route small step 3 jobs to each model's 'tiering' small_model (see MODEL_CONFIGS)
+MODEL_TIERING_ENABLED = True
+
+# Assumptions of the dry-run planner (python main.py --plan)
+PLAN_CONFIG = {
+    'step3_output_tokens_base': 400,  # the conclusion section of a step 3 answer
+    'step3_output_tokens_per_video': 150,  # one Use Case / Solution / Customer Story block
+    'step4_output_tokens': 1500,
+    'first_token_seconds': 1.0,
+    'input_tokens_per_second': 5000,
+    'output_tokens_per_second': {'default': 50, 'nova-lite': 120, 'haiku': 100},
+    'step3_concurrency': 1,  # main.py sends step 3 requests one industry at a time
+    'requests_per_minute': None  # provider rate limit; None for unlimited
+}
+
+# Lease-based work queue for distributed step 3 (python main.py --coordinator / --worker).
+# Keep the database on a filesystem shared by every worker machine.
+WORK_QUEUE_DB_PATH = os.path.join('output', 'cache', 'work_queue.db')
+WORK_QUEUE_CONFIG = {
+    'lease_seconds': 300,  # a job is reclaimed if its worker stops heartbeating for this long
+    'heartbeat_seconds': 60,
+    'max_attempts': 3,  # after this many failed attempts a job is marked failed
+    'poll_seconds': 5,
+    'idle_timeout_seconds': 600,  # a worker exits after waiting this long for a job
+    'coordinator_timeout_seconds': 4 * 3600  # the coordinator gives up after this long (None waits forever)
+}
+
+# videos.list enrichment (duration, view count, publish date) after step 1
+YOUTUBE_ENRICH_CONFIG = {
+    'enabled': True,
+    'batch_size': 50,  # IDs per videos.list call (API maximum)
+    'max_concurrency': 4,
+    'max_requests': 200,  # quota budget per run; each call costs 1 unit of the 10,000/day default
+    'ttl_seconds': 7 * 24 * 3600,  # refresh cached metadata (view counts change) after a week
+    'backfill_cached': False  # also enrich an existing all_videos.csv that has no metadata (needs the network)
+}
+
+# Continue a truncated (max_tokens) or structurally incomplete answer at most this many times
+MAX_CONTINUATIONS = 2
+
+# Retries and circuit breaking for model calls (see src/resilience.py)
+RESILIENCE_CONFIG = {
+    'max_attempts': 3,  # per call, including the first
+    'retry_budget': 50,  # retries allowed across the whole run
+    'max_backoff_seconds': 30,
+    'max_retry_after_seconds': 60,  # cap on provider Retry-After hints
+    'breaker_failure_threshold': 5,  # consecutive transient/throttling errors before a provider's breaker opens
+    'breaker_reset_seconds': 60  # how long an open breaker fails fast before letting a probe call through
+}
+
+# Structured step 3/4: per-video JSON records (cached by video_id and content) rolled up per industry,
+# so a new or changed video costs one small call instead of regenerating its industry's analysis
+STRUCTURED_INSIGHTS_CONFIG = {
+    'enabled': False,
+    'max_concurrency': 8
+}
+
+# Record/replay of external calls (python main.py --record / --replay <log dir>, see src/cassette.py)
+CASSETTE_CONFIG = {
+    'filename': 'cassette.jsonl.gz',  # written to the run's log directory
+    'compresslevel': 6
+}
+
+# Packed transcript corpus written by step 2b (src/transcript_corpus.py): one append-only
+# data file plus a video_id -> offset index, memory-mapped by readers
+TRANSCRIPT_CORPUS_CONFIG = {
+    'enabled': True,  # False keeps transcripts in memory as a column, as before
+    'path': os.path.join('output', 'cache', 'transcripts'),  # .data and .index are appended
+    'compression': 'zlib',  # None stores plain UTF-8 (get_view then returns the text bytes)
+    'compresslevel': 6
+}
+
+# Local extractive transcript compression (SUMMARY_CONFIG['method'] = 'extractive', src/extractive_summarizer.py):
+# TF-IDF TextRank sentence ranking on a process pool, boosted for AWS services and customer mentions
+EXTRACTIVE_CONFIG = {
+    'token_budget': 1500,  # per-video summary size
+    'min_words': 8,  # caption fragments are merged into sentences of at least this many words
+    'max_words': 60,
+    'max_features': 4000,  # vocabulary size of the TF-IDF matrix
+    'max_workers': None,  # pool processes (None: one per CPU; 1 runs in-process)
+    'min_videos_for_pool': 8,  # smaller batches are not worth starting processes for
+    'service_weight': 0.5,  # score boost per distinct AWS service named (up to 3)
+    'customer_weight': 0.5,  # score boost for naming a customer or partner
+    'service_terms': [
+        'AWS', 'Amazon', 'Bedrock', 'SageMaker', 'Lambda', 'S3', 'EC2', 'ECS', 'EKS', 'Fargate', 'DynamoDB',
+        'Aurora', 'RDS', 'Redshift', 'Athena', 'Glue', 'EMR', 'Kinesis', 'MSK', 'OpenSearch', 'QuickSight',
+        'Lake Formation', 'DataZone', 'Clean Rooms', 'IoT Core', 'IoT Greengrass', 'SiteWise', 'Outposts',
+        'Step Functions', 'EventBridge', 'SQS', 'SNS', 'API Gateway', 'CloudFront', 'Amazon Connect', 'Textract',
+        'Comprehend', 'Rekognition', 'Transcribe', 'Polly', 'Kendra', 'Amazon Q', 'HealthLake', 'Omics',
+        'HealthOmics', 'Trainium', 'Inferentia', 'Graviton', 'Nova', 'Titan', 'Claude', 'Anthropic',
+        'HyperPod', 'Marketplace', 'Control Tower', 'CloudWatch', 'Security Hub', 'GuardDuty'
+    ],
+    'customer_terms': [
+        'customer', 'customers', 'partner', 'partnership', 'our company', 'we built', 'we use', 'case study',
+        'in production', 'at scale', 'migrated', 'CEO', 'CTO', 'CIO', 'founder'
+    ]
+}
+
+# Provider benchmark (python benchmark.py, see src/benchmark.py)
+BENCHMARK_CONFIG = {
+    'prompts': 8,  # step 3 prompts replayed, taken from the first industries of industry_videos.csv
+    'concurrency_levels': [1, 4, 8],
+    'repeat': 1,  # times each prompt is sent per concurrency level
+    # Simulated provider benchmarked as `python benchmark.py mock` (no network; tests the harness)
+    'mock': {
+        'max_tokens': 4000,
+        'price_per_1k_tokens': {'input': 0.0008, 'output': 0.0032},  # nominal, so cost reporting is exercised
+        'first_token_seconds': 0.3,
+        'input_tokens_per_second': 20000,  # prompt processing before the first token
+        'output_tokens_per_second': 150,
+        'output_tokens': 300,  # +/-20% per call
+        'max_in_flight': 8,  # concurrent calls beyond this are throttled (429)
+        'throttle_rate': 0.0,  # share of calls throttled at random
+        'error_rate': 0.0,  # share of calls failing with a 503
+        'seed': 0
+    }
+}
+
+# Serve mode (python main.py --serve): resident pipeline with periodic incremental refresh and a local JSON API
+SERVE_CONFIG = {
+    'host': '127.0.0.1',
+    'port': 8080,
+    'refresh_seconds': 3600  # refetch the playlist and regenerate changed industries this often
+}
+
+# Background client setup while steps 1-2 run (credentials, clients, warm connections)
+PREWARM_CONFIG = {
+    'enabled': True,
+    # 'none': build clients only; 'connect': also list models (OpenAI-compatible clients only);
+    # 'probe': send a billed one-token request, which also warms the Bedrock client's pool (opt-in)
+    'mode': 'connect',
+    'timeout_seconds': 30  # step 3 waits at most this long for prewarming, then builds its own clients
+}
+
+# Opt-in reuse of model responses for near-identical prompts (src/semantic_cache.py)
+SEMANTIC_CACHE_CONFIG = {
+    'enabled': False,
+    'threshold': 0.97,  # minimum cosine similarity of the canonical video content to reuse a response
+    'dimensions': 4096,  # size of the hashing vectors
+    'ngram': 2,  # hash word unigrams and bigrams
+    'max_entries_per_scope': 5000  # most recent entries compared per model/instructions/template
+}
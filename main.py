@@ -1,148 +1,429 @@
 from src.youtube_client import YouTubeClient
 from src.video_processor import VideoProcessor
 from src.output_manager import OutputManager
+from src.search_index import SearchIndex
+from src.summarizer import VideoSummarizer
+from src.extractive_summarizer import ExtractiveSummarizer
+from src.video_records import VideoCollection
+from src.artifacts import load_artifact
+from src.model_tiering import TierStats, choose_model
+from src.cassette import CASSETTE
+from src.profiler import TRACER, span, traced_step
+from src.resilience import log_resilience_stats
+from src.run_planner import RunPlanner
+from src.video_insights import VideoInsightExtractor, render_industry_insight
+from src.work_queue import Heartbeat, WorkQueue, default_worker_id
+from src.text_utils import content_hash, estimate_tokens
+from src.transcript_corpus import TranscriptCorpus
+from src.serve import PipelineServer
+from src.prewarm import ClientPrewarmer
 from config.config import (
     PLAYLIST_ID, 
     MODEL_CONFIGS, 
+    SERVE_CONFIG,
+    SUMMARY_CONFIG,
+    TRANSCRIPT_CORPUS_CONFIG,
+    STRUCTURED_INSIGHTS_CONFIG,
+    WORK_QUEUE_CONFIG,
+    YOUTUBE_ENRICH_CONFIG,
 )
-import pandas as pd
 import os
 import sys
+import argparse
+import subprocess
+import time
 import logging
 from src.model_manager import ModelManager
 
-# Setup logging
-logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
-def check_file_exists(filename):
+# Column order of industry_insights.csv
+INSIGHT_COLUMNS = ['industry', 'video_count', 'video_titles', 'insights']
+
+# Work queue holding one step 3 job per industry
+STEP3_QUEUE = 'step3'
+
+def check_file_exists(filename, columns=None):
     """
     Check if a file exists in the output directory
     Args:
         filename: Name of the file to check
+        columns: Optional list of columns to load (all columns by default)
     Returns:
         tuple: (exists, dataframe if exists else None)
     """
     filepath = os.path.join('output', filename)
+    if CASSETTE.active and os.path.exists(filepath):
+        # Recorded and replayed runs redo every step, so the cassette covers all external calls
+        logger.info(f"Not reusing {filename} while recording or replaying")
+        return False, None
     if os.path.exists(filepath):
         logger.info(f"Found existing file: {filename}")
-        return True, pd.read_csv(filepath)
+        with span('load_artifact', 'io', file=filename):
+            return True, load_artifact(filepath, columns=columns)
     return False, None
 
-def step1_get_videos(youtube_client, output_manager):
+def update_search_index(search_index, records, kind='video'):
+    """
+    Incrementally add step output rows to the local search index
+    Args:
+        search_index: SearchIndex instance, or None to skip indexing
+        records: List of video or insight dictionaries
+        kind: 'video' or 'insight'
+    """
+    if search_index is None:
+        return
+    try:
+        with span('update_search_index', 'io', kind=kind, records=len(records) if hasattr(records, '__len__') else None):
+            if kind == 'insight':
+                search_index.index_insights(records)
+            else:
+                search_index.index_videos(records)
+    except Exception as e:
+        # The index is a convenience for analysts; never fail a pipeline step because of it
+        logger.warning(f"Failed to update search index: {str(e)}")
+
+def has_video_metadata(videos):
+    """True if enrichment added metadata to at least one video (a failed enrichment leaves the columns empty)"""
+    videos = VideoCollection.ensure(videos)
+    return 'view_count' in videos.columns and any(
+        value is not None and value == value for value in videos.column('view_count'))
+
+@traced_step
+def step1_get_videos(youtube_client, output_manager, search_index=None):
     """
     Step 1: Get all videos from YouTube playlist
     Returns:
-        list: List of video dictionaries
+        VideoCollection: All playlist videos
     """
     # Check if we already have the videos
     exists, df = check_file_exists('all_videos.csv')
     if exists:
         logger.info("Using existing all_videos.csv")
-        return df.to_dict('records')
-    
-    # If not, fetch from YouTube
-    logger.info("Fetching playlist videos from YouTube...")
-    videos = youtube_client.get_playlist_videos(PLAYLIST_ID)
-    logger.info(f"Found {len(videos)} videos")
+        with span('VideoCollection.from_dataframe', 'pandas', rows=len(df)):
+            videos = VideoCollection.from_dataframe(df)
+        if (not YOUTUBE_ENRICH_CONFIG['enabled'] or not YOUTUBE_ENRICH_CONFIG['backfill_cached']
+                or has_video_metadata(videos)):
+            update_search_index(search_index, videos)
+            return videos
+        # Written without metadata (before enrichment existed, or every call failed): add it and save again
+        logger.info("Adding video metadata to existing all_videos.csv...")
+        enriched = youtube_client.enrich_videos(videos)
+        if not has_video_metadata(enriched):
+            # Keep the file as it is, so the next run tries again
+            logger.warning("Could not fetch any video metadata; all_videos.csv is left unchanged")
+            update_search_index(search_index, videos)
+            return videos
+        videos = enriched
+    else:
+        # If not, fetch from YouTube
+        logger.info("Fetching playlist videos from YouTube...")
+        videos = youtube_client.get_playlist_videos(PLAYLIST_ID)
+        logger.info(f"Found {len(videos)} videos")
+        
+        # Duration, view count and publish date (cached per video, ~1 call per 50 videos)
+        if YOUTUBE_ENRICH_CONFIG['enabled']:
+            videos = youtube_client.enrich_videos(videos)
     
     # Save to CSV
     output_manager.save_to_csv(videos, 'all_videos.csv')
+    update_search_index(search_index, videos)
     return videos
 
-def step2_filter_industry_videos(video_processor, videos, output_manager):
+@traced_step
+def step2_filter_industry_videos(video_processor, videos, output_manager, search_index=None):
     """
     Step 2: Filter industry-related videos
     Args:
         videos: List of all videos
     Returns:
-        list: List of industry-related videos
+        VideoCollection: Industry-related videos, sorted by industry
     """
     # Check if we already have the industry videos
     exists, df = check_file_exists('industry_videos.csv')
     if exists:
         logger.info("Using existing industry_videos.csv")
-        return df.to_dict('records')
+        with span('VideoCollection.from_dataframe', 'pandas', rows=len(df)):
+            industry_videos = VideoCollection.from_dataframe(df)
+        update_search_index(search_index, industry_videos)
+        return industry_videos
     
     # If not, process videos
     logger.info("Filtering industry-related videos...")
     industry_videos = video_processor.classify_by_keywords(videos)
     
-    # Convert to DataFrame and sort by industry
-    industry_videos_df = pd.DataFrame(industry_videos)
-    industry_videos = industry_videos_df.sort_values('industry').to_dict('records')
+    # Sort by industry (a view over the same records, nothing is copied)
+    industry_videos = industry_videos.sort_by_industry()
     logger.info(f"Found {len(industry_videos)} industry-related videos")
     
     # Save to CSV
     output_manager.save_to_csv(industry_videos, 'industry_videos.csv')
+    update_search_index(search_index, industry_videos)
     return industry_videos
 
-def generate_industry_insights(videos, model_config):
-    """Generate insights for each industry"""
-    model_manager = ModelManager(model_config)
+@traced_step
+def step2b_summarize_videos(youtube_client, industry_videos, output_manager, search_index=None):
+    """
+    Step 2b (optional, SUMMARY_CONFIG['enabled']): Summarize transcripts into dense per-video summaries
+    Args:
+        industry_videos: List of industry-related videos
+    Returns:
+        VideoCollection: Industry videos with a 'summary' column (None where no summary is available)
+    """
+    # Check if we already have the summaries
+    exists, df = check_file_exists('video_summaries.csv', columns=['video_id', 'summary'])
+    if exists:
+        logger.info("Using existing video_summaries.csv")
+        summaries = df.to_dict('records')
+    else:
+        summaries = summarize_industry_videos(youtube_client, industry_videos, search_index)
+        
+        # Save to CSV
+        output_manager.save_to_csv(summaries, 'video_summaries.csv')
     
-    # Group by industry
-    industry_groups = {}
-    for video in videos:
-        industry = video['industry']
-        if industry not in industry_groups:
-            industry_groups[industry] = []
-        industry_groups[industry].append(video)
+    return attach_summaries(industry_videos, summaries)
+
+def summarize_industry_videos(youtube_client, industry_videos, search_index=None):
+    """
+    Fetch the transcripts of the industry videos and summarize them (step 2b and serve mode)
+    Args:
+        industry_videos: List of industry-related videos
+    Returns:
+        list: One summary record per unique video
+    """
+    # Fetch each unique video's transcript once (a video can belong to several industries)
+    industry_videos = VideoCollection.ensure(industry_videos)
+    first_rows = {}
+    for row, video_id in enumerate(industry_videos.column('video_id')):
+        first_rows.setdefault(video_id, row)
+    unique_videos = industry_videos.view(first_rows.values())
+    logger.info(f"Fetching transcripts for {len(unique_videos)} industry videos...")
+    # Transcripts go to the packed corpus and are read back one at a time (never all in memory)
+    corpus = TranscriptCorpus() if TRANSCRIPT_CORPUS_CONFIG['enabled'] else None
+    videos_with_transcripts = youtube_client.add_transcripts_to_videos(
+        unique_videos, delay_seconds=SUMMARY_CONFIG['transcript_delay_seconds'], corpus=corpus)
+    update_search_index(search_index, corpus.with_transcripts(videos_with_transcripts)
+                        if corpus is not None else videos_with_transcripts)
     
-    # Generate insights for each industry
-    industry_insights = []
-    for industry, industry_videos in industry_groups.items():
-        try:
-            logger.info(f"Generating insights for industry: {industry}")
-            
-            # Collect descriptions for all videos in this industry
-            descriptions = [f"<video {i+1}>title: {v['title']}\n\n description: {v['description']}</video {i+1}>" 
-                   for i, v in enumerate(industry_videos)]
-            titles = [v['title'] for v in industry_videos]
-            
-            # Format the prompt
-            prompt = f"""
-            Analyze these AWS re:Invent videos related to {industry} industry:
+    if SUMMARY_CONFIG['method'] == 'extractive':
+        # Local sentence ranking down to EXTRACTIVE_CONFIG['token_budget']; no model calls
+        logger.info("Compressing transcripts locally...")
+        summaries = ExtractiveSummarizer(corpus=corpus).summarize_videos(videos_with_transcripts)
+    else:
+        logger.info("Summarizing transcripts...")
+        summaries = VideoSummarizer(corpus=corpus).summarize_videos(videos_with_transcripts)
+    if corpus is not None:
+        corpus.close()
+    return summaries
+
+def attach_summaries(industry_videos, summaries):
+    """Copy of the industry videos with a 'summary' column (None where no summary is available)"""
+    summary_by_id = {s['video_id']: s['summary'] for s in summaries}
+    industry_videos = VideoCollection.from_records(industry_videos)
+    industry_videos.set_column('summary', [summary_by_id.get(video_id) for video_id in industry_videos.column('video_id')])
+    return industry_videos
+
+def video_content(video):
+    """Return (label, text) for the densest content available for a video: summary, else description"""
+    summary = video.get('summary')
+    if isinstance(summary, str) and summary.strip():
+        return 'summary', summary
+    return 'description', video['description']
+
+# Static part of every step 3 prompt. Kept free of per-industry values so it is a
+# byte-identical prefix across calls that providers can cache (see 'prompt_caching').
+INDUSTRY_INSIGHTS_INSTRUCTIONS = """
+You will analyze AWS re:Invent videos related to one industry. The industry and the video descriptions follow these instructions.
+
+Please provide a detailed analysis in the following format:
+
+### Detailed Analysis
+
+**Video 1: (title of video 1)**
+- **Use Case:** [Describe the main use case]
+- **Solution:** [List the AWS solutions used]
+- **Customer Story:** [Name the customer and brief description]
+
+**Video 2: (title of video 2)**
+- **Use Case:** [Describe the main use case]
+- **Solution:** [List the AWS solutions used]
+- **Customer Story:** [Name the customer and brief description]
+
+[Continue for all videos...]
+
+### Conclusion
+
+Provide a comprehensive conclusion about how the industry is leveraging AWS services, mentioning key trends, solutions, and customer examples.
+
+Please ensure:
+1. Each video analysis follows the exact format with Use Case, Solution, and Customer Story.
+2. Solutions should specifically mention AWS services and technologies used.
+3. The conclusion should synthesize the key insights across all videos.
+4. Keep the analysis concise but informative.
+"""
+
+# Sections every step 3 answer must contain; a missing one triggers a continuation
+INSIGHT_SECTIONS = ('### Detailed Analysis', '### Conclusion')
+
+# Static part of the step 4 prompt
+CONCLUSION_INSTRUCTIONS = """
+You will analyze industry-specific insights from AWS re:Invent videos, which follow these instructions, and provide a comprehensive cross-industry analysis.
 
-            Video Descriptions:
-            {'\n'.join(descriptions)}
+Please provide a detailed analysis in the following format:
 
-            Please provide a detailed analysis in the following format:
+### Cross-Industry Trends
+- List major trends that appear across multiple industries
+- Highlight common AWS services and solutions used
 
-            ### Detailed Analysis
+### Industry-Specific Highlights
+- Note unique or particularly innovative use cases by industry
+- Identify industry-specific challenges and solutions
 
-            **Video 1: (title of video 1)**
-            - **Use Case:** [Describe the main use case]
-            - **Solution:** [List the AWS solutions used]
-            - **Customer Story:** [Name the customer and brief description]
+### Key Technologies
+- List the most frequently mentioned AWS services
+- Describe how these services are being applied
 
-            **Video 2: (title of video 2)**
-            - **Use Case:** [Describe the main use case]
-            - **Solution:** [List the AWS solutions used]
-            - **Customer Story:** [Name the customer and brief description]
+### Customer Success Patterns
+- Identify common patterns in customer success stories
+- Note any significant transformations or outcomes
 
-        [Continue for all videos...]
+### Strategic Insights
+- Provide strategic observations about AWS's industry focus
+- Discuss emerging patterns and future directions
 
-            ### Conclusion
+Please ensure the analysis is comprehensive yet concise, focusing on actionable insights.
+"""
 
-        Provide a comprehensive conclusion about how the {industry} industry is leveraging AWS services, mentioning key trends, solutions, and customer examples.
+CONCLUSION_SECTIONS = ('### Cross-Industry Trends', '### Industry-Specific Highlights', '### Key Technologies',
+                       '### Customer Success Patterns', '### Strategic Insights')
 
-            Please ensure:
-            1. Each video analysis follows the exact format with Use Case, Solution, and Customer Story.
-            2. Solutions should specifically mention AWS services and technologies used.
-            3. The conclusion should synthesize the key insights across all videos.
-            4. Keep the analysis concise but informative.
-            """
+def build_industry_prompt(industry, industry_videos):
+    """
+    Build the step 3 prompt for one industry
+    Args:
+        industry: Industry code, e.g. 'FSI'
+        industry_videos: Videos of that industry
+    Returns:
+        tuple: (static prefix, per-industry prompt)
+    """
+    # Collect summaries (or descriptions) for all videos in this industry
+    descriptions = []
+    for i, v in enumerate(industry_videos):
+        label, content = video_content(v)
+        descriptions.append(f"<video {i+1}>title: {v['title']}\n\n {label}: {content}</video {i+1}>")
+    video_block = '\n'.join(descriptions)
+    
+    prompt = f"""Analyze these AWS re:Invent videos related to {industry} industry:
+
+Video Descriptions:
+{video_block}
+"""
+    return INDUSTRY_INSIGHTS_INSTRUCTIONS, prompt
+
+def build_conclusion_prompt(industry_insights):
+    """
+    Build the step 4 prompt
+    Args:
+        industry_insights: List of industry insight records
+    Returns:
+        tuple: (static prefix, prompt with all industry insights)
+    """
+    all_insights = "\n\n".join([
+        f"<{insight['industry']} Industry> {insight['insights']} </{insight['industry']} Industry>"
+        for insight in industry_insights
+    ])
+    return CONCLUSION_INSTRUCTIONS, all_insights
+
+def get_model_manager(model_managers, model_name, model_config):
+    """
+    Return the ModelManager for a (tier) model, creating it on first use
+    Args:
+        model_managers: Dict of model name -> ModelManager shared across calls
+        model_name: MODEL_CONFIGS key to call
+        model_config: Configuration of the run's model; its client is reused for tiers of the same type
+    """
+    if model_name not in model_managers:
+        tier_config = MODEL_CONFIGS[model_name]
+        run_manager = model_managers.get(model_config['name'])
+        if run_manager is not None and tier_config['type'] == model_config['type']:
+            model_managers[model_name] = run_manager
+        else:
+            model_managers[model_name] = ModelManager(tier_config)
+    return model_managers[model_name]
+
+def generate_industry_insight(industry, industry_videos, model_config, model_managers, tier_stats=None):
+    """
+    Generate the insight record for one industry
+    Args:
+        industry: Industry code
+        industry_videos: Videos of that industry
+        model_config: Configuration for the LLM model
+        model_managers: Dict of model name -> ModelManager, filled on demand
+        tier_stats: Optional TierStats collecting per-tier latency and cost
+    Returns:
+        dict: Insight record (industry, video_count, video_titles, insights)
+    """
+    # Static instructions form a cacheable prefix; only the video block varies per industry
+    with span('build_industry_prompt', 'prompt', industry=industry, videos=len(industry_videos)):
+        prefix, prompt = build_industry_prompt(industry, industry_videos)
+    titles = [v['title'] for v in industry_videos]
+    
+    # Small industries go to the cheaper tier; large ones stay on the heavyweight model
+    input_tokens = estimate_tokens(prefix) + estimate_tokens(prompt)
+    tier_model, tier = choose_model(model_config['name'], len(industry_videos), input_tokens)
+    logger.info(f"Routing {industry} ({len(industry_videos)} videos, ~{input_tokens} tokens) "
+                f"to {tier_model} ({tier} tier)")
+    
+    start = time.perf_counter()
+    model_manager = get_model_manager(model_managers, tier_model, model_config)
+    # A truncated or incomplete answer is continued from where it stopped, not regenerated
+    response = model_manager.generate_complete_response(tier_model, prompt, prefix=prefix,
+                                                        required_sections=INSIGHT_SECTIONS)
+    if tier_stats:
+        tier_stats.record(tier, tier_model, time.perf_counter() - start, response)
+    
+    return {
+        'industry': industry,
+        'video_count': len(industry_videos),
+        'video_titles': '\n'.join(titles),
+        'insights': response.text
+    }
+
+def generate_industry_insights(videos, model_config, skip_industries=(), on_insight=None, tier_stats=None,
+                               model_managers=None):
+    """
+    Generate insights for each industry
+    Args:
+        videos: List of industry-related videos
+        model_config: Configuration for the LLM model
+        skip_industries: Industries already completed (e.g. by an interrupted run)
+        on_insight: Optional callback receiving each insight record as soon as it is ready
+        tier_stats: Optional TierStats collecting per-tier latency and cost
+        model_managers: Optional dict of model name -> ModelManager built ahead of time (see ClientPrewarmer)
+    Returns:
+        list: Newly generated industry insights
+    """
+    model_managers = dict(model_managers or {})
+    if model_config['name'] not in model_managers:
+        model_managers[model_config['name']] = ModelManager(model_config)
+    
+    # Group by industry (views over the shared records)
+    industry_groups = VideoCollection.ensure(videos).group_by_industry()
+    
+    # Generate insights for each industry
+    industry_insights = []
+    for industry, industry_videos in industry_groups.items():
+        if industry in skip_industries:
+            continue
+        try:
+            logger.info(f"Generating insights for industry: {industry}")
             
             try:
-                insight = model_manager.generate_response(model_config['name'], prompt)
-                
-                industry_insights.append({
-                    'industry': industry,
-                    'video_count': len(industry_videos),
-                    'video_titles': '\n'.join(titles),
-                    'insights': insight
-                })
+                record = generate_industry_insight(industry, industry_videos, model_config,
+                                                   model_managers, tier_stats)
+                industry_insights.append(record)
+                if on_insight:
+                    on_insight(record)
                 
                 logger.info(f"Successfully generated insights for {industry}")
                 # logger.info(f"Waiting 5 seconds before next API call...")
@@ -157,74 +438,289 @@ def generate_industry_insights(videos, model_config):
             logger.error(f"Fatal error while processing {industry}: {str(e)}")
             sys.exit(1)  # Terminate the program
     
+    for manager in set(model_managers.values()):
+        manager.log_usage()
+    return industry_insights
+
+def queue_industry_insights(videos, model_config, work_queue, skip_industries=(), on_insight=None, local_workers=0):
+    """
+    Coordinator side of distributed step 3: queue one job per industry and collect the results
+    Args:
+        videos: List of industry-related videos
+        model_config: Configuration for the LLM model the workers should use
+        work_queue: WorkQueue shared with the `main.py --worker` processes
+        skip_industries: Industries already completed (e.g. by an interrupted run)
+        on_insight: Optional callback receiving each insight record as soon as it is collected
+        local_workers: Number of `main.py --worker` processes to start on this machine
+    Returns:
+        list: Newly collected industry insights
+    """
+    # Jobs carry everything a worker needs, so workers never touch the step 1-2 outputs
+    jobs = {}
+    for industry, industry_videos in VideoCollection.ensure(videos).group_by_industry().items():
+        if industry in skip_industries:
+            continue
+        jobs[industry] = {
+            'model': model_config['name'],
+            'industry': industry,
+            'videos': [{'title': v['title'], 'description': v['description'], 'summary': v.get('summary')}
+                       for v in industry_videos]
+        }
+    changed = work_queue.enqueue(STEP3_QUEUE, jobs)
+    logger.info(f"Queued {len(jobs)} industry jobs ({changed} new or changed, the rest reuse earlier results); "
+                f"waiting for `main.py --worker` processes")
+    workers = start_local_workers(local_workers)
+    try:
+        industry_insights = collect_industry_insights(jobs, work_queue, on_insight)
+    finally:
+        # Also on failure or timeout, so waiting workers stop instead of idling until their timeout
+        work_queue.finish(STEP3_QUEUE)
+        for worker in workers:
+            worker.wait()
     return industry_insights
 
-def step3_generate_insights(industry_videos, model_config, output_manager):
+def collect_industry_insights(jobs, work_queue, on_insight=None):
+    """Poll the queue until every job has a result; raises if one failed or the coordinator timed out"""
+    timeout = WORK_QUEUE_CONFIG['coordinator_timeout_seconds']
+    deadline = time.time() + timeout if timeout else None
+    industry_insights = []
+    waiting = set(jobs)
+    while waiting:
+        results = work_queue.results(STEP3_QUEUE)
+        for industry in [industry for industry in jobs if industry in waiting and industry in results]:
+            record = results[industry]
+            industry_insights.append(record)
+            if on_insight:
+                on_insight(record)
+            waiting.discard(industry)
+        
+        failed = {industry: error for industry, error in work_queue.errors(STEP3_QUEUE).items()
+                  if industry in waiting}
+        if failed:
+            for industry, error in failed.items():
+                logger.error(f"Job for {industry} failed after {WORK_QUEUE_CONFIG['max_attempts']} attempts: {error}")
+            raise RuntimeError(f"Step 3 jobs failed: {', '.join(sorted(failed))}")
+        
+        if waiting:
+            if deadline is not None and time.time() > deadline:
+                raise RuntimeError(f"Step 3 timed out after {timeout}s waiting for: {', '.join(sorted(waiting))}")
+            counts = work_queue.counts(STEP3_QUEUE)
+            logger.info(f"{len(jobs) - len(waiting)}/{len(jobs)} industries done "
+                        f"({counts.get('leased', 0)} in progress)")
+            time.sleep(WORK_QUEUE_CONFIG['poll_seconds'])
+    return industry_insights
+
+def run_worker(work_queue, worker_id=None, tier_stats=None):
+    """
+    Worker side of distributed step 3: claim industry jobs, keep their lease alive and store results
+    Args:
+        work_queue: WorkQueue shared with the coordinator
+        worker_id: Unique worker name, hostname:pid by default
+        tier_stats: Optional TierStats collecting per-tier latency and cost
+    Returns:
+        int: Number of jobs this worker completed
+    """
+    worker_id = worker_id or default_worker_id()
+    logger.info(f"Worker {worker_id} started")
+    model_managers = {}
+    completed = 0
+    idle_since = time.time()
+    # Finished jobs left by an earlier run do not end the worker: it stops once the coordinator
+    # finishes a queue generation the worker saw open, or after waiting too long for one
+    seen_open = False
+    while True:
+        job = work_queue.claim(STEP3_QUEUE, worker_id)
+        if job is None:
+            _, status = work_queue.state(STEP3_QUEUE)
+            if status == 'open':
+                seen_open = True
+            elif status == 'finished' and seen_open:
+                logger.info("Coordinator finished the queue")
+                break
+            if time.time() - idle_since > WORK_QUEUE_CONFIG['idle_timeout_seconds']:
+                logger.info("No job claimed within the idle timeout")
+                break
+            time.sleep(WORK_QUEUE_CONFIG['poll_seconds'])
+            continue
+        
+        seen_open = True
+        payload = job['payload']
+        industry = payload['industry']
+        logger.info(f"Worker {worker_id} claimed {industry} (attempt {job['attempts']})")
+        try:
+            model_config = MODEL_CONFIGS[payload['model']]
+            if model_config['name'] not in model_managers:
+                model_managers[model_config['name']] = ModelManager(model_config)
+            with Heartbeat(work_queue, STEP3_QUEUE, industry, worker_id) as heartbeat:
+                record = generate_industry_insight(industry, VideoCollection.from_records(payload['videos']),
+                                                   model_config, model_managers, tier_stats)
+            if heartbeat.lost or not work_queue.complete(STEP3_QUEUE, industry, worker_id, record):
+                logger.warning(f"Discarding result for {industry}: its lease was taken over by another worker")
+            else:
+                completed += 1
+                logger.info(f"Successfully generated insights for {industry}")
+        except Exception as e:
+            logger.error(f"Failed to generate insights for {industry}: {str(e)}")
+            work_queue.fail(STEP3_QUEUE, industry, worker_id, e)
+        idle_since = time.time()
+    
+    for manager in set(model_managers.values()):
+        manager.log_usage()
+    logger.info(f"Worker {worker_id} finished after {completed} jobs")
+    return completed
+
+def start_local_workers(count):
+    """Spawn `main.py --worker` subprocesses on this machine; returns their Popen handles"""
+    return [subprocess.Popen([sys.executable, os.path.abspath(__file__), '--worker']) for _ in range(count)]
+
+@traced_step
+def step3_generate_insights(industry_videos, model_config, output_manager, search_index=None, tier_stats=None,
+                            work_queue=None, local_workers=0, model_managers=None):
     """
     Step 3: Generate industry-specific insights
     Args:
         industry_videos: List of industry-related videos
         model_config: Configuration for the LLM model
+        work_queue: Optional WorkQueue; when given, industries are processed by `main.py --worker` processes
+        local_workers: With work_queue, number of worker processes to start on this machine
+        model_managers: Optional prewarmed model managers, used when step 3 runs in this process
     Returns:
         list: List of industry insights
     """
-    # Check if we already have the insights
-    exists, df = check_file_exists('industry_insights.csv')
+    # Check if we already have the insights (video_titles is needed by the search index)
+    exists, df = check_file_exists('industry_insights.csv', columns=INSIGHT_COLUMNS)
     if exists:
         logger.info("Using existing industry_insights.csv")
-        return df.to_dict('records')
+        industry_insights = df.to_dict('records')
+        update_search_index(search_index, industry_insights, kind='insight')
+        return industry_insights
     
-    # If not, generate insights
+    # If not, generate insights, streaming each industry to disk as soon as it is done.
+    # An interrupted run leaves industry_insights.csv.partial, which the next run resumes.
     logger.info("Generating industry-specific insights...")
-    industry_insights = generate_industry_insights(industry_videos, model_config)
-    
-    # Save to CSV
-    output_manager.save_to_csv(industry_insights, 'industry_insights.csv')
+    with output_manager.open_csv_sink('industry_insights.csv', fieldnames=INSIGHT_COLUMNS,
+                                      flush_rows=1, resume=not CASSETTE.active) as sink:
+        industry_insights = [{**row, 'video_count': int(row['video_count'])} for row in sink.read_partial()]
+        if industry_insights:
+            logger.info(f"Resuming: {len(industry_insights)} industries already completed")
+        skip_industries = {row['industry'] for row in industry_insights}
+        if work_queue is not None:
+            industry_insights += queue_industry_insights(
+                industry_videos, model_config, work_queue,
+                skip_industries=skip_industries,
+                on_insight=sink.append,
+                local_workers=local_workers
+            )
+        else:
+            industry_insights += generate_industry_insights(
+                industry_videos, model_config,
+                skip_industries=skip_industries,
+                on_insight=sink.append,
+                tier_stats=tier_stats,
+                model_managers=model_managers
+            )
     logger.info("Industry insights saved to CSV")
+    update_search_index(search_index, industry_insights, kind='insight')
     return industry_insights
 
-def generate_overall_conclusion(industry_insights, model_config):
-    """Generate overall conclusion across all industries"""
-    try:
-        # Prepare the prompt
-        all_insights = "\n\n".join([
-            f"<{insight['industry']} Industry> {insight['insights']} </{insight['industry']} Industry>"
-            for insight in industry_insights
-        ])
-        
-        prompt = f"""
-        Analyze the following industry-specific insights from AWS re:Invent videos and provide a comprehensive cross-industry analysis:
-
-        {all_insights}
-
-        Please provide a detailed analysis in the following format:
-
-        ### Cross-Industry Trends
-        - List major trends that appear across multiple industries
-        - Highlight common AWS services and solutions used
-
-        ### Industry-Specific Highlights
-        - Note unique or particularly innovative use cases by industry
-        - Identify industry-specific challenges and solutions
-
-        ### Key Technologies
-        - List the most frequently mentioned AWS services
-        - Describe how these services are being applied
+@traced_step
+def step3_structured_insights(industry_videos, output_manager, extractor, search_index=None):
+    """
+    Step 3 (structured mode): per-video JSON records rolled up into per-industry insights
+    
+    Records are cached by video_id and content hash and rollups by their records, so
+    this always runs: unchanged videos and industries are served from the cache and
+    a new or changed video costs one small extraction call plus its industry's rollup.
+    Args:
+        industry_videos: List of industry-related videos
+        extractor: VideoInsightExtractor
+    Returns:
+        tuple: (industry insight records, per-video records, {industry: rollup conclusion})
+    """
+    logger.info("Building structured per-video insights...")
+    records, rollups = extractor.build(industry_videos)
+    output_manager.save_to_csv(
+        [{k: record[k] for k in ('industry', 'video_id', 'title', 'use_case', 'aws_services', 'customer')}
+         for record in records],
+        'video_insights.csv'
+    )
+    
+    records_by_industry = {}
+    for record in records:
+        records_by_industry.setdefault(record['industry'], []).append(record)
+    industry_insights = [{
+        'industry': industry,
+        'video_count': len(industry_records),
+        'video_titles': '\n'.join(record['title'] for record in industry_records),
+        'insights': render_industry_insight(industry_records, rollups[industry])
+    } for industry, industry_records in records_by_industry.items() if industry in rollups]
+    
+    output_manager.save_to_csv(industry_insights, 'industry_insights.csv')
+    logger.info("Industry insights saved to CSV")
+    update_search_index(search_index, industry_insights, kind='insight')
+    return industry_insights, records, rollups
 
-        ### Customer Success Patterns
-        - Identify common patterns in customer success stories
-        - Note any significant transformations or outcomes
+def build_structured_conclusion_prompt(records, rollups):
+    """
+    Build the step 4 prompt from structured data instead of full step 3 answers
+    Args:
+        records: Per-video records (industry, use_case, aws_services, customer)
+        rollups: {industry: rollup conclusion}
+    Returns:
+        tuple: (static prefix, prompt)
+    """
+    sections = []
+    for industry, conclusion in rollups.items():
+        industry_records = [record for record in records if record['industry'] == industry]
+        service_counts = {}
+        for record in industry_records:
+            for service in filter(None, (s.strip() for s in (record['aws_services'] or '').split(';'))):
+                service_counts[service] = service_counts.get(service, 0) + 1
+        top_services = sorted(service_counts.items(), key=lambda item: (-item[1], item[0]))[:10]
+        customers = sorted({record['customer'] for record in industry_records if record['customer']})
+        sections.append(
+            f"<{industry} Industry>\n"
+            f"videos: {len(industry_records)}\n"
+            f"top services: {', '.join(f'{name} ({count})' for name, count in top_services)}\n"
+            f"customers: {', '.join(customers) or 'none named'}\n"
+            f"use cases: {' | '.join(record['use_case'] for record in industry_records if record['use_case'])}\n"
+            f"summary: {conclusion.strip()}\n"
+            f"</{industry} Industry>"
+        )
+    return CONCLUSION_INSTRUCTIONS, "\n\n".join(sections)
 
-        ### Strategic Insights
-        - Provide strategic observations about AWS's industry focus
-        - Discuss emerging patterns and future directions
+@traced_step
+def step4_structured_conclusion(records, rollups, output_manager, extractor):
+    """
+    Step 4 (structured mode): cross-industry conclusion from the compact records
+    
+    Regenerated only when its structured input changed (cached by prompt).
+    Returns:
+        str: Overall conclusion
+    """
+    logger.info("Generating overall conclusion from structured records...")
+    prefix, prompt = build_structured_conclusion_prompt(records, rollups)
+    conclusion = extractor.generate_conclusion(prefix, prompt, required_sections=CONCLUSION_SECTIONS)
+    output_manager.save_to_txt(conclusion, 'conclusion.txt')
+    logger.info("Conclusion saved to TXT")
+    return conclusion
 
-        Please ensure the analysis is comprehensive yet concise, focusing on actionable insights.
-        """
+def generate_overall_conclusion(industry_insights, model_config, tier_stats=None, model_manager=None):
+    """Generate overall conclusion across all industries (always on the heavyweight model)"""
+    try:
+        # Prepare the prompt (static instructions as a cacheable prefix)
+        with span('build_conclusion_prompt', 'prompt', industries=len(industry_insights)):
+            prefix, prompt = build_conclusion_prompt(industry_insights)
         
-        # Initialize model manager and generate response
-        model_manager = ModelManager(model_config)
-        conclusion = model_manager.generate_response(model_config['name'], prompt)
+        # Initialize model manager (unless one was prewarmed) and generate response
+        model_manager = model_manager or ModelManager(model_config)
+        start = time.perf_counter()
+        response = model_manager.generate_complete_response(model_config['name'], prompt, prefix=prefix,
+                                                            required_sections=CONCLUSION_SECTIONS)
+        if tier_stats:
+            tier_stats.record('final', model_config['name'], time.perf_counter() - start, response)
+        conclusion = response.text
+        model_manager.log_usage()
         
         return conclusion
         
@@ -232,64 +728,326 @@ def generate_overall_conclusion(industry_insights, model_config):
         logger.error(f"Error in generate_overall_conclusion: {str(e)}")
         raise
 
-def step4_generate_conclusion(industry_insights, model_config, output_manager):
+@traced_step
+def step4_generate_conclusion(industry_insights, model_config, output_manager, tier_stats=None, model_manager=None):
     """
     Step 4: Generate overall conclusion from all industry insights
     Args:
         industry_insights: List of industry-specific insights
         model_config: Configuration for the LLM model
+        model_manager: Optional prewarmed ModelManager for model_config
     Returns:
         str: Overall conclusion
     """
-    # Check if we already have the conclusion
+    # Check if we already have the conclusion (not reused while recording or replaying, like check_file_exists)
     conclusion_path = os.path.join('output', 'conclusion.txt')
-    if os.path.exists(conclusion_path):
+    if os.path.exists(conclusion_path) and not CASSETTE.active:
         logger.info("Found existing conclusion, exiting...")
         sys.exit(0)
     
     logger.info("Generating overall conclusion...")
-    conclusion = generate_overall_conclusion(industry_insights, model_config)
+    conclusion = generate_overall_conclusion(industry_insights, model_config, tier_stats, model_manager)
     
     # Save to TXT
     output_manager.save_to_txt(conclusion, 'conclusion.txt')
     logger.info("Conclusion saved to TXT")
     return conclusion
 
+def industry_signatures(industry_groups, model_config):
+    """Hash of each industry's step 3 input (prompt and model), used to skip unchanged industries"""
+    return {industry: content_hash(model_config['name'], *build_industry_prompt(industry, group))
+            for industry, group in industry_groups.items()}
+
+def load_served_state(model_config):
+    """
+    Seed serve mode with the results already in output/, so the first refresh only
+    regenerates industries whose videos changed since they were written
+    Args:
+        model_config: Configuration for the LLM model
+    Returns:
+        dict: Serve state (insights and signatures per industry, conclusion, model managers)
+    """
+    state = {'insights': {}, 'signatures': {}, 'conclusion': None, 'conclusion_stale': True, 'model_managers': {}}
+    videos_exist, videos_df = check_file_exists('industry_videos.csv')
+    insights_exist, insights_df = check_file_exists('industry_insights.csv')
+    if videos_exist and insights_exist:
+        industry_videos = VideoCollection.from_dataframe(videos_df)
+        if SUMMARY_CONFIG['enabled']:
+            summaries_exist, summaries_df = check_file_exists('video_summaries.csv', columns=['video_id', 'summary'])
+            if summaries_exist:
+                industry_videos = attach_summaries(industry_videos, summaries_df.to_dict('records'))
+        signatures = industry_signatures(industry_videos.group_by_industry(), model_config)
+        for record in insights_df.to_dict('records'):
+            if record['industry'] in signatures:
+                state['insights'][record['industry']] = record
+                state['signatures'][record['industry']] = signatures[record['industry']]
+        logger.info(f"Serve mode starts from {len(state['insights'])} existing industry insights")
+    
+    conclusion_path = os.path.join('output', 'conclusion.txt')
+    if os.path.exists(conclusion_path) and not CASSETTE.active:
+        with open(conclusion_path, encoding='utf-8') as f:
+            state['conclusion'] = f.read()
+        state['conclusion_stale'] = False
+    return state
+
+def served_resources(videos, industry_groups, industry_insights, conclusion):
+    """Map of API path -> JSON resource for the current pipeline results"""
+    insights_by_industry = {record['industry']: record for record in industry_insights}
+    resources = {
+        '/videos': VideoCollection.ensure(videos).to_records(),
+        '/industries': [{'industry': industry, 'video_count': len(group),
+                         'has_insight': industry in insights_by_industry}
+                        for industry, group in industry_groups.items()],
+        '/conclusion': {'conclusion': conclusion}
+    }
+    for industry, group in industry_groups.items():
+        records = group.to_records()
+        resources[f'/industries/{industry}'] = {**insights_by_industry.get(industry, {'industry': industry}),
+                                                'videos': records}
+        resources[f'/industries/{industry}/videos'] = records
+    return resources
+
+def refresh_served_pipeline(state, youtube_client, video_processor, output_manager, model_config,
+                            search_index=None, tier_stats=None):
+    """
+    One serve mode refresh: refetch the playlist and regenerate only what changed
+    
+    Industries whose step 3 input is unchanged keep their insight, removed ones are
+    dropped, and the conclusion is regenerated only if any insight changed. Transcripts
+    and summaries come from their caches, so a refresh without new videos makes no
+    model call.
+    Args:
+        state: Serve state from load_served_state, updated in place
+    Returns:
+        dict: Map of API path -> JSON resource
+    """
+    logger.info("Refreshing playlist videos...")
+    videos = youtube_client.get_playlist_videos(PLAYLIST_ID)
+    if YOUTUBE_ENRICH_CONFIG['enabled']:
+        videos = youtube_client.enrich_videos(videos)
+    industry_videos = video_processor.classify_by_keywords(videos).sort_by_industry()
+    output_manager.save_to_csv(videos, 'all_videos.csv')
+    output_manager.save_to_csv(industry_videos, 'industry_videos.csv')
+    update_search_index(search_index, videos)
+    
+    if SUMMARY_CONFIG['enabled']:
+        if 'prewarmer' in state:
+            state['prewarmer'].join()  # before the summarizer's process pool starts
+        summaries = summarize_industry_videos(youtube_client, industry_videos, search_index)
+        output_manager.save_to_csv(summaries, 'video_summaries.csv')
+        industry_videos = attach_summaries(industry_videos, summaries)
+    industry_groups = industry_videos.group_by_industry()
+    
+    if STRUCTURED_INSIGHTS_CONFIG['enabled']:
+        # Per-video records and rollups are cached, so these only call the model for changes
+        if 'extractor' not in state:
+            state['extractor'] = VideoInsightExtractor(model_config)
+        extractor = state['extractor']
+        industry_insights, records, rollups = step3_structured_insights(
+            industry_videos, output_manager, extractor, search_index)
+        conclusion = step4_structured_conclusion(records, rollups, output_manager, extractor)
+        return served_resources(videos, industry_groups, industry_insights, conclusion)
+    
+    if 'prewarmer' in state:
+        # Clients built in the background while this first refresh fetched the playlist
+        state['model_managers'].update(state.pop('prewarmer').model_managers())
+    signatures = industry_signatures(industry_groups, model_config)
+    changed = [industry for industry in industry_groups if state['signatures'].get(industry) != signatures[industry]]
+    removed = [industry for industry in state['insights'] if industry not in industry_groups]
+    logger.info(f"{len(changed)} industries changed, {len(removed)} removed, "
+                f"{len(industry_groups) - len(changed)} unchanged")
+    
+    for industry in removed:
+        del state['insights'][industry]
+        state['signatures'].pop(industry, None)
+    for industry in changed:
+        logger.info(f"Generating insights for industry: {industry}")
+        # Stored one at a time, so a failure part way keeps the industries already done
+        state['insights'][industry] = generate_industry_insight(
+            industry, industry_groups[industry], model_config, state['model_managers'], tier_stats)
+        state['signatures'][industry] = signatures[industry]
+    industry_insights = [state['insights'][industry] for industry in industry_groups]
+    if changed or removed:
+        state['conclusion_stale'] = True
+        output_manager.save_to_csv(industry_insights, 'industry_insights.csv')
+        update_search_index(search_index, [state['insights'][industry] for industry in changed], kind='insight')
+    
+    if state['conclusion_stale'] and industry_insights:
+        logger.info("Generating overall conclusion...")
+        state['conclusion'] = generate_overall_conclusion(industry_insights, model_config, tier_stats,
+                                                          state['model_managers'].get(model_config['name']))
+        state['conclusion_stale'] = False
+        output_manager.save_to_txt(state['conclusion'], 'conclusion.txt')
+    return served_resources(videos, industry_groups, industry_insights, state['conclusion'])
+
+def plan_run(youtube_client, video_processor, output_manager, model_config):
+    """
+    Dry run: load steps 1-2, build every step 3/4 prompt without sending it, and
+    print token, cost and wall-clock estimates per industry
+    Args:
+        model_config: Configuration for the LLM model the run would use
+    Returns:
+        RunPlanner: The planner holding every planned call
+    """
+    videos = step1_get_videos(youtube_client, output_manager)
+    industry_videos = step2_filter_industry_videos(video_processor, videos, output_manager)
+    if SUMMARY_CONFIG['enabled']:
+        if os.path.exists(os.path.join('output', 'video_summaries.csv')):
+            industry_videos = step2b_summarize_videos(youtube_client, industry_videos, output_manager)
+        else:
+            logger.warning("video_summaries.csv not found; planning with descriptions "
+                           "(summarization cost is not included)")
+    
+    planner = RunPlanner(model_config['name'])
+    
+    # Industries already in industry_insights.csv would not be sent again
+    exists, df = check_file_exists('industry_insights.csv', columns=['industry', 'video_count', 'insights'])
+    existing_insights = df.to_dict('records') if exists else []
+    completed = {row['industry'] for row in existing_insights}
+    for industry, group in VideoCollection.ensure(industry_videos).group_by_industry().items():
+        prefix, prompt = build_industry_prompt(industry, group)
+        planner.add_call('step3', industry, prefix, prompt, video_count=len(group),
+                         done=industry in completed)
+    
+    # Step 4 sees every step 3 answer: use the real ones if present, otherwise their estimated size
+    prefix, prompt = build_conclusion_prompt(existing_insights)
+    planner.add_call('step4', 'conclusion', prefix, prompt,
+                     done=os.path.exists(os.path.join('output', 'conclusion.txt')),
+                     includes_step3_outputs=not exists)
+    
+    print(planner.format_report())
+    return planner
+
 def main():
+    parser = argparse.ArgumentParser(description="Analyze AWS re:Invent industry videos with an LLM")
+    parser.add_argument('model', nargs='?', default='nova',
+                        help=f"Model to use: {', '.join(MODEL_CONFIGS.keys())} (default: nova)")
+    parser.add_argument('--plan', action='store_true',
+                        help="Dry run: estimate tokens, cost and time of steps 3-4 without calling any model")
+    parser.add_argument('--coordinator', action='store_true',
+                        help="Queue step 3 as one job per industry for --worker processes, then run step 4")
+    parser.add_argument('--worker', action='store_true',
+                        help="Process queued step 3 jobs (any number of workers, on any machine sharing output/)")
+    parser.add_argument('--workers', type=int, default=0,
+                        help="With --coordinator: also start this many local worker processes")
+    parser.add_argument('--profile', action='store_true',
+                        help="Write timing spans of every step and external call as a Chrome trace to the log directory")
+    parser.add_argument('--profile-cpu', action='store_true',
+                        help="With --profile: also run each step under cProfile")
+    parser.add_argument('--profile-memory', action='store_true',
+                        help="With --profile: also record each step's peak memory with tracemalloc")
+    parser.add_argument('--record', action='store_true',
+                        help="Record every YouTube, transcript and model call to a cassette in the log directory")
+    parser.add_argument('--replay', metavar='PATH',
+                        help="Serve external calls offline from a recorded cassette (file or the recorded run's log directory)")
+    parser.add_argument('--replay-latency', type=float, default=0.0, metavar='SCALE',
+                        help="With --replay: sleep SCALE x each call's recorded duration (default 0: no delay)")
+    parser.add_argument('--serve', action='store_true',
+                        help="Stay resident: refresh the pipeline periodically and serve its results as JSON over HTTP")
+    parser.add_argument('--port', type=int, default=SERVE_CONFIG['port'],
+                        help="With --serve: HTTP port (default: %(default)s)")
+    parser.add_argument('--refresh-minutes', type=float, default=SERVE_CONFIG['refresh_seconds'] / 60,
+                        help="With --serve: minutes between refreshes (default: %(default)s)")
+    args = parser.parse_args()
+    if args.record and args.replay:
+        parser.error("--record and --replay cannot be combined")
+    if (args.record or args.replay) and (args.coordinator or args.worker):
+        parser.error("--record and --replay cover one process; step 3 workers would not be recorded")
+    
     # Get model choice from command line argument
-    model_choice = 'nova'  # default model
-    if len(sys.argv) > 1:
-        model_choice = sys.argv[1].lower()
-        if model_choice not in MODEL_CONFIGS:
-            logger.error(f"Invalid model choice. Available models: {', '.join(MODEL_CONFIGS.keys())}")
-            sys.exit(1)
+    model_choice = args.model.lower()
+    if model_choice not in MODEL_CONFIGS:
+        logger.error(f"Invalid model choice. Available models: {', '.join(MODEL_CONFIGS.keys())}")
+        sys.exit(1)
     
     logger.info(f"Using model: {model_choice}")
     model_config = MODEL_CONFIGS[model_choice]
+    tier_stats = TierStats()
     
     try:
+        if args.worker:
+            # Jobs carry their model and videos, so a worker needs no YouTube or step 1-2 state
+            run_worker(WorkQueue(), tier_stats=tier_stats)
+            return
+        
         # Initialize components
         output_manager = OutputManager()
+        if args.profile:
+            TRACER.enable(output_manager.log_dir, cprofile=args.profile_cpu, memory=args.profile_memory)
+        # Before any client is created: in replay mode they need no credentials
+        if args.record:
+            CASSETTE.record(output_manager.log_dir)
+        elif args.replay:
+            CASSETTE.replay(args.replay, latency_scale=args.replay_latency)
         youtube_client = YouTubeClient()
         video_processor = VideoProcessor()
         
+        if args.plan:
+            plan_run(youtube_client, video_processor, output_manager, model_config)
+            return
+        
+        search_index = SearchIndex()
+        
+        # Resolve credentials and build and warm the model clients while steps 1-2 run
+        prewarmer = ClientPrewarmer(model_config).start()
+        
+        if args.serve:
+            # Only industries whose videos changed are sent to the model on each refresh
+            state = load_served_state(model_config)
+            state['prewarmer'] = prewarmer
+            server = PipelineServer(
+                lambda: refresh_served_pipeline(state, youtube_client, video_processor, output_manager,
+                                                model_config, search_index, tier_stats),
+                {'port': args.port, 'refresh_seconds': args.refresh_minutes * 60})
+            server.serve_forever()
+            return
+        
         # Step 1: Get all videos
-        videos = step1_get_videos(youtube_client, output_manager)
+        videos = step1_get_videos(youtube_client, output_manager, search_index)
         
         # Step 2: Filter industry videos
-        industry_videos = step2_filter_industry_videos(video_processor, videos, output_manager)
+        industry_videos = step2_filter_industry_videos(video_processor, videos, output_manager, search_index)
+        
+        # Step 2b (optional): Summarize transcripts so step 3 gets dense per-video input
+        if SUMMARY_CONFIG['enabled']:
+            # Its process pool must not start while the prewarm thread is inside boto3 or SSL
+            prewarmer.join()
+            industry_videos = step2b_summarize_videos(youtube_client, industry_videos, output_manager, search_index)
+        
+        if STRUCTURED_INSIGHTS_CONFIG['enabled']:
+            # Steps 3-4 from cached per-video records: only new or changed videos cost a call
+            extractor = VideoInsightExtractor(model_config,
+                                              model_manager=prewarmer.model_managers().get(model_config['name']))
+            industry_insights, records, rollups = step3_structured_insights(
+                industry_videos, output_manager, extractor, search_index)
+            step4_structured_conclusion(records, rollups, output_manager, extractor)
+            logger.info("All processing completed successfully")
+            return
         
-        # Step 3: Generate insights
-        industry_insights = step3_generate_insights(industry_videos, model_config, output_manager)
+        # Step 3: Generate insights (in this process, or through the work queue)
+        work_queue = WorkQueue() if args.coordinator else None
+        model_managers = prewarmer.model_managers()
+        industry_insights = step3_generate_insights(industry_videos, model_config, output_manager, search_index,
+                                                    tier_stats, work_queue, local_workers=args.workers,
+                                                    model_managers=model_managers)
         
         # Step 4: Generate conclusion
-        conclusion = step4_generate_conclusion(industry_insights, model_config, output_manager)
+        conclusion = step4_generate_conclusion(industry_insights, model_config, output_manager, tier_stats,
+                                               model_managers.get(model_config['name']))
         
         logger.info("All processing completed successfully")
         
     except Exception as e:
         logger.error(f"An error occurred: {str(e)}")
         sys.exit(1)
+    finally:
+        # Step 4 exits early when a conclusion already exists, so report here
+        tier_stats.log_report()
+        log_resilience_stats()
+        TRACER.write()
+        CASSETTE.close()
 
 if __name__ == "__main__":
+    # Setup logging (only when run as a script; benchmark.py imports this module)
+    logging.basicConfig(level=logging.INFO)
     main() 
\ No newline at end of file
@@ -0,0 +1,74 @@
+"""
+Query the local full-text search index
+
+The index (output/search_index.db) is updated by main.py as each step writes
+its rows. Use --reindex to (re)build it from the CSV files already in output/.
+
+Usage:
+    python search.py "SageMaker HyperPod"
+    python search.py "generative AI" --kind insight
+    python search.py "clean rooms" --industry ADM --limit 5
+    python search.py --reindex
+"""
+
+import os
+import sys
+import time
+import argparse
+import logging
+import pandas as pd
+from src.search_index import SearchIndex
+
+logging.basicConfig(level=logging.WARNING)
+logger = logging.getLogger(__name__)
+
+def reindex_from_csv(search_index):
+    """Index every step output CSV found in the output directory"""
+    for filename, kind in [('all_videos.csv', 'video'),
+                           ('industry_videos.csv', 'video'),
+                           ('industry_insights.csv', 'insight')]:
+        filepath = os.path.join('output', filename)
+        if not os.path.exists(filepath):
+            continue
+        records = pd.read_csv(filepath).to_dict('records')
+        if kind == 'insight':
+            changed = search_index.index_insights(records)
+        else:
+            changed = search_index.index_videos(records)
+        print(f"{filename}: {changed} of {len(records)} documents added or updated")
+
+def main():
+    parser = argparse.ArgumentParser(description="Search re:Invent videos, transcripts and insights")
+    parser.add_argument('query', nargs='?', help='Search terms (FTS5 syntax, e.g. "HyperPod OR Trainium")')
+    parser.add_argument('--limit', type=int, default=10, help='Maximum number of hits')
+    parser.add_argument('--kind', choices=['video', 'insight'], help='Only return this document type')
+    parser.add_argument('--industry', help='Only return documents for this industry code, e.g. FSI')
+    parser.add_argument('--reindex', action='store_true', help='Index the CSV files in output/ first')
+    args = parser.parse_args()
+
+    if not args.query and not args.reindex:
+        parser.print_help()
+        sys.exit(1)
+
+    search_index = SearchIndex()
+    if args.reindex:
+        reindex_from_csv(search_index)
+    if not args.query:
+        return
+
+    start = time.perf_counter()
+    hits = search_index.search(args.query, limit=args.limit, kind=args.kind,
+                               industry=args.industry.upper() if args.industry else None)
+    elapsed_ms = (time.perf_counter() - start) * 1000
+
+    print(f"{len(hits)} hits for '{args.query}' in {elapsed_ms:.1f} ms "
+          f"({search_index.count()} documents indexed)\n")
+    for rank, hit in enumerate(hits, 1):
+        location = hit['industry'] or '-'
+        reference = f"https://www.youtube.com/watch?v={hit['video_id']}" if hit['video_id'] else hit['doc_id']
+        print(f"{rank:>2}. [{hit['kind']}/{location}] {hit['title']}")
+        print(f"    {reference}  (score {-hit['score']:.2f})")
+        print(f"    {' '.join(hit['snippet'].split())}\n")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,169 @@
+import os
+import json
+import shutil
+import logging
+import numpy as np
+import pandas as pd
+from config.config import ARTIFACT_SCHEMAS, ARTIFACT_SIDECAR_DIR, ARTIFACT_SIDECARS_ENABLED
+
+logger = logging.getLogger(__name__)
+
+# Bump when the sidecar layout changes so old sidecars are rebuilt
+SIDECAR_VERSION = 1
+
+def _schema(filename, columns=None):
+    """Declared dtypes for an artifact, restricted to the requested columns"""
+    schema = ARTIFACT_SCHEMAS.get(filename, {})
+    if columns is None:
+        return dict(schema)
+    return {name: dtype for name, dtype in schema.items() if name in columns}
+
+def _read_csv(filepath, filename, columns=None, chunksize=None):
+    """pd.read_csv with declared dtypes and usecols projection, falling back to inference"""
+    kwargs = {'usecols': columns, 'chunksize': chunksize}
+    try:
+        return pd.read_csv(filepath, dtype=_schema(filename, columns), **kwargs)
+    except (ValueError, TypeError) as e:
+        # A hand-edited or older CSV that doesn't match the schema is still loadable
+        logger.warning(f"{filename} does not match its declared schema ({str(e)}); inferring types")
+        return pd.read_csv(filepath, **kwargs)
+
+def _source_signature(filepath):
+    stat = os.stat(filepath)
+    return {'size': stat.st_size, 'mtime_ns': stat.st_mtime_ns, 'version': SIDECAR_VERSION}
+
+def _sidecar_path(filename):
+    return os.path.join(ARTIFACT_SIDECAR_DIR, filename + '.cols')
+
+def _load_meta(filepath, filename):
+    """meta.json of the file's sidecar, or None if there is none or the CSV changed since"""
+    meta_path = os.path.join(_sidecar_path(filename), 'meta.json')
+    if not os.path.exists(meta_path):
+        return None
+    with open(meta_path, encoding='utf-8') as f:
+        meta = json.load(f)
+    if meta['source'] != _source_signature(filepath):
+        return None
+    return meta
+
+def _write_sidecar(filepath, filename, df):
+    """Add the columns of df to the file's sidecar as .npy files, committed by rewriting meta.json
+
+    Text columns are stored as one UTF-8 blob plus character offsets and a null
+    mask; categoricals as integer codes plus their categories; numbers as-is.
+    Columns accumulate across loads, so each projection only ever parses its own
+    columns. Files of a column only count once meta.json lists it, so an
+    interrupted write leaves nothing that is read back.
+    """
+    target = _sidecar_path(filename)
+    meta = _load_meta(filepath, filename)
+    if meta is None:
+        shutil.rmtree(target, ignore_errors=True)
+        os.makedirs(target)
+        meta = {'source': _source_signature(filepath), 'rows': len(df), 'columns': {}}
+
+    added = [name for name in df.columns if name not in meta['columns']]
+    for name in added:
+        series = df[name]
+        if isinstance(series.dtype, pd.CategoricalDtype):
+            np.save(os.path.join(target, f"{name}.codes.npy"), series.cat.codes.to_numpy())
+            meta['columns'][name] = {'kind': 'category', 'categories': [str(c) for c in series.cat.categories]}
+        elif pd.api.types.is_numeric_dtype(series.dtype) or pd.api.types.is_bool_dtype(series.dtype):
+            np.save(os.path.join(target, f"{name}.npy"), series.to_numpy())
+            meta['columns'][name] = {'kind': 'numeric'}
+        else:
+            nulls = series.isna().to_numpy()
+            values = ['' if null else str(value) for value, null in zip(series.tolist(), nulls)]
+            offsets = np.zeros(len(values) + 1, dtype=np.int64)
+            np.cumsum([len(value) for value in values], out=offsets[1:])
+            with open(os.path.join(target, f"{name}.utf8"), 'w', encoding='utf-8') as f:
+                f.write(''.join(values))
+            np.save(os.path.join(target, f"{name}.offsets.npy"), offsets)
+            np.save(os.path.join(target, f"{name}.nulls.npy"), nulls)
+            meta['columns'][name] = {'kind': 'text'}
+    if not added:
+        return
+
+    meta_tmp = os.path.join(target, 'meta.json.tmp')
+    with open(meta_tmp, 'w', encoding='utf-8') as f:
+        json.dump(meta, f)
+    os.replace(meta_tmp, os.path.join(target, 'meta.json'))
+    logger.info(f"Added {', '.join(added)} to the binary sidecar of {filename} in {target}")
+
+def _read_sidecar(filepath, filename, columns):
+    """Load the given columns from a sidecar, or return None if it is stale or lacks any of them
+
+    Numeric columns and categorical codes are memory-mapped. Text columns are
+    decoded from their UTF-8 blob into Python strings (pandas needs them as
+    objects); that skips CSV tokenizing and type inference, but is not lazy.
+    """
+    meta = _load_meta(filepath, filename)
+    if meta is None or any(name not in meta['columns'] for name in columns):
+        return None
+
+    target = _sidecar_path(filename)
+    frame = {}
+    for name in columns:
+        info = meta['columns'][name]
+        if info['kind'] == 'category':
+            codes = np.load(os.path.join(target, f"{name}.codes.npy"), mmap_mode='r')
+            frame[name] = pd.Categorical.from_codes(np.asarray(codes), categories=info['categories'])
+        elif info['kind'] == 'numeric':
+            frame[name] = np.load(os.path.join(target, f"{name}.npy"), mmap_mode='r')
+        else:
+            offsets = np.load(os.path.join(target, f"{name}.offsets.npy"), mmap_mode='r').tolist()
+            nulls = np.load(os.path.join(target, f"{name}.nulls.npy"), mmap_mode='r')
+            with open(os.path.join(target, f"{name}.utf8"), encoding='utf-8') as f:
+                blob = f.read()
+            values = np.empty(meta['rows'], dtype=object)
+            for i in range(meta['rows']):
+                values[i] = np.nan if nulls[i] else blob[offsets[i]:offsets[i + 1]]
+            frame[name] = values
+    return pd.DataFrame(frame, columns=columns)
+
+def load_artifact(filepath, columns=None, use_sidecar=ARTIFACT_SIDECARS_ENABLED):
+    """
+    Load a step output with its declared dtypes
+    Args:
+        filepath: Path to the CSV file (its basename selects the schema)
+        columns: Optional list of columns to load (projection); None loads all
+        use_sidecar: Serve reloads from the binary sidecar, which keeps every column loaded so far
+    Returns:
+        DataFrame: The requested columns, in the requested order
+    """
+    filename = os.path.basename(filepath)
+    if not use_sidecar:
+        df = _read_csv(filepath, filename, columns)
+        return df[list(columns)] if columns is not None else df
+
+    names = list(columns) if columns is not None else list(pd.read_csv(filepath, nrows=0).columns)
+    try:
+        df = _read_sidecar(filepath, filename, names)
+        if df is not None:
+            logger.info(f"Loaded {filename} from binary sidecar")
+            return df
+    except Exception as e:
+        logger.warning(f"Ignoring unreadable sidecar for {filename}: {str(e)}")
+
+    # Only the requested columns are parsed; the sidecar gains them for the next load
+    df = _read_csv(filepath, filename, columns)[names]
+    try:
+        _write_sidecar(filepath, filename, df)
+    except Exception as e:
+        logger.warning(f"Could not write sidecar for {filename}: {str(e)}")
+    return df
+
+def iter_artifact(filepath, columns=None, chunksize=10000):
+    """
+    Iterate a large step output in typed DataFrame chunks without loading it all
+    Args:
+        filepath: Path to the CSV file
+        columns: Optional list of columns to load
+        chunksize: Rows per chunk
+    Yields:
+        DataFrame: Consecutive chunks of at most chunksize rows, with the declared dtypes
+            (a categorical column's categories are those present in the chunk)
+    """
+    with _read_csv(filepath, os.path.basename(filepath), columns, chunksize=chunksize) as reader:
+        for chunk in reader:
+            yield chunk[list(columns)] if columns is not None else chunk
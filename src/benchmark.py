@@ -0,0 +1,185 @@
+import time
+import random
+import logging
+import threading
+import numpy as np
+from concurrent.futures import ThreadPoolExecutor
+from botocore.exceptions import ClientError
+from config.config import BENCHMARK_CONFIG, MODEL_CONFIGS
+from src.model_manager import ModelManager, ModelResponse
+from src.model_tiering import estimate_cost
+from src.resilience import THROTTLED, classify_error
+from src.text_utils import estimate_tokens
+
+logger = logging.getLogger(__name__)
+
+# Name under which the simulated provider is benchmarked (not a MODEL_CONFIGS entry)
+MOCK_MODEL = 'mock'
+
+class MockProvider:
+    """Simulated provider for testing the benchmark harness offline
+
+    Models time to first token, generation speed, throttling beyond max_in_flight
+    concurrent calls and random throttles or errors (BENCHMARK_CONFIG['mock']).
+    Errors are botocore ClientErrors, so they are classified like Bedrock's.
+    """
+
+    def __init__(self, mock_config=None):
+        self.config = {**BENCHMARK_CONFIG['mock'], **(mock_config or {})}
+        self._lock = threading.Lock()
+        self._in_flight = 0
+        self._random = random.Random(self.config['seed'])
+
+    def _error(self, code, status, message):
+        return ClientError({'Error': {'Code': code, 'Message': message},
+                            'ResponseMetadata': {'HTTPStatusCode': status}}, 'InvokeModel')
+
+    def generate_response_timed(self, model_name, prompt, prefix=None):
+        """Same contract as ModelManager.generate_response_timed"""
+        mock = self.config
+        start = time.perf_counter()
+        with self._lock:
+            draw = self._random.random()
+            jitter = self._random.uniform(0.8, 1.2)
+            if self._in_flight >= mock['max_in_flight'] or draw < mock['throttle_rate']:
+                raise self._error('ThrottlingException', 429, "Mock provider: too many requests")
+            if draw < mock['throttle_rate'] + mock['error_rate']:
+                raise self._error('ServiceUnavailableException', 503, "Mock provider: simulated failure")
+            self._in_flight += 1
+        try:
+            input_tokens = estimate_tokens((prefix or '') + prompt)
+            output_tokens = min(int(mock['output_tokens'] * jitter), mock['max_tokens'])
+            time.sleep((mock['first_token_seconds'] + input_tokens / mock['input_tokens_per_second']) * jitter)
+            first_token = time.perf_counter()
+            time.sleep(output_tokens / mock['output_tokens_per_second'])
+        finally:
+            with self._lock:
+                self._in_flight -= 1
+        response = ModelResponse(text='Mock analysis text. ' * max(output_tokens // 5, 1),
+                                 input_tokens=input_tokens, output_tokens=output_tokens, stop_reason='end_turn')
+        return response, time.perf_counter() - start, first_token - start
+
+    def estimate_cost(self, response):
+        prices = self.config['price_per_1k_tokens']
+        return (response.input_tokens * prices['input'] + response.output_tokens * prices['output']) / 1000
+
+class ProviderBenchmark:
+    """Latency, throughput, error rate and cost of MODEL_CONFIGS entries on a fixed prompt set
+
+    Every prompt is sent once per repeat at each concurrency level, without
+    retries, coalescing or caches, so the numbers reflect the provider itself.
+    """
+
+    def __init__(self, prompts, benchmark_config=None):
+        """
+        Args:
+            prompts: List of (label, prefix, prompt) tuples, e.g. step 3 prompts per industry
+            benchmark_config: Overrides for BENCHMARK_CONFIG
+        """
+        self.prompts = list(prompts)
+        self.config = {**BENCHMARK_CONFIG, **(benchmark_config or {})}
+
+    def _send(self, model_manager, model_name, concurrency, label, prefix, prompt):
+        sample = {'model': model_name, 'concurrency': concurrency, 'prompt': label, 'ok': False,
+                  'error': None, 'error_class': None, 'seconds': None, 'first_token_seconds': None,
+                  'input_tokens': 0, 'output_tokens': 0, 'cost': 0.0}
+        start = time.perf_counter()
+        try:
+            response, seconds, first_token = model_manager.generate_response_timed(model_name, prompt, prefix)
+        except Exception as e:
+            sample.update(seconds=time.perf_counter() - start, error=str(e)[:200], error_class=classify_error(e))
+            return sample
+        sample.update(ok=True, seconds=seconds, first_token_seconds=first_token,
+                      input_tokens=response.input_tokens, output_tokens=response.output_tokens,
+                      cost=model_manager.estimate_cost(response) if isinstance(model_manager, MockProvider)
+                      else estimate_cost(model_name, response.input_tokens, response.output_tokens,
+                                         response.cache_read_tokens))
+        return sample
+
+    def run_level(self, model_manager, model_name, concurrency):
+        """
+        Send the prompt set at one concurrency level
+        Args:
+            model_manager: ModelManager serving model_name
+            model_name: MODEL_CONFIGS key
+            concurrency: Requests in flight at once
+        Returns:
+            tuple: (summary dict, list of per-request samples)
+        """
+        jobs = [job for _ in range(self.config['repeat']) for job in self.prompts]
+        start = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=concurrency) as executor:
+            samples = list(executor.map(
+                lambda job: self._send(model_manager, model_name, concurrency, *job), jobs))
+        return self.summarize(samples, time.perf_counter() - start), samples
+
+    def summarize(self, samples, wall_seconds):
+        """Percentiles and rates over one level's samples"""
+        ok = [s for s in samples if s['ok']]
+        latencies = np.array([s['seconds'] for s in ok]) if ok else np.array([np.nan])
+        first_tokens = np.array([s['first_token_seconds'] for s in ok if s['first_token_seconds'] is not None])
+        speeds = [s['output_tokens'] / max(s['seconds'] - (s['first_token_seconds'] or 0), 1e-6)
+                  for s in ok if s['output_tokens']]
+        p50, p95, p99 = np.percentile(latencies, [50, 95, 99])
+        return {
+            'model': samples[0]['model'] if samples else None,
+            'concurrency': samples[0]['concurrency'] if samples else None,
+            'requests': len(samples),
+            'p50': p50, 'p95': p95, 'p99': p99,
+            'ttft_p50': np.percentile(first_tokens, 50) if len(first_tokens) else None,
+            'ttft_p95': np.percentile(first_tokens, 95) if len(first_tokens) else None,
+            'tokens_per_second': float(np.median(speeds)) if speeds else None,
+            'throughput': sum(s['output_tokens'] for s in ok) / wall_seconds if wall_seconds else 0.0,
+            'error_rate': sum(1 for s in samples if not s['ok']) / len(samples) if samples else 0.0,
+            'throttle_rate': sum(1 for s in samples if s['error_class'] == THROTTLED) / len(samples) if samples else 0.0,
+            'cost_per_prompt': sum(s['cost'] for s in ok) / len(ok) if ok else None,
+            'wall_seconds': wall_seconds
+        }
+
+    def run(self, model_names, concurrency_levels=None):
+        """
+        Benchmark each model at each concurrency level
+        Args:
+            model_names: MODEL_CONFIGS keys, or MOCK_MODEL
+            concurrency_levels: Defaults to BENCHMARK_CONFIG['concurrency_levels']
+        Returns:
+            tuple: (summary rows, all samples)
+        """
+        levels = concurrency_levels or self.config['concurrency_levels']
+        rows = []
+        samples = []
+        for model_name in model_names:
+            try:
+                model_manager = MockProvider() if model_name == MOCK_MODEL else ModelManager(MODEL_CONFIGS[model_name])
+            except Exception as e:
+                # Missing credentials for one provider should not stop the others
+                logger.error(f"Skipping {model_name}: {str(e)}")
+                continue
+            for concurrency in levels:
+                logger.info(f"Benchmarking {model_name}: {len(self.prompts)} prompts x {self.config['repeat']} "
+                            f"at concurrency {concurrency}")
+                summary, level_samples = self.run_level(model_manager, model_name, concurrency)
+                rows.append(summary)
+                samples.extend(level_samples)
+        return rows, samples
+
+    @staticmethod
+    def format_report(rows):
+        """Render the summary rows as a table"""
+        def fmt(value, spec):
+            return format(value, spec) if value is not None and value == value else '-'
+
+        header = (f"{'model':<12} {'conc':>4} {'reqs':>5} {'p50 s':>7} {'p95 s':>7} {'p99 s':>7} "
+                  f"{'ttft50':>7} {'ttft95':>7} {'tok/s':>7} {'tput':>8} {'err%':>6} {'thr%':>6} {'$/prompt':>9}")
+        lines = [header, '-' * len(header)]
+        for row in rows:
+            lines.append(
+                f"{row['model']:<12} {row['concurrency']:>4} {row['requests']:>5} "
+                f"{fmt(row['p50'], '7.2f')} {fmt(row['p95'], '7.2f')} {fmt(row['p99'], '7.2f')} "
+                f"{fmt(row['ttft_p50'], '7.2f')} {fmt(row['ttft_p95'], '7.2f')} "
+                f"{fmt(row['tokens_per_second'], '7.1f')} {fmt(row['throughput'], '8.1f')} "
+                f"{row['error_rate'] * 100:>6.1f} {row['throttle_rate'] * 100:>6.1f} "
+                f"{fmt(row['cost_per_prompt'], '9.5f')}")
+        lines += ['', "tok/s: median output tokens/s per request after the first token; "
+                      "tput: output tokens/s across all requests of the level"]
+        return '\n'.join(lines)
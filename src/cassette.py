@@ -0,0 +1,181 @@
+import os
+import gzip
+import json
+import time
+import zlib
+import asyncio
+import logging
+import threading
+from config.config import CASSETTE_CONFIG
+from src.text_utils import content_hash
+
+logger = logging.getLogger(__name__)
+
+class CassetteMissError(KeyError):
+    """Raised in replay mode for a request the cassette has no recording of"""
+
+    def __str__(self):
+        return self.args[0] if self.args else ''
+
+class ReplayedError(Exception):
+    """A recorded failure (e.g. a video without transcript), raised again in replay mode"""
+
+class Cassette:
+    """Record every external request/response of a run, or serve them back offline
+
+    Interactions are keyed by kind ('youtube', 'transcript', 'llm', ...) and a
+    deterministic request key, so replay does not depend on the order in which
+    concurrent calls happen. A key requested several times is served its
+    recordings in order, repeating the last one. Recordings are appended to a
+    gzip-compressed JSON lines file as they happen, with a sync flush after each
+    one, so an interrupted run keeps everything recorded up to that point. While
+    recording or replaying, local caches are bypassed (see `active`), so a
+    replay does not depend on what the caches held when either run started.
+    """
+
+    def __init__(self):
+        self.mode = None
+        self.path = None
+        self.latency_scale = 0.0
+        self._lock = threading.Lock()
+        self._file = None
+        self._recordings = {}
+        self._served = {}
+        self.recorded = 0
+        self.replayed = 0
+
+    @property
+    def replaying(self):
+        return self.mode == 'replay'
+
+    @property
+    def active(self):
+        """Recording or replaying: step outputs, result caches and the transcript corpus are not reused"""
+        return self.mode is not None
+
+    def record(self, output_dir):
+        """
+        Start recording into <output_dir>/<CASSETTE_CONFIG['filename']>
+        Args:
+            output_dir: Directory for the cassette (OutputManager.log_dir)
+        """
+        self.mode = 'record'
+        self.path = os.path.join(output_dir, CASSETTE_CONFIG['filename'])
+        self._file = gzip.open(self.path, 'wt', encoding='utf-8', compresslevel=CASSETTE_CONFIG['compresslevel'])
+        logger.info(f"Recording external calls to {self.path}")
+
+    def replay(self, path, latency_scale=0.0):
+        """
+        Serve external calls from a recorded cassette instead of the network
+        Args:
+            path: Cassette file, or the log directory of the recorded run
+            latency_scale: Sleep this fraction of each call's recorded duration (0: no delay, 1: as recorded)
+        """
+        if os.path.isdir(path):
+            path = os.path.join(path, CASSETTE_CONFIG['filename'])
+        self._recordings = {}
+        count = 0
+        with gzip.open(path, 'rt', encoding='utf-8') as f:
+            try:
+                for line in f:
+                    entry = json.loads(line)
+                    self._recordings.setdefault((entry['kind'], entry['key']), []).append(entry)
+                    count += 1
+            except (EOFError, zlib.error, json.JSONDecodeError):
+                # The recording run was killed mid-write; everything before that is usable
+                logger.warning(f"Cassette {path} is truncated; replaying the {count} complete recordings")
+        self.mode = 'replay'
+        self.path = path
+        self.latency_scale = latency_scale
+        logger.info(f"Replaying {count} recorded calls from {path} (latency scale {latency_scale})")
+
+    def request_key(self, *parts):
+        """Stable key for a request from its identifying parts"""
+        return content_hash(*(json.dumps(part, sort_keys=True, default=str) for part in parts))
+
+    def _next(self, kind, key):
+        with self._lock:
+            entries = self._recordings.get((kind, key))
+            if not entries:
+                raise CassetteMissError(f"No recorded {kind} call for key {key} in {self.path}")
+            index = self._served.get((kind, key), 0)
+            self._served[(kind, key)] = index + 1
+            self.replayed += 1
+            return entries[min(index, len(entries) - 1)]
+
+    def _write(self, kind, key, response, error, seconds, label):
+        entry = {'kind': kind, 'key': key, 'label': label, 'seconds': round(seconds, 4),
+                 'response': response, 'error': error}
+        line = json.dumps(entry, default=str) + '\n'
+        with self._lock:
+            if self._file is None:
+                return
+            self._file.write(line)
+            # Z_SYNC_FLUSH (GzipFile's default): the entry is decodable from disk before the next one
+            self._file.flush()
+            self.recorded += 1
+
+    def _replayed(self, entry):
+        if entry['error'] is not None:
+            raise ReplayedError(entry['error'])
+        return entry['response']
+
+    def call(self, kind, key, func, label=None, record_errors=False):
+        """
+        Run func() (record mode, or no cassette) or return its recorded result (replay mode)
+        Args:
+            kind: Interaction type, e.g. 'youtube' or 'llm'
+            key: Deterministic request key (see request_key)
+            func: Performs the real call; must return a JSON-serializable value
+            label: Human-readable description stored with the recording
+            record_errors: Exception class or tuple of classes that are also recorded, so replay
+                raises them again (for calls whose failure is an expected outcome, such as a
+                video without transcript); other errors are never recorded
+        """
+        if self.mode == 'replay':
+            entry = self._next(kind, key)
+            if self.latency_scale:
+                time.sleep(entry['seconds'] * self.latency_scale)
+            return self._replayed(entry)
+        if self.mode != 'record':
+            return func()
+
+        start = time.perf_counter()
+        try:
+            response = func()
+        except Exception as e:
+            if record_errors and isinstance(e, record_errors):
+                self._write(kind, key, None, f"{type(e).__name__}: {str(e)}", time.perf_counter() - start, label)
+            raise
+        self._write(kind, key, response, None, time.perf_counter() - start, label)
+        return response
+
+    async def acall(self, kind, key, coro_func, label=None):
+        """Coroutine counterpart of call for async requests; coro_func() returns an awaitable"""
+        if self.mode == 'replay':
+            entry = self._next(kind, key)
+            if self.latency_scale:
+                await asyncio.sleep(entry['seconds'] * self.latency_scale)
+            return self._replayed(entry)
+        if self.mode != 'record':
+            return await coro_func()
+
+        start = time.perf_counter()
+        response = await coro_func()
+        self._write(kind, key, response, None, time.perf_counter() - start, label)
+        return response
+
+    def close(self):
+        """Finish the cassette file and log what was recorded or replayed"""
+        with self._lock:
+            if self._file is not None:
+                self._file.close()
+                self._file = None
+                logger.info(f"Recorded {self.recorded} external calls to {self.path}")
+            elif self.mode == 'replay':
+                unused = sum(len(entries) for entries in self._recordings.values()) - \
+                    sum(min(count, len(self._recordings[k])) for k, count in self._served.items())
+                logger.info(f"Replayed {self.replayed} calls from {self.path} ({unused} recordings not used)")
+
+# Process-wide cassette, switched on by `main.py --record` / `--replay`
+CASSETTE = Cassette()
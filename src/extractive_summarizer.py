@@ -0,0 +1,236 @@
+import re
+import logging
+import numpy as np
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+from config.config import EXTRACTIVE_CONFIG
+from src.text_utils import CHARS_PER_TOKEN, content_hash, estimate_tokens
+from src.transcript_corpus import TranscriptCorpus
+
+logger = logging.getLogger(__name__)
+
+_PUNCTUATED_BOUNDARY = re.compile(r'(?<=[.!?])\s+')
+_WORD = re.compile(r"[a-z0-9][a-z0-9'+.-]*[a-z0-9]|[a-z0-9]")
+
+STOPWORDS = frozenset("""
+a about above after again all also am an and any are as at be because been before being below between both but
+by can could did do does doing down during each few for from further had has have having he her here hers him his
+how i if in into is it its itself just kind know like lot me more most my no nor not now of off on once only or
+other our ours out over own really right same she should so some something such than that thats the their them then
+there these they thing things this those through to too um uh under until up us very was we were what when where
+which while who whom why will with would yeah you your yours going get got go okay actually think want see
+""".split())
+
+def split_sentences(text, min_words=8, max_words=60):
+    """Split a transcript into sentence-sized units
+
+    Auto-generated captions have little punctuation and one short fragment per
+    line, so fragments are merged up to min_words and run-ons are cut at max_words.
+
+    Args:
+        text (str): Transcript or description
+        min_words (int): Merge consecutive fragments until a unit has this many words
+        max_words (int): Split longer units
+
+    Returns:
+        list: Sentence strings in original order
+    """
+    units = []
+    current = []
+    for line in text.splitlines():
+        for fragment in _PUNCTUATED_BOUNDARY.split(line):
+            words = fragment.split()
+            while words:
+                take = max_words - len(current)
+                current.extend(words[:take])
+                words = words[take:]
+                if len(current) >= max_words or (len(current) >= min_words and current[-1][-1:] in '.!?'):
+                    units.append(' '.join(current))
+                    current = []
+            if len(current) >= min_words:
+                units.append(' '.join(current))
+                current = []
+    if current:
+        units.append(' '.join(current))
+    return units
+
+def _tfidf(sentences, max_features):
+    """Unit-length TF-IDF rows (float32) over the most frequent non-stopword terms"""
+    tokenized = [[w for w in _WORD.findall(s.lower()) if w not in STOPWORDS] for s in sentences]
+    document_frequency = {}
+    for tokens in tokenized:
+        for token in set(tokens):
+            document_frequency[token] = document_frequency.get(token, 0) + 1
+    vocabulary = sorted(document_frequency, key=lambda t: (-document_frequency[t], t))[:max_features]
+    column = {term: i for i, term in enumerate(vocabulary)}
+
+    matrix = np.zeros((len(sentences), len(vocabulary)), dtype=np.float32)
+    for row, tokens in enumerate(tokenized):
+        for token in tokens:
+            if token in column:
+                matrix[row, column[token]] += 1
+    if not vocabulary:
+        return matrix
+    df = np.array([document_frequency[t] for t in vocabulary], dtype=np.float32)
+    matrix *= np.log((1 + len(sentences)) / (1 + df)) + 1
+    norms = np.linalg.norm(matrix, axis=1, keepdims=True)
+    np.divide(matrix, norms, out=matrix, where=norms > 0)
+    return matrix
+
+def textrank(matrix, damping=0.85, iterations=30, tolerance=1e-6):
+    """
+    TextRank centrality of sentences from their TF-IDF rows
+    Args:
+        matrix: Unit-length TF-IDF rows (n sentences x terms)
+    Returns:
+        numpy.ndarray: One score per sentence, summing to 1
+
+    The cosine similarity graph S = M M^T (without self-loops) is never built:
+    each power iteration multiplies through M, so cost stays O(n x terms).
+    """
+    n = matrix.shape[0]
+    if n == 0:
+        return np.zeros(0, dtype=np.float32)
+    self_similarity = np.einsum('ij,ij->i', matrix, matrix)
+    degree = matrix @ matrix.sum(axis=0) - self_similarity
+    degree[degree <= 0] = 1.0
+    scores = np.full(n, 1.0 / n, dtype=np.float32)
+    for _ in range(iterations):
+        weighted = scores / degree
+        spread = matrix @ (matrix.T @ weighted) - self_similarity * weighted
+        updated = (1 - damping) / n + damping * spread
+        updated /= updated.sum()
+        converged = np.abs(updated - scores).sum() < tolerance
+        scores = updated
+        if converged:
+            break
+    return scores
+
+def _boost(sentences, config):
+    """Multiplier favoring sentences that name AWS services or a customer"""
+    service_pattern = re.compile(r'\b(?:' + '|'.join(re.escape(t) for t in config['service_terms']) + r')\b',
+                                 re.IGNORECASE)
+    customer_pattern = re.compile(r'\b(?:' + '|'.join(re.escape(t) for t in config['customer_terms']) + r')\b',
+                                  re.IGNORECASE)
+    boosts = np.ones(len(sentences), dtype=np.float32)
+    for i, sentence in enumerate(sentences):
+        services = len(set(m.lower() for m in service_pattern.findall(sentence)))
+        boosts[i] += config['service_weight'] * min(services, 3)
+        if customer_pattern.search(sentence):
+            boosts[i] += config['customer_weight']
+    return boosts
+
+def extract_summary(text, config=None):
+    """
+    Compress a text to a token budget by keeping its highest-ranked sentences
+    Args:
+        text (str): Transcript or description
+        config (dict): Overrides for EXTRACTIVE_CONFIG
+    Returns:
+        str: Selected sentences in their original order (the text itself if already within budget)
+    """
+    config = {**EXTRACTIVE_CONFIG, **(config or {})}
+    if not text or estimate_tokens(text) <= config['token_budget']:
+        return text or ''
+    sentences = split_sentences(text, config['min_words'], config['max_words'])
+    matrix = _tfidf(sentences, config['max_features'])
+    scores = textrank(matrix) * _boost(sentences, config)
+
+    budget_chars = config['token_budget'] * CHARS_PER_TOKEN
+    selected = []
+    used = 0
+    for index in np.argsort(-scores, kind='stable'):
+        length = len(sentences[index]) + 1
+        if used + length > budget_chars:
+            continue
+        selected.append(index)
+        used += length
+    return ' '.join(sentences[i] for i in sorted(selected))
+
+# -- process pool ---------------------------------------------------------------------------
+
+_worker_state = {}
+
+def _init_worker(config, corpus_path):
+    _worker_state['config'] = config
+    # Read-only: pool processes must never reopen the coordinator's files for appending
+    _worker_state['corpus'] = TranscriptCorpus(corpus_path, read_only=True) if corpus_path else None
+
+def _summarize_task(task):
+    """Runs in a pool process: (video_id, text or None) -> (kind, source_tokens, source_hash, summary)"""
+    video_id, text = task
+    if text is None and _worker_state['corpus'] is not None:
+        text = _worker_state['corpus'].get(video_id)
+    if not text:
+        return None
+    return 'transcript', estimate_tokens(text), content_hash(text), extract_summary(text, _worker_state['config'])
+
+class ExtractiveSummarizer:
+    def __init__(self, extractive_config=None, corpus=None):
+        """Local, CPU-only transcript compression (TF-IDF TextRank) run on a process pool
+
+        Args:
+            extractive_config (dict): Overrides for EXTRACTIVE_CONFIG
+            corpus (TranscriptCorpus): Optional corpus; pool workers map it themselves, so
+                transcripts are not pickled between processes
+        """
+        self.config = {**EXTRACTIVE_CONFIG, **(extractive_config or {})}
+        self.corpus = corpus
+
+    def _tasks(self, videos):
+        for video in videos:
+            transcript = video.get('transcript')
+            if not (isinstance(transcript, str) and transcript.strip()):
+                transcript = None
+            yield video.get('video_id'), transcript
+
+    def summarize_videos(self, videos):
+        """
+        Compress each video's transcript to the token budget without any model call
+        Args:
+            videos: VideoCollection or list of video dictionaries (with 'transcript', or a corpus)
+        Returns:
+            list: Per-video records in the VideoSummarizer layout (industry, video_id, title, summary, ...)
+        """
+        videos = list(videos)
+        corpus_path = self.corpus.path if self.corpus is not None else None
+        if self.corpus is not None:
+            self.corpus.flush()  # pool processes open the files themselves
+
+        workers = self.config['max_workers']
+        if workers == 1 or len(videos) < self.config['min_videos_for_pool']:
+            _init_worker(self.config, None)
+            _worker_state['corpus'] = self.corpus
+            results = [_summarize_task(task) for task in self._tasks(videos)]
+        else:
+            # Spawned, not forked: the parent may have threads (prewarming, tracing, HTTP pools) holding locks
+            with ProcessPoolExecutor(max_workers=workers, mp_context=multiprocessing.get_context('spawn'),
+                                     initializer=_init_worker, initargs=(self.config, corpus_path)) as executor:
+                results = list(executor.map(_summarize_task, self._tasks(videos), chunksize=4))
+
+        summaries = []
+        for video, result in zip(videos, results):
+            if result is None:
+                # No transcript: the (short) description is used as is
+                description = video.get('description')
+                text = description if isinstance(description, str) else ''
+                result = ('description', estimate_tokens(text), content_hash(text), extract_summary(text, self.config))
+            kind, source_tokens, source_hash, summary = result
+            summaries.append({
+                'industry': video.get('industry'),
+                'video_id': video.get('video_id'),
+                'title': video.get('title'),
+                'summary': summary,
+                'source': kind,
+                'source_tokens': source_tokens,
+                'summary_tokens': estimate_tokens(summary),
+                'chunks': 0,  # no model calls
+                'content_hash': source_hash
+            })
+
+        source_tokens = sum(s['source_tokens'] for s in summaries)
+        summary_tokens = sum(s['summary_tokens'] for s in summaries)
+        logger.info(f"Extracted {len(summaries)} summaries locally "
+                    f"({sum(1 for s in summaries if s['source'] == 'transcript')} from transcripts); "
+                    f"~{source_tokens} source tokens reduced to ~{summary_tokens}")
+        return summaries
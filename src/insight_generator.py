@@ -1,61 +1,50 @@
-import boto3
-import json
-from config.config import AWS_ACCESS_KEY_ID, AWS_SECRET_ACCESS_KEY, AWS_REGION
+import asyncio
 import logging
+from config.config import REDUCE_CONFIG
+from src.model_manager import ModelManager
+from src.result_cache import ResultCache
+from src.text_utils import content_hash, estimate_tokens
 
 logger = logging.getLogger(__name__)
 
+# Bump when the prompts below change so cached tree nodes are not reused
+PROMPT_VERSION = 'v1'
+
 class InsightGenerator:
-    def __init__(self, model_config):
-        self.bedrock_runtime = boto3.client(
-            service_name='bedrock-runtime',
-            aws_access_key_id=AWS_ACCESS_KEY_ID,
-            aws_secret_access_key=AWS_SECRET_ACCESS_KEY,
-            region_name=AWS_REGION
-        )
+    def __init__(self, model_config, model_manager=None, cache=None, reduce_config=None):
+        """Synthesize insights from many summaries with a hierarchical (tree) reduce
+
+        Args:
+            model_config (dict): MODEL_CONFIGS entry used for every reduce call
+            model_manager (ModelManager): Optional shared manager; one is created otherwise
+            cache (ResultCache): Optional cache for tree nodes; defaults to 'insight_reduce'
+            reduce_config (dict): Overrides for REDUCE_CONFIG
+        """
         self.model_config = model_config
-        
-    def _prepare_request_body(self, prompt):
-        if self.model_config['request_format'] == 'claude':
-            return json.dumps({
-                "anthropic_version": "bedrock-2023-05-31",
-                "max_tokens": self.model_config['max_tokens'],
-                "messages": [
-                    {
-                        "role": "system",
-                        "content": "You are an AI assistant that analyzes AWS re:Invent content."
-                    },
-                    {
-                        "role": "user",
-                        "content": prompt
-                    }
-                ],
-                "temperature": 0.7
-            })
-        else:  # nova format
-            return json.dumps({
-                "inputText": prompt,
-                "textGenerationConfig": {
-                    "maxTokenCount": self.model_config['max_tokens'],
-                    "temperature": 0.7,
-                    "stopSequences": []
-                }
-            })
-            
-    def _parse_response(self, response_body):
-        if self.model_config['request_format'] == 'claude':
-            return response_body['content'][0]['text']
-        else:  # nova format
-            return response_body['results'][0]['outputText']
-    
-    def generate_insights(self, summaries):
-        try:
-            combined_text = "\n".join(summaries)
-            
-            prompt = f"""
+        self.config = {**REDUCE_CONFIG, **(reduce_config or {})}
+        self.model_manager = model_manager or ModelManager(model_config)
+        self.cache = cache or ResultCache('insight_reduce')
+
+    def _partial_prompt(self, texts):
+        combined_text = "\n\n".join(texts)
+        return f"""
+            Below are summaries (or partial syntheses) of AWS re:Invent industry-related sessions:
+            {combined_text}
+
+            Condense them into one synthesis that preserves, with concrete names:
+            - Key themes and trends
+            - Major announcements
+            - Industry focus areas
+            - Notable use cases, customers and the AWS services they use
+            Merge duplicates, drop filler, and keep it under {self.config['partial_words']} words.
+            """
+
+    def _final_prompt(self, texts):
+        combined_text = "\n".join(texts)
+        return f"""
             Based on these summaries of AWS re:Invent industry-related sessions:
             {combined_text}
-            
+
             Please provide:
             1. Key themes and trends
             2. Major announcements
@@ -63,16 +52,95 @@ class InsightGenerator:
             4. Notable use cases
             5. Overall insights and conclusions
             """
-            
-            body = self._prepare_request_body(prompt)
-            
-            response = self.bedrock_runtime.invoke_model(
-                modelId=self.model_config['model_id'],
-                body=body
-            )
-            
-            response_body = json.loads(response['body'].read())
-            return self._parse_response(response_body)
+
+    def _batch(self, nodes):
+        """Group (key, text) nodes into token-bounded batches with content-defined boundaries
+
+        A batch closes after any node whose key hash is divisible by
+        'boundary_divisor', or before the token budget would be exceeded. Because
+        boundaries depend on content rather than position, inserting or changing
+        one summary only changes the batch it lands in, so every other branch of
+        the tree keeps its cache key.
+        """
+        batches = []
+        current = []
+        current_tokens = 0
+        for key, text in nodes:
+            tokens = estimate_tokens(text)
+            if current and current_tokens + tokens > self.config['batch_tokens']:
+                batches.append(current)
+                current = []
+                current_tokens = 0
+            current.append((key, text))
+            current_tokens += tokens
+            if int(key[:8], 16) % self.config['boundary_divisor'] == 0:
+                batches.append(current)
+                current = []
+                current_tokens = 0
+        if current:
+            batches.append(current)
+
+        # Every node alone in its batch would never converge; fall back to pairs
+        if len(batches) == len(nodes) > 1:
+            batches = [nodes[i:i + 2] for i in range(0, len(nodes), 2)]
+        return batches
+
+    async def _reduce_batch(self, batch, final, semaphore, stats):
+        """Reduce one batch to a single node, using the cached result when available"""
+        kind = 'final' if final else 'partial'
+        key = content_hash(kind, PROMPT_VERSION, self.model_config['name'], *(k for k, _ in batch))
+
+        cached = self.cache.get(key)
+        if cached is not None:
+            stats['cached'] += 1
+            return key, cached
+
+        texts = [text for _, text in batch]
+        prompt = self._final_prompt(texts) if final else self._partial_prompt(texts)
+        async with semaphore:
+            result = await self.model_manager.agenerate_response(self.model_config['name'], prompt)
+        self.cache.set(key, result)
+        stats['computed'] += 1
+        return key, result
+
+    async def agenerate_insights(self, summaries):
+        """Coroutine form of generate_insights"""
+        semaphore = asyncio.Semaphore(self.config['max_concurrency'])
+        stats = {'cached': 0, 'computed': 0}
+        nodes = [(content_hash(summary), summary) for summary in summaries if summary]
+        if not nodes:
+            raise ValueError("No summaries to generate insights from")
+
+        try:
+            level = 0
+            while True:
+                batches = self._batch(nodes)
+                final = len(batches) == 1
+                logger.info(f"Reduce level {level}: {len(nodes)} nodes in {len(batches)} batches"
+                            f"{' (final synthesis)' if final else ''}")
+                nodes = await asyncio.gather(
+                    *(self._reduce_batch(batch, final, semaphore, stats) for batch in batches)
+                )
+                if final:
+                    logger.info(f"Insight tree complete: {stats['computed']} nodes computed, "
+                                f"{stats['cached']} reused from cache")
+                    return nodes[0][1]
+                level += 1
+        finally:
+            await self.model_manager.aclose()
+
+    def generate_insights(self, summaries):
+        """
+        Generate overall insights from any number of summaries
+        Args:
+            summaries: List of summary strings
+        Returns:
+            str: Final synthesis
+        Raises:
+            Exception: If any reduce call fails after retries (completed nodes stay cached)
+        """
+        try:
+            return asyncio.run(self.agenerate_insights(summaries))
         except Exception as e:
             logger.error(f"Error generating insights: {str(e)}")
-            return None 
\ No newline at end of file
+            raise
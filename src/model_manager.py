@@ -1,20 +1,83 @@
 import boto3
 import json
+import time
+import asyncio
 import logging
-from config.config import AWS_ACCESS_KEY_ID, AWS_SECRET_ACCESS_KEY, AWS_REGION, MODEL_CONFIGS
+import threading
+from dataclasses import asdict, dataclass
+from concurrent.futures import ThreadPoolExecutor
+from botocore.config import Config as BotoConfig
+from config.config import (
+    AWS_ACCESS_KEY_ID,
+    AWS_SECRET_ACCESS_KEY,
+    AWS_REGION,
+    MODEL_CONFIGS,
+    ASYNC_MAX_IN_FLIGHT,
+    ASYNC_EXECUTOR_WORKERS,
+    MAX_CONTINUATIONS,
+    SINGLE_FLIGHT_ENABLED,
+    SEMANTIC_CACHE_CONFIG,
+)
+from src.cassette import CASSETTE
+from src.profiler import span
+from src.semantic_cache import SemanticCache
+from src.resilience import FATAL, before_retry, classify_error, get_breaker, should_retry, should_stop, wait_time
+from src.single_flight import SingleFlight
+from src.text_utils import content_hash, estimate_tokens, missing_sections
 from tenacity import (
     retry,
-    stop_after_attempt,
-    wait_exponential,
-    retry_if_exception_type,
-    before_sleep_log,
     after_log
 )
-from openai import OpenAI
+from openai import OpenAI, AsyncOpenAI
 import httpx
 
 logger = logging.getLogger(__name__)
 
+@dataclass
+class ModelResponse:
+    """Text of a completion plus the metadata providers report with it
+
+    input_tokens counts every prompt token, including those served from or
+    written to the prompt cache (Bedrock reports those separately).
+    """
+    text: str
+    input_tokens: int = 0
+    output_tokens: int = 0
+    cache_read_tokens: int = 0
+    cache_write_tokens: int = 0
+    stop_reason: str = None
+    continuations: int = 0
+
+    @property
+    def truncated(self):
+        """True when generation stopped at the output token limit"""
+        return self.stop_reason in TRUNCATION_STOP_REASONS
+
+# Stop reasons meaning "hit max_tokens": Bedrock Claude/Nova, OpenAI-compatible
+TRUNCATION_STOP_REASONS = {'max_tokens', 'length'}
+
+# Follow-up turn for providers where a trailing assistant message is not a true prefill
+CONTINUE_INSTRUCTION = ("Continue your previous answer exactly where it stopped. "
+                        "Do not repeat anything and do not add any preamble.")
+
+# Shared by generate_response and agenerate_response so sync and async callers back off identically.
+# Fatal errors (bad request, missing key, unsupported model, open breaker) are raised at once;
+# transient and throttling errors back off (honoring Retry-After) within the run's retry budget.
+RETRY_POLICY = dict(
+    stop=should_stop,
+    wait=wait_time,
+    retry=should_retry,
+    before_sleep=before_retry,
+    after=after_log(logger, logging.INFO),
+    reraise=True
+)
+
+# Process-wide, so identical prompts coalesce even across ModelManager instances
+SINGLE_FLIGHT = SingleFlight()
+
+# boto3 clients default to a 10-connection pool; size it for the executor used by the async API
+BOTO_CLIENT_CONFIG = BotoConfig(max_pool_connections=ASYNC_EXECUTOR_WORKERS)
+
 class ModelManager:
     def __init__(self, model_config):
         """Initialize model client based on provided configuration
@@ -25,6 +88,23 @@ class ModelManager:
         try:
             self.model_config = model_config
             
+            # Async resources are created lazily on first agenerate_response call
+            self.async_openai_client = None
+            self._executor = None
+            self._semaphore = None
+            
+            # Token usage per model name, reported by log_usage()
+            self._usage = {}
+            self._usage_lock = threading.Lock()
+            
+            # Opt-in reuse of responses to near-identical prompts
+            self.semantic_cache = SemanticCache() if SEMANTIC_CACHE_CONFIG['enabled'] else None
+            
+            if CASSETTE.replaying:
+                # Every response comes from the cassette; no credentials or network needed
+                logger.info(f"Replaying recorded responses for {model_config['name']}")
+                return
+            
             # Initialize client based on model type
             if model_config['type'] == 'openai':
                 self._init_openai_client()
@@ -82,7 +162,8 @@ class ModelManager:
                     service_name='bedrock-runtime',
                     aws_access_key_id=AWS_ACCESS_KEY_ID,
                     aws_secret_access_key=AWS_SECRET_ACCESS_KEY,
-                    region_name=AWS_REGION
+                    region_name=AWS_REGION,
+                    config=BOTO_CLIENT_CONFIG
                 )
             else:
                 # Use AWS default configuration
@@ -91,7 +172,7 @@ class ModelManager:
                 if not session.get_credentials():
                     raise ValueError("AWS credentials not found")
                     
-                self.bedrock_runtime = session.client('bedrock-runtime')
+                self.bedrock_runtime = session.client('bedrock-runtime', config=BOTO_CLIENT_CONFIG)
                 logger.info("Initialized Bedrock client")
                 
         except Exception as e:
@@ -110,7 +191,8 @@ class ModelManager:
                     service_name='sagemaker-runtime',
                     aws_access_key_id=AWS_ACCESS_KEY_ID,
                     aws_secret_access_key=AWS_SECRET_ACCESS_KEY,
-                    region_name=AWS_REGION
+                    region_name=AWS_REGION,
+                    config=BOTO_CLIENT_CONFIG
                 )
             else:
                 # Use AWS default configuration
@@ -119,38 +201,89 @@ class ModelManager:
                 if not session.get_credentials():
                     raise ValueError("AWS credentials not found")
                     
-                self.sagemaker_runtime = session.client('sagemaker-runtime')
+                self.sagemaker_runtime = session.client('sagemaker-runtime', config=BOTO_CLIENT_CONFIG)
                 logger.info("Initialized SageMaker client")
                 
         except Exception as e:
             logger.error(f"Failed to initialize clients: {str(e)}")
             raise
         
-    def _format_prompt_nova(self, prompt):
-        """Format prompt for Nova model"""
-        return {
+    def prewarm(self, mode='connect'):
+        """Warm the provider connection ahead of the first real call; failures are only logged
+        
+        Args:
+            mode (str): 'connect' opens a connection in the OpenAI-compatible client's pool with
+                an authenticated model listing; the Bedrock/SageMaker runtime clients have no such
+                call, so there the client is only built. 'probe' (opt-in, billed) sends a one-token
+                "ping" request through the circuit breaker, which warms any client's pool; it is
+                skipped for SageMaker, whose request format has no output limit. 'none' skips.
+        """
+        if mode == 'none' or CASSETTE.active:
+            return
+        if mode == 'connect' and self.model_config['type'] != 'openai':
+            logger.debug(f"No connect prewarm for {self.model_config['type']} clients; the client is built")
+            return
+        if mode == 'probe' and self.model_config['type'] == 'sagemaker':
+            logger.info(f"Not probing {self.model_config['name']}: its requests cannot be limited to one token")
+            return
+        start = time.perf_counter()
+        try:
+            with span('prewarm', 'client', model=self.model_config['name'], mode=mode):
+                if mode == 'probe':
+                    model_config, method_name = self._resolve_call_method(self.model_config['name'])
+                    self._call_with_breaker(self._breaker(model_config), lambda: getattr(self, method_name)(
+                        {**model_config, 'max_tokens': 1}, 'ping'))
+                else:
+                    self.openai_client.models.list()
+            logger.info(f"Prewarmed {self.model_config['name']} ({mode}) in {time.perf_counter() - start:.2f}s")
+        except Exception as e:
+            logger.warning(f"Prewarming {self.model_config['name']} failed ({mode}): {str(e)}")
+
+    def _join_prompt(self, prompt, prefix=None):
+        """Plain-text prompt for providers without explicit cache markers (static prefix first)"""
+        return f"{prefix}\n\n{prompt}" if prefix else prompt
+
+    def _format_prompt_nova(self, prompt, model_config=None, prefix=None, prefill=None):
+        """Format prompt for Nova model
+        
+        A static prefix goes first, followed by a cachePoint when the model
+        supports Bedrock prompt caching, so repeated instructions are not reprocessed.
+        A prefill becomes a trailing assistant message the model continues from.
+        """
+        content = []
+        if prefix:
+            content.append({"text": prefix})
+            if model_config and model_config.get('prompt_caching'):
+                content.append({"cachePoint": {"type": "default"}})
+        content.append({"text": prompt})
+        
+        formatted_prompt = {
             "messages": [
                 {
                     "role": "user",
-                    "content": [
-                        {
-                            "text": prompt
-                        }
-                    ]
+                    "content": content
                 }
             ]
         }
+        if prefill:
+            formatted_prompt["messages"].append({"role": "assistant", "content": [{"text": prefill}]})
+        if model_config and model_config.get('max_tokens'):
+            formatted_prompt["inferenceConfig"] = {"maxTokens": model_config['max_tokens']}
+        return formatted_prompt
 
-    def _format_prompt_claude(self, prompt):
+    def _format_prompt_claude(self, prompt, model_config=None, prefix=None, prefill=None):
         """Format prompt for Claude models based on model_id
         
         Args:
             prompt (str): The input prompt to format
+            model_config (dict): Claude model config, defaults to MODEL_CONFIGS['claude']
+            prefix (str): Optional static instructions placed first and marked cacheable
+            prefill (str): Optional start of the assistant turn for the model to continue
             
         Returns:
             dict: Formatted prompt structure based on Claude version
         """
-        model_config = MODEL_CONFIGS['claude']
+        model_config = model_config or MODEL_CONFIGS['claude']
         model_id = model_config['model_id']
         
         # Base structure for both versions
@@ -165,115 +298,366 @@ class ModelManager:
         }
         
         # Check model version by model_id
-        if 'claude-3-5' in model_id:  # claude 3.x versions
-            formatted_prompt["messages"][0]["content"] = [
-                {
-                    "type": "text",
-                    "text": prompt
-                }
-            ]
+        if 'claude-3-5' in model_id:  # claude 3.5 versions (Sonnet v2, Haiku)
+            content = []
+            if prefix:
+                prefix_block = {"type": "text", "text": prefix}
+                if model_config.get('prompt_caching'):
+                    prefix_block["cache_control"] = {"type": "ephemeral"}
+                content.append(prefix_block)
+            content.append({
+                "type": "text",
+                "text": prompt
+            })
+            formatted_prompt["messages"][0]["content"] = content
         else:  # claude 3.0 and older versions
-            formatted_prompt["messages"][0]["content"] = prompt
+            formatted_prompt["messages"][0]["content"] = self._join_prompt(prompt, prefix)
+        
+        if prefill:
+            formatted_prompt["messages"].append({"role": "assistant", "content": prefill})
             
         return formatted_prompt
 
-    def _format_prompt_qwen(self, prompt):
+    def _format_prompt_qwen(self, prompt, prefix=None, prefill=None):
         """Format prompt for Qwen model"""
         return {
-            "messages": [
-                {
-                    "role": "user",
-                    "content": prompt
-                }
-            ]
+            "messages": self._format_prompt_openai(prompt, prefix, prefill)
         }
 
-    def _format_prompt_openai(self, prompt):
-        """Format prompt for OpenAI model"""
-        return [
+    def _format_prompt_openai(self, prompt, prefix=None, prefill=None):
+        """Format prompt for OpenAI model (these providers cache identical prefixes automatically)
+        
+        Chat completion APIs don't continue a trailing assistant message, so a
+        prefill is sent as the previous answer followed by a request to continue it.
+        """
+        messages = [
             {
                 "role": "user",
-                "content": prompt
+                "content": self._join_prompt(prompt, prefix)
             }
         ]
+        if prefill:
+            messages += [
+                {"role": "assistant", "content": prefill},
+                {"role": "user", "content": CONTINUE_INSTRUCTION}
+            ]
+        return messages
 
-    def _call_bedrock_nova(self, model_config, prompt):
+    def _openai_response(self, response):
+        """Convert an OpenAI-compatible chat completion into a ModelResponse"""
+        choice = response.choices[0]
+        usage = response.usage
+        return ModelResponse(
+            text=choice.message.content,
+            input_tokens=getattr(usage, 'prompt_tokens', 0) or 0,
+            output_tokens=getattr(usage, 'completion_tokens', 0) or 0,
+            # DeepSeek reports automatic prefix-cache hits as prompt_cache_hit_tokens
+            cache_read_tokens=getattr(usage, 'prompt_cache_hit_tokens', 0) or 0,
+            stop_reason=choice.finish_reason
+        )
+
+    def _call_bedrock_nova(self, model_config, prompt, prefix=None, prefill=None):
         """Call Bedrock Nova model"""
         try:
-            request_body = self._format_prompt_nova(prompt)
+            request_body = self._format_prompt_nova(prompt, model_config, prefix, prefill)
             response = self.bedrock_runtime.invoke_model(
                 modelId=model_config['model_id'],
                 body=json.dumps(request_body)
             )
             response_body = json.loads(response['body'].read())
-            return response_body["output"]["message"]["content"][0]["text"]
+            usage = response_body.get("usage", {})
+            cache_read = usage.get("cacheReadInputTokenCount", 0)
+            cache_write = usage.get("cacheWriteInputTokenCount", 0)
+            return ModelResponse(
+                text=response_body["output"]["message"]["content"][0]["text"],
+                input_tokens=usage.get("inputTokens", 0) + cache_read + cache_write,
+                output_tokens=usage.get("outputTokens", 0),
+                cache_read_tokens=cache_read,
+                cache_write_tokens=cache_write,
+                stop_reason=response_body.get("stopReason")
+            )
         except Exception as e:
             logger.error(f"Error in Nova model call: {str(e)}")
             raise
 
-    def _call_bedrock_claude(self, model_config, prompt):
+    def _call_bedrock_claude(self, model_config, prompt, prefix=None, prefill=None):
         """Call Bedrock Claude model"""
         try:
-            request_body = self._format_prompt_claude(prompt)
+            request_body = self._format_prompt_claude(prompt, model_config, prefix, prefill)
             response = self.bedrock_runtime.invoke_model(
                 modelId=model_config['model_id'],
                 contentType=model_config['content_type'],
                 body=json.dumps(request_body)
             )
             response_body = json.loads(response['body'].read())
-            return response_body["content"][0]["text"]
+            usage = response_body.get("usage", {})
+            cache_read = usage.get("cache_read_input_tokens", 0)
+            cache_write = usage.get("cache_creation_input_tokens", 0)
+            return ModelResponse(
+                text=response_body["content"][0]["text"],
+                input_tokens=usage.get("input_tokens", 0) + cache_read + cache_write,
+                output_tokens=usage.get("output_tokens", 0),
+                cache_read_tokens=cache_read,
+                cache_write_tokens=cache_write,
+                stop_reason=response_body.get("stop_reason")
+            )
         except Exception as e:
             logger.error(f"Error in Claude model call: {str(e)}")
             raise
         
-    def _call_sagemaker_qwen(self, model_config, prompt):
+    def _call_sagemaker_qwen(self, model_config, prompt, prefix=None, prefill=None):
         """Call SageMaker Qwen model"""
         try:
-            request_body = self._format_prompt_qwen(prompt)
+            request_body = self._format_prompt_qwen(prompt, prefix, prefill)
             response = self.sagemaker_runtime.invoke_endpoint(
                 EndpointName=model_config['endpoint_name'],
                 Body=json.dumps(request_body),
                 ContentType="application/json"
             )
             response_body = json.loads(response['Body'].read())
-            return response_body['choices'][0]['message']['content']
+            usage = response_body.get('usage') or {}
+            return ModelResponse(
+                text=response_body['choices'][0]['message']['content'],
+                input_tokens=usage.get('prompt_tokens', 0),
+                output_tokens=usage.get('completion_tokens', 0),
+                stop_reason=response_body['choices'][0].get('finish_reason')
+            )
         except Exception as e:
             logger.error(f"Error in Qwen model call: {str(e)}")
             raise
 
-    def _call_openai_gpt(self, model_config, prompt):
+    def _call_openai_gpt(self, model_config, prompt, prefix=None, prefill=None):
         """Call OpenAI GPT model"""
         try:
             if not self.openai_client:
                 raise ValueError("OpenAI client not initialized. Please check your API key.")
                 
-            messages = self._format_prompt_openai(prompt)
+            messages = self._format_prompt_openai(prompt, prefix, prefill)
             response = self.openai_client.chat.completions.create(
                 model=model_config['model_id'],
                 messages=messages,
                 # max_tokens=model_config['max_tokens'],
                 # temperature=model_config['temperature']
             )
-            return response.choices[0].message.content
+            return self._openai_response(response)
             
         except Exception as e:
             logger.error(f"Error in OpenAI model call: {str(e)}")
             raise
 
-    @retry(
-        stop=stop_after_attempt(3),
-        wait=wait_exponential(multiplier=4, min=4, max=16),
-        retry=retry_if_exception_type((Exception,)),
-        before_sleep=before_sleep_log(logger, logging.INFO),
-        after=after_log(logger, logging.INFO),
-        reraise=True
-    )
-    def generate_response(self, model_name, prompt):
+    def _stream_bedrock_events(self, model_config, request_body, **kwargs):
+        """Stream a Bedrock invocation (Claude or Nova event format); returns (ModelResponse, first token time)"""
+        response = self.bedrock_runtime.invoke_model_with_response_stream(
+            modelId=model_config['model_id'], body=json.dumps(request_body), **kwargs)
+        parts = []
+        first_token = None
+        usage = {}
+        stop_reason = None
+        for event in response['body']:
+            chunk = json.loads(event['chunk']['bytes'])
+            text = (chunk.get('delta', {}).get('text')  # Claude content_block_delta
+                    or chunk.get('contentBlockDelta', {}).get('delta', {}).get('text'))  # Nova
+            if text:
+                if first_token is None:
+                    first_token = time.perf_counter()
+                parts.append(text)
+            stop_reason = (chunk.get('delta', {}).get('stop_reason')
+                           or chunk.get('messageStop', {}).get('stopReason') or stop_reason)
+            metrics = chunk.get('amazon-bedrock-invocationMetrics')
+            if metrics:
+                usage = {'input': metrics.get('inputTokenCount', 0), 'output': metrics.get('outputTokenCount', 0)}
+        return ModelResponse(text=''.join(parts), input_tokens=usage.get('input', 0),
+                             output_tokens=usage.get('output', 0), stop_reason=stop_reason), first_token
+
+    def _stream_bedrock_nova(self, model_config, prompt, prefix=None, prefill=None):
+        return self._stream_bedrock_events(model_config, self._format_prompt_nova(prompt, model_config, prefix, prefill))
+
+    def _stream_bedrock_claude(self, model_config, prompt, prefix=None, prefill=None):
+        return self._stream_bedrock_events(model_config, self._format_prompt_claude(prompt, model_config, prefix, prefill),
+                                           contentType=model_config['content_type'])
+
+    def _stream_openai_gpt(self, model_config, prompt, prefix=None, prefill=None):
+        """Stream an OpenAI-compatible chat completion; returns (ModelResponse, first token time)"""
+        stream = self.openai_client.chat.completions.create(
+            model=model_config['model_id'],
+            messages=self._format_prompt_openai(prompt, prefix, prefill),
+            stream=True
+        )
+        parts = []
+        first_token = None
+        usage = None
+        stop_reason = None
+        for chunk in stream:
+            # Only providers (and openai versions) supporting stream_options report usage in a stream
+            if getattr(chunk, 'usage', None) is not None:
+                usage = chunk.usage
+            if not chunk.choices:
+                continue
+            delta = chunk.choices[0].delta.content
+            if delta:
+                if first_token is None:
+                    first_token = time.perf_counter()
+                parts.append(delta)
+            stop_reason = chunk.choices[0].finish_reason or stop_reason
+        text = ''.join(parts)
+        if usage is None:
+            return ModelResponse(
+                text=text,
+                input_tokens=estimate_tokens(self._join_prompt(prompt, prefix)),
+                output_tokens=estimate_tokens(text),
+                stop_reason=stop_reason
+            ), first_token
+        return ModelResponse(
+            text=text,
+            input_tokens=getattr(usage, 'prompt_tokens', 0) or 0,
+            output_tokens=getattr(usage, 'completion_tokens', 0) or 0,
+            cache_read_tokens=getattr(usage, 'prompt_cache_hit_tokens', 0) or 0,
+            stop_reason=stop_reason
+        ), first_token
+
+    def generate_response_timed(self, model_name, prompt, prefix=None):
+        """One call without retries, coalescing or caching, timed for benchmarking
+        
+        Providers with a streaming API (Bedrock, OpenAI-compatible) are
+        streamed so the time to first token can be measured; SageMaker is not.
+        
+        Args:
+            model_name (str): Name of the model to use
+            prompt (str): The input prompt
+            prefix (str): Optional static instructions (see generate_response)
+            
+        Returns:
+            tuple: (ModelResponse, total seconds, seconds to first token or None)
+        """
+        model_config, method_name = self._resolve_call_method(model_name)
+        stream_method = getattr(self, method_name.replace('_call_', '_stream_', 1), None)
+        start = time.perf_counter()
+        with span(f"llm.{model_name}", 'llm', mode='benchmark') as args:
+            if stream_method is not None:
+                response, first_token = stream_method(model_config, prompt, prefix)
+            else:
+                response, first_token = getattr(self, method_name)(model_config, prompt, prefix), None
+            args.update(input_tokens=response.input_tokens, output_tokens=response.output_tokens)
+        seconds = time.perf_counter() - start
+        self._record_usage(model_name, response)
+        return response, seconds, (first_token - start) if first_token is not None else None
+
+    def _resolve_call_method(self, model_name):
+        """Look up the model config and the name of the _call_* method that serves it"""
+        if model_name not in MODEL_CONFIGS:
+            raise ValueError(f"Unsupported model: {model_name}")
+            
+        model_config = MODEL_CONFIGS[model_name]
+        
+        # method_name = f"_call_{model_config['type']}_{model_name}"
+        # For OpenAI-compatible models, always use _call_openai_gpt; variants such as
+        # 'nova-lite' or 'haiku' name the request format they share via 'request_format'
+        request_format = model_config.get('request_format', model_name)
+        method_name = f"_call_openai_gpt" if self.model_config['type'] == 'openai' else f"_call_{self.model_config['type']}_{request_format}"
+    
+        if not hasattr(self, method_name):
+            raise ValueError(f"Method {method_name} not implemented for model {model_name}")
+        
+        return model_config, method_name
+
+    def _breaker(self, model_config):
+        """Circuit breaker of the provider serving model_config (one per OpenAI-compatible endpoint)"""
+        provider = model_config['name'] if model_config['type'] == 'openai' else model_config['type']
+        return get_breaker(provider)
+
+    def _call_with_breaker(self, breaker, call):
+        """Run call() unless the breaker is open, recording the outcome on the breaker"""
+        breaker.before_call()
+        try:
+            response = call()
+        except Exception as e:
+            if classify_error(e) != FATAL:
+                breaker.record_failure()
+            raise
+        breaker.record_success()
+        return response
+
+    def _recorded_call(self, model_name, prompt, prefix, prefill, call):
+        """Run a blocking provider call through the record/replay cassette"""
+        key = CASSETTE.request_key(model_name, prefix, prompt, prefill)
+        return ModelResponse(**CASSETTE.call('llm', key, lambda: asdict(call()), label=model_name))
+
+    async def _arecorded_call(self, model_name, prompt, prefix, call):
+        """Run an async provider call through the record/replay cassette (same keys as _recorded_call)"""
+        key = CASSETTE.request_key(model_name, prefix, prompt, None)
+
+        async def run():
+            return asdict(await call())
+        return ModelResponse(**await CASSETTE.acall('llm', key, run, label=model_name))
+
+    def _request_key(self, model_name, prompt, prefix=None, prefill=None):
+        """Single-flight key: model plus the prompt with whitespace normalized"""
+        model_id = MODEL_CONFIGS.get(model_name, {}).get('model_id') or MODEL_CONFIGS.get(model_name, {}).get('endpoint_name')
+        return content_hash(self.model_config['type'], model_name, model_id,
+                            ' '.join((prefix or '').split()), ' '.join(prompt.split()), prefill or '')
+
+    def _record_usage(self, model_name, response):
+        """Accumulate token usage (including prompt-cache reads/writes) for log_usage()"""
+        with self._usage_lock:
+            totals = self._usage.setdefault(model_name, {
+                'calls': 0, 'input_tokens': 0, 'output_tokens': 0,
+                'cache_read_tokens': 0, 'cache_write_tokens': 0
+            })
+            totals['calls'] += 1
+            totals['input_tokens'] += response.input_tokens
+            totals['output_tokens'] += response.output_tokens
+            totals['cache_read_tokens'] += response.cache_read_tokens
+            totals['cache_write_tokens'] += response.cache_write_tokens
+        logger.info(f"Usage: {response.input_tokens} input tokens "
+                    f"({response.cache_read_tokens} read from prompt cache, "
+                    f"{response.cache_write_tokens} written), {response.output_tokens} output tokens")
+
+    def _semantic_lookup(self, model_name, prompt, prefix=None):
+        """Response stored for a near-identical earlier request, or None (reused responses bill no tokens)"""
+        if self.semantic_cache is None or CASSETTE.active:
+            return None
+        cached, _ = self.semantic_cache.lookup(model_name, prompt, prefix)
+        if cached is None:
+            return None
+        return ModelResponse(text=cached['text'], stop_reason=cached['stop_reason'],
+                             continuations=cached['continuations'])
+
+    def _semantic_store(self, model_name, prompt, prefix, response):
+        """Offer a finished response to the semantic cache (truncated ones are not reused)"""
+        if self.semantic_cache is not None and not response.truncated:
+            self.semantic_cache.store(model_name, prompt, prefix, {
+                'text': response.text, 'stop_reason': response.stop_reason, 'continuations': response.continuations})
+
+    def usage_summary(self):
+        """Return accumulated token usage per model name"""
+        with self._usage_lock:
+            return {name: dict(totals) for name, totals in self._usage.items()}
+
+    def log_usage(self):
+        """Log accumulated token usage per model, including prompt-cache hits"""
+        for model_name, totals in self.usage_summary().items():
+            cached_share = totals['cache_read_tokens'] / totals['input_tokens'] if totals['input_tokens'] else 0
+            logger.info(f"Token usage for {model_name}: {totals['calls']} calls, "
+                        f"{totals['input_tokens']} input tokens "
+                        f"({totals['cache_read_tokens']} cache reads, {cached_share*100:.1f}%; "
+                        f"{totals['cache_write_tokens']} cache writes), "
+                        f"{totals['output_tokens']} output tokens")
+        if self.semantic_cache is not None:
+            stats = self.semantic_cache.stats
+            logger.info(f"Semantic cache for {self.model_config['name']}: {stats['hits']} hits "
+                        f"({stats['exact_hits']} exact), {stats['misses']} misses, {stats['stores']} stored")
+
+    def generate_response(self, model_name, prompt, prefix=None):
         """Generate response using specified model with retry mechanism
         
+        Concurrent calls with the same model and (whitespace-normalized) prompt
+        are coalesced: one request is sent and every caller gets its result or error.
+        
         Args:
             model_name (str): Name of the model to use
             prompt (str): The input prompt
+            prefix (str): Optional static instructions sent before the prompt; marked
+                as a prompt-cache point for models with 'prompt_caching' enabled
             
         Returns:
             str: Generated response
@@ -281,23 +665,240 @@ class ModelManager:
         Raises:
             Exception: If all retry attempts fail
         """
-        if model_name not in MODEL_CONFIGS:
-            raise ValueError(f"Unsupported model: {model_name}")
+        return self.generate_response_full(model_name, prompt, prefix).text
+
+    def generate_response_full(self, model_name, prompt, prefix=None, prefill=None):
+        """Like generate_response, but return the ModelResponse with usage and stop reason
+        
+        A prefill is sent as the start of the assistant turn; the returned text is
+        only what the model added after it.
+        """
+        if prefill is None:
+            cached = self._semantic_lookup(model_name, prompt, prefix)
+            if cached is not None:
+                return cached
+        if not SINGLE_FLIGHT_ENABLED:
+            response = self._generate_response_with_retry(model_name, prompt, prefix, prefill)
+        else:
+            response = SINGLE_FLIGHT.do(self._request_key(model_name, prompt, prefix, prefill),
+                                        self._generate_response_with_retry, model_name, prompt, prefix, prefill)
+        if prefill is None:
+            self._semantic_store(model_name, prompt, prefix, response)
+        return response
+
+    def generate_complete_response(self, model_name, prompt, prefix=None, required_sections=(),
+                                   max_continuations=MAX_CONTINUATIONS):
+        """Generate a response, continuing it instead of regenerating when it comes back incomplete
+        
+        An answer that stopped at max_tokens, or lacks one of required_sections, is
+        sent back as assistant prefill and the model appends only the missing part,
+        so the tokens already generated are not paid for again.
+        
+        Args:
+            model_name (str): Name of the model to use
+            prompt (str): The input prompt
+            prefix (str): Optional static instructions (see generate_response)
+            required_sections (tuple): Headings that must each start a line, e.g. '### Conclusion'
+            max_continuations (int): Maximum number of continuation requests
             
-        model_config = MODEL_CONFIGS[model_name]
+        Returns:
+            ModelResponse: Joined text with usage summed over all requests
+        """
+        response = self.generate_response_full(model_name, prompt, prefix)
+        text = response.text
+        while True:
+            missing = missing_sections(text, required_sections)
+            if not (response.truncated or missing):
+                break
+            reason = f"stopped at max_tokens ({response.stop_reason})" if response.truncated \
+                else f"missing {', '.join(missing)}"
+            if response.continuations >= max_continuations:
+                logger.warning(f"Response from {model_name} is still incomplete ({reason}) "
+                               f"after {response.continuations} continuations")
+                break
+            
+            logger.info(f"Response from {model_name} is incomplete ({reason}); "
+                        f"continuing from {len(text)} characters")
+            # Prefill must not end in whitespace (Claude rejects it); the continuation supplies it
+            prefill = text.rstrip()
+            continuation = self.generate_response_full(model_name, prompt, prefix, prefill=prefill)
+            text = prefill + continuation.text
+            response = ModelResponse(
+                text=text,
+                input_tokens=response.input_tokens + continuation.input_tokens,
+                output_tokens=response.output_tokens + continuation.output_tokens,
+                cache_read_tokens=response.cache_read_tokens + continuation.cache_read_tokens,
+                cache_write_tokens=response.cache_write_tokens + continuation.cache_write_tokens,
+                stop_reason=continuation.stop_reason,
+                continuations=response.continuations + 1
+            )
+            if not continuation.text.strip():
+                # Asking again would pay for the prompt and the whole prefill for nothing
+                logger.warning(f"Continuation from {model_name} added nothing ({continuation.stop_reason}); "
+                               f"keeping the incomplete answer")
+                break
+        if response.continuations:
+            # Store the joined answer so a near-identical request gets it without continuing again
+            self._semantic_store(model_name, prompt, prefix, response)
+        return response
+
+    @retry(**RETRY_POLICY)
+    def _generate_response_with_retry(self, model_name, prompt, prefix=None, prefill=None):
+        """Single model call wrapped in the tenacity retry policy"""
+        model_config, method_name = self._resolve_call_method(model_name)
         logger.info(f"Generating response using {model_name} model")
         
         try:
-            # method_name = f"_call_{model_config['type']}_{model_name}"
-            # For OpenAI-compatible models, always use _call_openai_gpt
-            method_name = f"_call_openai_gpt" if self.model_config['type'] == 'openai' else f"_call_{self.model_config['type']}_{model_name}"
-        
-            if not hasattr(self, method_name):
-                raise ValueError(f"Method {method_name} not implemented for model {model_name}")
-            
             method = getattr(self, method_name)
-            return method(model_config, prompt)
+            with span(f"llm.{model_name}", 'llm') as args:
+                response = self._call_with_breaker(self._breaker(model_config), lambda: self._recorded_call(
+                    model_name, prompt, prefix, prefill, lambda: method(model_config, prompt, prefix, prefill)))
+                args.update(input_tokens=response.input_tokens, output_tokens=response.output_tokens)
+            self._record_usage(model_name, response)
+            return response
             
         except Exception as e:
             logger.error(f"Error in {model_name} model call: {str(e)}")
-            raise 
\ No newline at end of file
+            raise
+
+    def _get_async_openai_client(self):
+        """Create the AsyncOpenAI client on first use, sharing one pooled httpx.AsyncClient"""
+        if self.async_openai_client is None:
+            http_client = httpx.AsyncClient(
+                limits=httpx.Limits(
+                    max_connections=ASYNC_MAX_IN_FLIGHT,
+                    max_keepalive_connections=ASYNC_MAX_IN_FLIGHT
+                )
+            )
+            client_kwargs = {
+                'api_key': self.model_config['api_key'],
+                'http_client': http_client
+            }
+            if self.model_config.get('base_url'):
+                client_kwargs['base_url'] = self.model_config['base_url']
+            self.async_openai_client = AsyncOpenAI(**client_kwargs)
+            logger.info(f"Initialized async OpenAI-compatible client for {self.model_config['name']}")
+        return self.async_openai_client
+
+    def _get_executor(self):
+        """Thread pool that runs blocking boto3 calls (Bedrock, SageMaker) for the async API"""
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(
+                max_workers=ASYNC_EXECUTOR_WORKERS,
+                thread_name_prefix=f"{self.model_config['name']}-invoke"
+            )
+        return self._executor
+
+    def _get_semaphore(self):
+        """Bound the number of requests in flight on the event loop"""
+        if self._semaphore is None:
+            self._semaphore = asyncio.Semaphore(ASYNC_MAX_IN_FLIGHT)
+        return self._semaphore
+
+    async def _acall_openai_gpt(self, model_config, prompt, prefix=None):
+        """Call OpenAI-compatible model without blocking the event loop"""
+        try:
+            messages = self._format_prompt_openai(prompt, prefix)
+            response = await self._get_async_openai_client().chat.completions.create(
+                model=model_config['model_id'],
+                messages=messages,
+            )
+            return self._openai_response(response)
+            
+        except Exception as e:
+            logger.error(f"Error in async OpenAI model call: {str(e)}")
+            raise
+
+    async def _acall_in_executor(self, method_name, model_config, prompt, prefix=None):
+        """Adapt a blocking _call_* method (boto3) to a coroutine via the executor"""
+        loop = asyncio.get_running_loop()
+        method = getattr(self, method_name)
+        return await loop.run_in_executor(self._get_executor(), method, model_config, prompt, prefix)
+
+    async def agenerate_response(self, model_name, prompt, prefix=None):
+        """Coroutine counterpart of generate_response with the same retry/backoff policy
+        
+        OpenAI-compatible providers use AsyncOpenAI natively; Bedrock and SageMaker
+        calls run on a thread pool so the event loop is never blocked. Identical
+        in-flight requests on the event loop are coalesced like in generate_response.
+        
+        Args:
+            model_name (str): Name of the model to use
+            prompt (str): The input prompt
+            prefix (str): Optional static instructions (see generate_response)
+            
+        Returns:
+            str: Generated response
+            
+        Raises:
+            Exception: If all retry attempts fail
+        """
+        return (await self.agenerate_response_full(model_name, prompt, prefix)).text
+
+    async def agenerate_response_full(self, model_name, prompt, prefix=None):
+        """Like agenerate_response, but return the ModelResponse with usage and stop reason"""
+        cached = self._semantic_lookup(model_name, prompt, prefix)
+        if cached is not None:
+            return cached
+        if not SINGLE_FLIGHT_ENABLED:
+            response = await self._agenerate_response_with_retry(model_name, prompt, prefix)
+        else:
+            response = await SINGLE_FLIGHT.ado(self._request_key(model_name, prompt, prefix),
+                                               self._agenerate_response_with_retry, model_name, prompt, prefix)
+        self._semantic_store(model_name, prompt, prefix, response)
+        return response
+
+    @retry(**RETRY_POLICY)
+    async def _agenerate_response_with_retry(self, model_name, prompt, prefix=None):
+        """Single async model call wrapped in the tenacity retry policy"""
+        model_config, method_name = self._resolve_call_method(model_name)
+        logger.info(f"Generating async response using {model_name} model")
+        
+        try:
+            breaker = self._breaker(model_config)
+            breaker.before_call()
+            try:
+                async with self._get_semaphore():
+                    with span(f"llm.{model_name}", 'llm', mode='async') as args:
+                        if method_name == '_call_openai_gpt':
+                            call = lambda: self._acall_openai_gpt(model_config, prompt, prefix)
+                        else:
+                            call = lambda: self._acall_in_executor(method_name, model_config, prompt, prefix)
+                        response = await self._arecorded_call(model_name, prompt, prefix, call)
+                        args.update(input_tokens=response.input_tokens, output_tokens=response.output_tokens)
+            except Exception as e:
+                if classify_error(e) != FATAL:
+                    breaker.record_failure()
+                raise
+            breaker.record_success()
+            self._record_usage(model_name, response)
+            return response
+            
+        except Exception as e:
+            logger.error(f"Error in async {model_name} model call: {str(e)}")
+            raise
+
+    async def agenerate_responses(self, model_name, prompts):
+        """Run many prompts concurrently on the current event loop
+        
+        Args:
+            model_name (str): Name of the model to use
+            prompts (list): Input prompts
+            
+        Returns:
+            list: Responses in prompt order; failed prompts hold their exception
+        """
+        return await asyncio.gather(
+            *(self.agenerate_response(model_name, prompt) for prompt in prompts),
+            return_exceptions=True
+        )
+
+    async def aclose(self):
+        """Release async resources (HTTP connection pool and executor threads)"""
+        if self.async_openai_client is not None:
+            await self.async_openai_client.close()
+            self.async_openai_client = None
+        if self._executor is not None:
+            self._executor.shutdown(wait=False)
+            self._executor = None
+        self._semaphore = None
@@ -0,0 +1,96 @@
+import logging
+import threading
+from config.config import MODEL_CONFIGS, MODEL_TIERING_ENABLED
+
+logger = logging.getLogger(__name__)
+
+def estimate_cost(model_name, input_tokens, output_tokens, cache_read_tokens=0):
+    """
+    Dollar cost of a call from MODEL_CONFIGS 'price_per_1k_tokens'
+    Args:
+        model_name: MODEL_CONFIGS key
+        input_tokens: All prompt tokens (including cache reads)
+        output_tokens: Completion tokens
+        cache_read_tokens: Prompt tokens served from the provider's prompt cache
+    Returns:
+        float: Estimated cost in USD (0 when the model has no price configured)
+    """
+    prices = MODEL_CONFIGS.get(model_name, {}).get('price_per_1k_tokens', {})
+    uncached = max(input_tokens - cache_read_tokens, 0)
+    cache_price = prices.get('cache_read', prices.get('input', 0))
+    return (uncached * prices.get('input', 0)
+            + cache_read_tokens * cache_price
+            + output_tokens * prices.get('output', 0)) / 1000
+
+def choose_model(model_name, video_count, input_tokens):
+    """
+    Pick the model tier for a step 3 job
+    Args:
+        model_name: The run's (heavyweight) model, as chosen on the command line
+        video_count: Number of videos in the job
+        input_tokens: Estimated prompt tokens of the job
+    Returns:
+        tuple: (model name to call, tier label 'small' or 'large')
+    """
+    tiering = MODEL_CONFIGS[model_name].get('tiering')
+    if not MODEL_TIERING_ENABLED or not tiering:
+        return model_name, 'large'
+    if video_count <= tiering['max_videos'] and input_tokens <= tiering['max_input_tokens']:
+        return tiering['small_model'], 'small'
+    return model_name, 'large'
+
+class TierStats:
+    """Per-tier latency, token and cost accounting, reported at the end of a run"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._calls = {}
+
+    def record(self, tier, model_name, latency, response):
+        """
+        Record one completed call
+        Args:
+            tier: 'small', 'large' or 'final'
+            model_name: MODEL_CONFIGS key that served the call
+            latency: Wall-clock seconds
+            response: ModelResponse with token usage
+        """
+        cost = estimate_cost(model_name, response.input_tokens, response.output_tokens,
+                             response.cache_read_tokens)
+        with self._lock:
+            self._calls.setdefault((tier, model_name), []).append(
+                (latency, response.input_tokens, response.output_tokens, cost))
+
+    def summary(self):
+        """Return one dict per (tier, model) with call count, latency and cost figures"""
+        rows = []
+        with self._lock:
+            items = sorted(self._calls.items())
+        for (tier, model_name), calls in items:
+            latencies = sorted(call[0] for call in calls)
+            rows.append({
+                'tier': tier,
+                'model': model_name,
+                'calls': len(calls),
+                'latency_avg': sum(latencies) / len(latencies),
+                'latency_p50': latencies[len(latencies) // 2],
+                'latency_max': latencies[-1],
+                'input_tokens': sum(call[1] for call in calls),
+                'output_tokens': sum(call[2] for call in calls),
+                'cost': sum(call[3] for call in calls),
+            })
+        return rows
+
+    def log_report(self):
+        """Log the per-tier latency and cost table"""
+        rows = self.summary()
+        if not rows:
+            return
+        logger.info("Model tier report:")
+        logger.info(f"{'tier':<6} {'model':<12} {'calls':>5} {'avg s':>7} {'p50 s':>7} {'max s':>7} "
+                    f"{'in tok':>8} {'out tok':>8} {'cost $':>9}")
+        for row in rows:
+            logger.info(f"{row['tier']:<6} {row['model']:<12} {row['calls']:>5} "
+                        f"{row['latency_avg']:>7.1f} {row['latency_p50']:>7.1f} {row['latency_max']:>7.1f} "
+                        f"{row['input_tokens']:>8} {row['output_tokens']:>8} {row['cost']:>9.4f}")
+        logger.info(f"Total estimated cost: ${sum(row['cost'] for row in rows):.4f}")
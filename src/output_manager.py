@@ -1,11 +1,171 @@
 import os
-import sys
+import csv
+import stat
+import json
 import logging
+import tempfile
 import pandas as pd
 from datetime import datetime
+from src.profiler import span
+from src.video_records import VideoCollection
 
 logger = logging.getLogger(__name__)
 
+PARTIAL_SUFFIX = '.partial'
+# Whole-file writes go through uniquely named '<file>.<random>.tmp' files, never a sink's '.partial'
+TEMP_SUFFIX = '.tmp'
+
+def write_atomically(output_path, write, newline=None):
+    """
+    Write a file through a temporary file in the same directory, then rename it over output_path
+    Args:
+        output_path: Final path; readers see either the old or the complete new file
+        write: Callable receiving the open text file
+        newline: Passed to open() (use '' for csv writers)
+    """
+    directory = os.path.dirname(output_path) or '.'
+    # Temporary files are created 0600: keep the target's mode, or derive one from its directory
+    if os.path.exists(output_path):
+        mode = stat.S_IMODE(os.stat(output_path).st_mode)
+    else:
+        mode = stat.S_IMODE(os.stat(directory).st_mode) & 0o666
+    tmp = tempfile.NamedTemporaryFile('w', encoding='utf-8', newline=newline, dir=directory,
+                                      prefix=os.path.basename(output_path) + '.', suffix=TEMP_SUFFIX, delete=False)
+    try:
+        with tmp as f:
+            write(f)
+        os.chmod(tmp.name, mode)
+        os.replace(tmp.name, output_path)
+    except BaseException:
+        if os.path.exists(tmp.name):
+            os.remove(tmp.name)
+        raise
+
+class CsvSink:
+    """Append-only CSV writer that only publishes complete files
+
+    Rows are written to '<file>.partial' in buffered batches; each flush is
+    fsync'ed and recorded in a '<file>.partial.json' sidecar (row count and byte
+    offset). commit() renames the partial file over the final name atomically,
+    so readers only ever see complete CSVs. If the process dies, the partial
+    file stays behind and can be resumed from its last recorded flush.
+    """
+
+    def __init__(self, output_path, fieldnames=None, flush_rows=100, resume=False):
+        self.output_path = output_path
+        self.partial_path = output_path + PARTIAL_SUFFIX
+        self.meta_path = self.partial_path + '.json'
+        self.fieldnames = list(fieldnames) if fieldnames else None
+        self.flush_rows = flush_rows
+        self.rows_written = 0
+        self._buffer = []
+        self._file = None
+        self._writer = None
+        self.committed = False
+
+        if resume and self._load_partial():
+            logger.info(f"Resuming {self.partial_path} after {self.rows_written} rows")
+        else:
+            self._discard_partial()
+
+    def _load_partial(self):
+        """Reopen a partial file, truncated to its last complete flush. Returns True on success"""
+        if not (os.path.exists(self.partial_path) and os.path.exists(self.meta_path)):
+            return False
+        with open(self.meta_path, encoding='utf-8') as f:
+            meta = json.load(f)
+        if self.fieldnames and meta['fieldnames'] != self.fieldnames:
+            logger.warning(f"Columns changed since {self.partial_path} was written; starting over")
+            return False
+
+        self.fieldnames = meta['fieldnames']
+        self.rows_written = meta['rows']
+        self._file = open(self.partial_path, 'r+', encoding='utf-8', newline='')
+        self._file.truncate(meta['bytes'])  # drop any half-written rows after the last flush
+        self._file.seek(meta['bytes'])
+        self._writer = csv.DictWriter(self._file, fieldnames=self.fieldnames, lineterminator='\n')
+        return True
+
+    def _discard_partial(self):
+        for path in (self.partial_path, self.meta_path):
+            if os.path.exists(path):
+                os.remove(path)
+
+    def _open(self):
+        self._file = open(self.partial_path, 'w', encoding='utf-8', newline='')
+        self._writer = csv.DictWriter(self._file, fieldnames=self.fieldnames, lineterminator='\n')
+        self._writer.writeheader()
+
+    def read_partial(self):
+        """Yield the rows already flushed to the partial file (e.g. to skip finished work on resume)"""
+        if self.rows_written == 0:
+            return
+        with open(self.partial_path, encoding='utf-8', newline='') as f:
+            for i, row in enumerate(csv.DictReader(f)):
+                if i >= self.rows_written:
+                    break
+                yield row
+
+    def append(self, record):
+        """Buffer one record; the buffer is flushed every flush_rows records"""
+        if self.committed:
+            raise ValueError(f"Sink for {self.output_path} is already committed")
+        if self.fieldnames is None:
+            self.fieldnames = list(record.keys())
+        self._buffer.append({k: ('' if isinstance(v, float) and v != v else v) for k, v in record.items()})
+        if len(self._buffer) >= self.flush_rows:
+            self.flush()
+
+    def extend(self, records):
+        for record in records:
+            self.append(record)
+
+    def flush(self):
+        """Write buffered rows, fsync them and record the new durable position"""
+        if self._writer is None:
+            if self.fieldnames is None:
+                return
+            self._open()
+        self._writer.writerows(self._buffer)
+        self.rows_written += len(self._buffer)
+        self._buffer = []
+        self._file.flush()
+        os.fsync(self._file.fileno())
+
+        meta = {'fieldnames': self.fieldnames, 'rows': self.rows_written, 'bytes': self._file.tell()}
+        tmp_meta = self.meta_path + '.tmp'
+        with open(tmp_meta, 'w', encoding='utf-8') as f:
+            json.dump(meta, f)
+        os.replace(tmp_meta, self.meta_path)
+
+    def commit(self):
+        """Flush remaining rows and atomically publish the complete file"""
+        self.flush()
+        if self._file is None:
+            raise ValueError(f"Nothing was written to {self.output_path}")
+        self._file.close()
+        os.replace(self.partial_path, self.output_path)
+        os.remove(self.meta_path)
+        self.committed = True
+        logger.info(f"Committed {self.rows_written} rows to {self.output_path}")
+
+    def close(self):
+        """Flush and close without publishing; the partial file is kept for resuming"""
+        if self._file is not None and not self._file.closed:
+            self.flush()
+            self._file.close()
+            logger.warning(f"Left incomplete output at {self.partial_path} ({self.rows_written} rows)")
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        if exc_type is None:
+            self.commit()
+        else:
+            self.close()
+        return False
+
 class OutputManager:
     def __init__(self):
         # Create output directory if not exists
@@ -46,9 +206,13 @@ class OutputManager:
         root_logger.addHandler(console_handler)
     
     def save_to_csv(self, data, filename, use_timestamp=False):
+        with span('save_to_csv', 'io', file=filename):
+            self._save_to_csv(data, filename, use_timestamp)
+    
+    def _save_to_csv(self, data, filename, use_timestamp=False):
         try:
-            # Create DataFrame from all available data
-            df = pd.DataFrame(data)
+            # Create DataFrame from all available data (column-wise for a VideoCollection)
+            df = data.to_dataframe() if isinstance(data, VideoCollection) else pd.DataFrame(data)
             
             # Determine save path
             if use_timestamp:
@@ -56,15 +220,31 @@ class OutputManager:
             else:
                 output_path = os.path.join('output', filename)
             
-            # Save to CSV
-            df.to_csv(output_path, index=False, encoding='utf-8')
+            # Save to CSV via a temporary file so a crash never leaves a truncated CSV behind
+            write_atomically(output_path, lambda f: df.to_csv(f, index=False), newline='')
             logger.info(f"Data saved to {output_path}")
             
             # Log column information
             logger.info(f"Saved columns: {', '.join(df.columns)}")
         except Exception as e:
             logger.error(f"Error saving CSV: {str(e)}")
-            sys.exit(1)
+            raise
+    
+    def open_csv_sink(self, filename, fieldnames=None, use_timestamp=False, flush_rows=100, resume=False):
+        """
+        Open a streaming CSV writer; use as a context manager to commit on success
+        Args:
+            filename: Name of the final CSV file
+            fieldnames: Column order (defaults to the keys of the first record)
+            use_timestamp: Write into the timestamped log directory instead of output/
+            flush_rows: Number of buffered records per durable flush
+            resume: Continue an existing '<filename>.partial' left by an interrupted run
+        Returns:
+            CsvSink: Sink accepting append()/extend() and publishing on commit()
+        """
+        output_dir = self.log_dir if use_timestamp else 'output'
+        return CsvSink(os.path.join(output_dir, filename), fieldnames=fieldnames,
+                       flush_rows=flush_rows, resume=resume)
     
     def save_to_txt(self, content, filename):
         """
@@ -75,8 +255,7 @@ class OutputManager:
         """
         try:
             output_path = os.path.join('output', filename)
-            with open(output_path, 'w', encoding='utf-8') as f:
-                f.write(content)
+            write_atomically(output_path, lambda f: f.write(content))
             logger.info(f"Text saved to {output_path}")
         except Exception as e:
             logger.error(f"Error saving text file: {str(e)}")
@@ -0,0 +1,78 @@
+import logging
+import threading
+from config.config import MODEL_CONFIGS, PREWARM_CONFIG
+from src.cassette import CASSETTE
+from src.model_manager import ModelManager
+from src.profiler import span
+
+logger = logging.getLogger(__name__)
+
+class ClientPrewarmer:
+    """Builds and warms the step 3-4 model clients on a background thread
+
+    Credential resolution, client construction and the first connection setup
+    (DNS, TLS) then overlap with steps 1-2 instead of delaying the first step 3
+    call. A failure is only logged: step 3 builds its own client as before and
+    reports the error there.
+    """
+
+    def __init__(self, model_config, prewarm_config=None):
+        """
+        Args:
+            model_config: Configuration of the run's model
+            prewarm_config: Overrides for PREWARM_CONFIG (enabled, mode, timeout_seconds)
+        """
+        self.model_config = model_config
+        self.config = {**PREWARM_CONFIG, **(prewarm_config or {})}
+        self._managers = {}
+        self._thread = None
+
+    def model_names(self):
+        """The run's model plus its small tier model, if tiering is configured"""
+        names = [self.model_config['name']]
+        small_model = (self.model_config.get('tiering') or {}).get('small_model')
+        if small_model in MODEL_CONFIGS and small_model not in names:
+            names.append(small_model)
+        return names
+
+    def start(self):
+        """Start prewarming in the background (no-op when disabled, recording or replaying)"""
+        if self.config['enabled'] and not CASSETTE.active and self._thread is None:
+            self._thread = threading.Thread(target=self._run, daemon=True, name='prewarm')
+            self._thread.start()
+        return self
+
+    def _run(self):
+        for model_name in self.model_names():
+            tier_config = MODEL_CONFIGS[model_name]
+            try:
+                with span('prewarm_client', 'client', model=model_name):
+                    # Same reuse rule as main.get_model_manager: one client per provider type
+                    run_manager = self._managers.get(self.model_config['name'])
+                    if run_manager is not None and tier_config['type'] == self.model_config['type']:
+                        self._managers[model_name] = run_manager
+                        continue
+                    manager = ModelManager(tier_config)
+                    manager.prewarm(self.config['mode'])
+                    self._managers[model_name] = manager
+            except Exception as e:
+                logger.warning(f"Could not prewarm {model_name}; it will be initialized on first use: {str(e)}")
+
+    def join(self):
+        """Wait (at most timeout_seconds) for the prewarm thread; returns False if it is still running"""
+        if self._thread is not None:
+            self._thread.join(self.config['timeout_seconds'])
+        return self._thread is None or not self._thread.is_alive()
+
+    def model_managers(self):
+        """
+        Wait (at most timeout_seconds) for prewarming to finish
+        Returns:
+            dict: Model name -> prewarmed ModelManager; empty if disabled, failed or not done in time
+        """
+        if self._thread is None:
+            return {}
+        if not self.join():
+            logger.warning(f"Prewarming still running after {self.config['timeout_seconds']}s; not waiting for it")
+            return {}
+        return dict(self._managers)
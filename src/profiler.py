@@ -0,0 +1,167 @@
+import os
+import io
+import json
+import time
+import asyncio
+import pstats
+import cProfile
+import logging
+import threading
+import functools
+import tracemalloc
+from contextlib import contextmanager
+
+logger = logging.getLogger(__name__)
+
+class Tracer:
+    """Timing spans written as a Chrome trace (chrome://tracing, Perfetto, speedscope)
+
+    Disabled by default, in which case span() costs one attribute check. Steps can
+    additionally be run under cProfile (CPU hotspots) and tracemalloc (peak memory).
+    """
+
+    def __init__(self):
+        self.enabled = False
+        self.cprofile = False
+        self.memory = False
+        self.output_dir = None
+        self._lock = threading.Lock()
+        self._events = []
+        self._origin = time.perf_counter()
+        self._step_profile_active = False
+
+    def enable(self, output_dir, cprofile=False, memory=False):
+        """
+        Start recording spans
+        Args:
+            output_dir: Directory for trace.json and per-step profiles (OutputManager.log_dir)
+            cprofile: Run each step under cProfile and write <step>.prof plus a top-functions text file
+            memory: Track allocations with tracemalloc and record each step's peak and top allocation sites
+        """
+        self.enabled = True
+        self.cprofile = cprofile
+        self.memory = memory
+        self.output_dir = output_dir
+        self._origin = time.perf_counter()
+        if memory and not tracemalloc.is_tracing():
+            tracemalloc.start(10)
+        logger.info(f"Profiling enabled (cProfile: {cprofile}, tracemalloc: {memory}); output in {output_dir}")
+
+    def _track(self):
+        """Timeline row for a span: the asyncio task if inside one (tasks overlap on one thread), else the thread"""
+        try:
+            task = asyncio.current_task()
+        except RuntimeError:
+            task = None
+        return f"task-{id(task):x}" if task is not None else threading.get_ident()
+
+    def _add(self, name, category, start, end, args, track):
+        event = {
+            'name': name,
+            'cat': category,
+            'ph': 'X',
+            'ts': (start - self._origin) * 1e6,
+            'dur': (end - start) * 1e6,
+            'pid': os.getpid(),
+            'tid': track,
+            'args': args
+        }
+        with self._lock:
+            self._events.append(event)
+
+    @contextmanager
+    def span(self, name, category='call', **args):
+        """Time a block as one trace event; extra keyword arguments are shown in the trace viewer"""
+        if not self.enabled:
+            yield args
+            return
+        track = self._track()
+        start = time.perf_counter()
+        try:
+            yield args
+        except BaseException as e:
+            args['error'] = type(e).__name__
+            raise
+        finally:
+            self._add(name, category, start, time.perf_counter(), args, track)
+
+    @contextmanager
+    def step(self, name):
+        """Span for a pipeline step, optionally under cProfile and tracemalloc"""
+        if not self.enabled:
+            yield
+            return
+        # Only the outermost step is profiled; cProfile cannot nest
+        profile = None
+        if self.cprofile and not self._step_profile_active:
+            profile = cProfile.Profile()
+            self._step_profile_active = True
+        if self.memory:
+            tracemalloc.reset_peak()
+        with self.span(name, category='step') as args:
+            if profile:
+                profile.enable()
+            try:
+                yield
+            finally:
+                if profile:
+                    profile.disable()
+                    self._step_profile_active = False
+                    self._write_profile(name, profile)
+                if self.memory:
+                    current, peak = tracemalloc.get_traced_memory()
+                    args.update(memory_current_mb=round(current / 2**20, 1), memory_peak_mb=round(peak / 2**20, 1))
+                    self._write_memory(name)
+
+    def _write_profile(self, name, profile):
+        profile.dump_stats(os.path.join(self.output_dir, f"{name}.prof"))
+        text = io.StringIO()
+        pstats.Stats(profile, stream=text).sort_stats('cumulative').print_stats(30)
+        with open(os.path.join(self.output_dir, f"{name}.profile.txt"), 'w', encoding='utf-8') as f:
+            f.write(text.getvalue())
+
+    def _write_memory(self, name):
+        top = tracemalloc.take_snapshot().statistics('lineno')[:25]
+        with open(os.path.join(self.output_dir, f"{name}.memory.txt"), 'w', encoding='utf-8') as f:
+            f.write('\n'.join(str(stat) for stat in top))
+
+    def summary(self):
+        """Total seconds and call count per (category, name)"""
+        totals = {}
+        with self._lock:
+            events = list(self._events)
+        for event in events:
+            total = totals.setdefault((event['cat'], event['name']), [0.0, 0])
+            total[0] += event['dur'] / 1e6
+            total[1] += 1
+        return totals
+
+    def write(self, filename='trace.json'):
+        """Write the Chrome trace and log the slowest span names; returns the trace path"""
+        if not self.enabled:
+            return None
+        with self._lock:
+            events = list(self._events)
+        path = os.path.join(self.output_dir, filename)
+        with open(path, 'w', encoding='utf-8') as f:
+            json.dump({'traceEvents': events, 'displayTimeUnit': 'ms'}, f)
+
+        logger.info(f"Wrote {len(events)} trace spans to {path} (open in chrome://tracing or ui.perfetto.dev)")
+        for (category, name), (seconds, calls) in sorted(self.summary().items(), key=lambda item: -item[1][0])[:15]:
+            logger.info(f"  {category:<8} {name:<40} {calls:>5} calls {seconds:>9.2f}s")
+        return path
+
+# Process-wide tracer, enabled by `main.py --profile`
+TRACER = Tracer()
+
+def span(name, category='call', **args):
+    """Shortcut for TRACER.span"""
+    return TRACER.span(name, category, **args)
+
+def traced_step(func):
+    """Decorator recording a pipeline step function as a step span"""
+    @functools.wraps(func)
+    def wrapper(*args, **kwargs):
+        with TRACER.step(func.__name__):
+            return func(*args, **kwargs)
+    return wrapper
@@ -0,0 +1,259 @@
+import json
+import time
+import random
+import logging
+import threading
+import httpx
+import openai
+from botocore.exceptions import BotoCoreError, ClientError, NoCredentialsError, PartialCredentialsError
+from config.config import RESILIENCE_CONFIG
+
+logger = logging.getLogger(__name__)
+
+# Error classes
+RETRYABLE = 'retryable'
+THROTTLED = 'throttled'
+FATAL = 'fatal'
+
+# Bedrock / SageMaker error codes
+THROTTLING_CODES = {
+    'ThrottlingException', 'TooManyRequestsException', 'ServiceQuotaExceededException',
+    'ProvisionedThroughputExceededException', 'RequestLimitExceeded', 'SlowDown'
+}
+RETRYABLE_CODES = {
+    'InternalServerException', 'ServiceUnavailableException', 'ModelNotReadyException',
+    'ModelTimeoutException', 'InternalFailure', 'ServiceUnavailable', 'RequestTimeout'
+}
+
+class CircuitOpenError(Exception):
+    """Raised without calling the provider while its circuit breaker is open"""
+
+def _status_code(exc):
+    if isinstance(exc, openai.APIStatusError):
+        return exc.status_code
+    if isinstance(exc, ClientError):
+        return exc.response.get('ResponseMetadata', {}).get('HTTPStatusCode')
+    return None
+
+def classify_error(exc):
+    """
+    Classify a model call error
+    Args:
+        exc: The exception raised by a provider call
+    Returns:
+        str: 'throttled' (retry after backing off), 'retryable' (transient) or 'fatal' (retrying cannot help)
+    """
+    if isinstance(exc, CircuitOpenError):
+        return FATAL
+    if isinstance(exc, openai.RateLimitError):
+        return THROTTLED
+    if isinstance(exc, (openai.APIConnectionError, openai.InternalServerError)):  # includes APITimeoutError
+        return RETRYABLE
+    if isinstance(exc, ClientError):
+        code = exc.response.get('Error', {}).get('Code', '')
+        if code in THROTTLING_CODES:
+            return THROTTLED
+        if code in RETRYABLE_CODES:
+            return RETRYABLE
+    if isinstance(exc, (NoCredentialsError, PartialCredentialsError)):
+        return FATAL
+    if isinstance(exc, (BotoCoreError, httpx.TransportError, ConnectionError, TimeoutError)):
+        # Connection resets, read/connect timeouts, endpoint unreachable
+        return RETRYABLE
+
+    status = _status_code(exc)
+    if status is not None:
+        if status == 429:
+            return THROTTLED
+        if status in (408, 409) or status >= 500:
+            return RETRYABLE
+        return FATAL  # other 4xx: bad request, auth, not found, validation
+    if isinstance(exc, json.JSONDecodeError):
+        return RETRYABLE  # truncated or garbled response body
+    if isinstance(exc, (ValueError, TypeError, KeyError, AttributeError, NotImplementedError)):
+        return FATAL  # unsupported model, missing API key, malformed request or response
+    return RETRYABLE
+
+def retry_after(exc):
+    """Seconds the provider asked us to wait (Retry-After / retry-after-ms header), or None"""
+    headers = {}
+    if isinstance(exc, openai.APIStatusError):
+        headers = exc.response.headers
+    elif isinstance(exc, ClientError):
+        headers = exc.response.get('ResponseMetadata', {}).get('HTTPHeaders', {})
+    try:
+        if headers.get('retry-after-ms'):
+            return float(headers['retry-after-ms']) / 1000
+        if headers.get('retry-after'):
+            return float(headers['retry-after'])
+    except (TypeError, ValueError):
+        pass  # an HTTP date rather than seconds; fall back to exponential backoff
+    return None
+
+class RetryBudget:
+    """Process-wide cap on retries, so a bad run fails quickly instead of sleeping through every call"""
+
+    def __init__(self, max_retries):
+        self.max_retries = max_retries
+        self._lock = threading.Lock()
+        self.used = 0
+        self.by_class = {RETRYABLE: 0, THROTTLED: 0}
+        self.fatal = 0
+
+    def exhausted(self):
+        with self._lock:
+            return self.used >= self.max_retries
+
+    def consume(self, error_class):
+        with self._lock:
+            self.used += 1
+            self.by_class[error_class] = self.by_class.get(error_class, 0) + 1
+
+    def record_fatal(self):
+        with self._lock:
+            self.fatal += 1
+
+    def reset(self):
+        """Start a new run's budget (long-lived processes such as serve mode reset it per refresh)"""
+        with self._lock:
+            self.used = 0
+            self.by_class = {RETRYABLE: 0, THROTTLED: 0}
+            self.fatal = 0
+
+    def stats(self):
+        with self._lock:
+            return {'used': self.used, 'remaining': max(self.max_retries - self.used, 0),
+                    'by_class': dict(self.by_class), 'fatal_errors': self.fatal}
+
+class CircuitBreaker:
+    """Per-provider breaker: opens after consecutive failures, probes again after a cool-down
+
+    closed -> (failure_threshold consecutive retryable/throttled errors) -> open
+    open -> (reset_seconds elapsed) -> half_open: one probe call is let through
+    half_open -> success closes the breaker, failure opens it again
+    """
+
+    def __init__(self, name, failure_threshold, reset_seconds):
+        self.name = name
+        self.failure_threshold = failure_threshold
+        self.reset_seconds = reset_seconds
+        self._lock = threading.Lock()
+        self.state = 'closed'
+        self.failures = 0
+        self.opened_at = None
+        self.times_opened = 0
+        self.rejected = 0
+        self._probing = False
+
+    def before_call(self):
+        """Raise CircuitOpenError instead of letting a call through to a failing provider"""
+        with self._lock:
+            if self.state == 'open' and time.monotonic() - self.opened_at >= self.reset_seconds:
+                self.state = 'half_open'
+                self._probing = False
+            if self.state == 'half_open' and not self._probing:
+                self._probing = True
+                return
+            if self.state != 'closed':
+                self.rejected += 1
+                raise CircuitOpenError(f"Circuit breaker for {self.name} is {self.state}; failing fast")
+
+    def record_success(self):
+        with self._lock:
+            if self.state != 'closed':
+                logger.info(f"Circuit breaker for {self.name} closed")
+            self.state = 'closed'
+            self.failures = 0
+            self._probing = False
+
+    def record_failure(self):
+        with self._lock:
+            self.failures += 1
+            if self.state == 'half_open' or (self.state == 'closed' and self.failures >= self.failure_threshold):
+                self.state = 'open'
+                self.opened_at = time.monotonic()
+                self.times_opened += 1
+                self._probing = False
+                logger.warning(f"Circuit breaker for {self.name} opened after {self.failures} consecutive "
+                               f"failures; failing fast for {self.reset_seconds}s")
+
+    def stats(self):
+        with self._lock:
+            return {'state': self.state, 'consecutive_failures': self.failures,
+                    'times_opened': self.times_opened, 'rejected_calls': self.rejected}
+
+RETRY_BUDGET = RetryBudget(RESILIENCE_CONFIG['retry_budget'])
+_breakers = {}
+_breakers_lock = threading.Lock()
+
+def get_breaker(provider):
+    """Process-wide circuit breaker for a provider"""
+    with _breakers_lock:
+        if provider not in _breakers:
+            _breakers[provider] = CircuitBreaker(provider, RESILIENCE_CONFIG['breaker_failure_threshold'],
+                                                 RESILIENCE_CONFIG['breaker_reset_seconds'])
+        return _breakers[provider]
+
+def resilience_stats():
+    """Retry counts, remaining budget and circuit breaker states, for monitoring"""
+    with _breakers_lock:
+        breakers = dict(_breakers)
+    return {'retries': RETRY_BUDGET.stats(),
+            'breakers': {name: breaker.stats() for name, breaker in breakers.items()}}
+
+def log_resilience_stats():
+    """Log retry counts and breaker states (nothing if no call ever failed)"""
+    stats = resilience_stats()
+    retries = stats['retries']
+    if not retries['used'] and not retries['fatal_errors'] and \
+            all(b['state'] == 'closed' and not b['times_opened'] for b in stats['breakers'].values()):
+        return
+    logger.info(f"Retries: {retries['used']} used ({retries['by_class'].get(THROTTLED, 0)} throttled, "
+                f"{retries['by_class'].get(RETRYABLE, 0)} transient), {retries['remaining']} left in budget; "
+                f"{retries['fatal_errors']} fatal errors")
+    for name, breaker in stats['breakers'].items():
+        logger.info(f"Circuit breaker {name}: {breaker['state']}, opened {breaker['times_opened']} times, "
+                    f"{breaker['rejected_calls']} calls rejected")
+
+# -- tenacity hooks -------------------------------------------------------------------------
+
+def should_retry(retry_state):
+    """tenacity retry predicate: only retry errors that are not fatal"""
+    exc = retry_state.outcome.exception()
+    if exc is None:
+        return False
+    error_class = classify_error(exc)
+    if error_class == FATAL:
+        RETRY_BUDGET.record_fatal()
+        return False
+    return True
+
+def should_stop(retry_state):
+    """tenacity stop condition: attempts per call or the run's retry budget exhausted"""
+    if retry_state.attempt_number >= RESILIENCE_CONFIG['max_attempts']:
+        return True
+    if RETRY_BUDGET.exhausted():
+        logger.warning("Retry budget for this run is exhausted; not retrying")
+        return True
+    return False
+
+def wait_time(retry_state):
+    """tenacity wait: Retry-After when the provider sent one, else exponential backoff with jitter"""
+    exc = retry_state.outcome.exception()
+    hint = retry_after(exc)
+    if hint is not None:
+        return min(hint, RESILIENCE_CONFIG['max_retry_after_seconds'])
+    attempt = retry_state.attempt_number
+    base = 4 * 2 ** (attempt - 1)  # 4s, 8s, 16s like the previous policy
+    if classify_error(exc) == THROTTLED:
+        base *= 2  # back off harder when the provider says we are too fast
+    return min(base, RESILIENCE_CONFIG['max_backoff_seconds']) * random.uniform(0.75, 1.25)
+
+def before_retry(retry_state):
+    """tenacity before_sleep: count the retry against the budget and log why"""
+    exc = retry_state.outcome.exception()
+    error_class = classify_error(exc)
+    RETRY_BUDGET.consume(error_class)
+    logger.info(f"Retrying {retry_state.fn.__name__ if retry_state.fn else 'call'} in "
+                f"{retry_state.next_action.sleep:.1f}s after {error_class} error "
+                f"(attempt {retry_state.attempt_number}): {str(exc)}")
@@ -0,0 +1,94 @@
+import os
+import json
+import time
+import sqlite3
+import logging
+import threading
+from config.config import CACHE_DB_PATH
+from src.cassette import CASSETTE
+
+logger = logging.getLogger(__name__)
+
+class ResultCache:
+    """Persistent key/value cache (SQLite) for intermediate results such as LLM summaries
+
+    Entries live in named namespaces so unrelated stages never collide, and
+    values are stored as JSON. Lookups miss while a cassette is recording or
+    replaying, so every external call of such a run is made (and recorded).
+    """
+
+    def __init__(self, namespace, db_path=CACHE_DB_PATH, ttl_seconds=None):
+        """
+        Args:
+            namespace (str): Logical cache name, e.g. 'video_summary'
+            db_path (str): Path to the SQLite database file
+            ttl_seconds (int): Optional age after which entries are treated as missing
+        """
+        directory = os.path.dirname(db_path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+        self.namespace = namespace
+        self.ttl_seconds = ttl_seconds
+        self._lock = threading.Lock()
+        self.conn = sqlite3.connect(db_path, check_same_thread=False, timeout=30)
+        with self._lock, self.conn:
+            self.conn.execute("PRAGMA journal_mode=WAL")
+            self.conn.execute("""
+                CREATE TABLE IF NOT EXISTS cache (
+                    namespace TEXT NOT NULL,
+                    key TEXT NOT NULL,
+                    value TEXT NOT NULL,
+                    updated_at REAL NOT NULL,
+                    PRIMARY KEY (namespace, key)
+                )
+            """)
+
+    def get(self, key, default=None):
+        """Return the cached value for key, or default if missing or expired"""
+        if CASSETTE.active:
+            return default
+        with self._lock:
+            row = self.conn.execute(
+                "SELECT value, updated_at FROM cache WHERE namespace = ? AND key = ?",
+                (self.namespace, key)
+            ).fetchone()
+        if row is None:
+            return default
+        if self.ttl_seconds is not None and time.time() - row[1] > self.ttl_seconds:
+            return default
+        return json.loads(row[0])
+
+    def get_many(self, keys):
+        """Return a dict of key -> value for the keys present (and not expired)"""
+        return {key: value for key in keys if (value := self.get(key)) is not None}
+
+    def set(self, key, value):
+        """Store a JSON-serializable value under key"""
+        with self._lock, self.conn:
+            self.conn.execute(
+                "INSERT OR REPLACE INTO cache (namespace, key, value, updated_at) VALUES (?, ?, ?, ?)",
+                (self.namespace, key, json.dumps(value), time.time())
+            )
+
+    def set_many(self, items):
+        """Store several key/value pairs in one transaction"""
+        now = time.time()
+        with self._lock, self.conn:
+            self.conn.executemany(
+                "INSERT OR REPLACE INTO cache (namespace, key, value, updated_at) VALUES (?, ?, ?, ?)",
+                [(self.namespace, key, json.dumps(value), now) for key, value in items.items()]
+            )
+
+    def __contains__(self, key):
+        return self.get(key) is not None
+
+    def __len__(self):
+        with self._lock:
+            return self.conn.execute(
+                "SELECT COUNT(*) FROM cache WHERE namespace = ?", (self.namespace,)
+            ).fetchone()[0]
+
+    def close(self):
+        with self._lock:
+            self.conn.close()
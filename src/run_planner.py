@@ -0,0 +1,172 @@
+import heapq
+import logging
+from config.config import MODEL_CONFIGS, PLAN_CONFIG
+from src.model_tiering import choose_model, estimate_cost
+from src.text_utils import estimate_tokens
+
+logger = logging.getLogger(__name__)
+
+class RunPlanner:
+    """Estimate tokens, cost and wall-clock time of steps 3-4 without sending any request
+
+    Calls are added in the order the pipeline would send them. Every figure is an
+    estimate: input tokens use the local ~4 chars/token heuristic, output tokens
+    and throughput come from PLAN_CONFIG.
+    """
+
+    def __init__(self, model_name, plan_config=None):
+        """
+        Args:
+            model_name: The run's model, as chosen on the command line
+            plan_config: Overrides for PLAN_CONFIG
+        """
+        self.model_name = model_name
+        self.config = {**PLAN_CONFIG, **(plan_config or {})}
+        self.calls = []
+
+    def add_call(self, step, label, prefix, prompt, video_count=0, output_tokens=None, done=False,
+                 includes_step3_outputs=False):
+        """
+        Add one planned model call
+        Args:
+            step: 'step3' or 'step4'
+            label: Industry name, or a description of the call
+            prefix: Static (cacheable) prompt prefix
+            prompt: Variable part of the prompt
+            video_count: Number of videos in the call (drives tiering and output size)
+            output_tokens: Known output size; estimated from PLAN_CONFIG when None
+            done: The result already exists on disk, so the call costs nothing
+            includes_step3_outputs: The prompt is completed by every planned step 3 answer
+                (step 4 before step 3 has run), so their estimated sizes are added to its input
+        """
+        self.calls.append({
+            'step': step,
+            'label': label,
+            'video_count': video_count,
+            'prefix_tokens': estimate_tokens(prefix),
+            'input_tokens': estimate_tokens(prefix) + estimate_tokens(prompt),
+            'output_tokens': output_tokens,
+            'done': done,
+            'includes_step3_outputs': includes_step3_outputs
+        })
+
+    def estimate_output_tokens(self, step, model_name, video_count):
+        """Expected completion size, capped by the model's max_tokens"""
+        if step == 'step4':
+            expected = self.config['step4_output_tokens']
+        else:
+            expected = (self.config['step3_output_tokens_base']
+                        + self.config['step3_output_tokens_per_video'] * video_count)
+        return min(expected, MODEL_CONFIGS[model_name]['max_tokens'])
+
+    def estimate_seconds(self, model_name, input_tokens, output_tokens):
+        """Latency of one call: time to first token, prompt processing and generation"""
+        speeds = self.config['output_tokens_per_second']
+        output_speed = speeds.get(model_name, speeds['default'])
+        return (self.config['first_token_seconds']
+                + input_tokens / self.config['input_tokens_per_second']
+                + output_tokens / output_speed)
+
+    def plan(self, model_name=None):
+        """
+        Price every call as if the run used model_name
+        Args:
+            model_name: Run model to price with; defaults to the planner's model
+        Returns:
+            list: One dict per call with model, tier, tokens, cost and seconds
+        """
+        model_name = model_name or self.model_name
+        cached_prefixes = set()
+        rows = []
+        for call in self.calls:
+            input_tokens = call['input_tokens']
+            if call['includes_step3_outputs']:
+                input_tokens += sum(row['output_tokens'] for row in rows if row['step'] == 'step3')
+            if call['step'] == 'step4':
+                call_model, tier = model_name, 'final'
+            else:
+                call_model, tier = choose_model(model_name, call['video_count'], input_tokens)
+            output_tokens = call['output_tokens']
+            if output_tokens is None:
+                output_tokens = self.estimate_output_tokens(call['step'], call_model, call['video_count'])
+
+            # The first call with a prefix writes the provider's prompt cache, later ones read it
+            cache_read_tokens = 0
+            if MODEL_CONFIGS[call_model].get('prompt_caching') and not call['done']:
+                key = (call_model, call['step'])
+                if key in cached_prefixes:
+                    cache_read_tokens = call['prefix_tokens']
+                cached_prefixes.add(key)
+
+            rows.append({
+                **call,
+                'input_tokens': input_tokens,
+                'model': call_model,
+                'tier': tier,
+                'output_tokens': output_tokens,
+                'cache_read_tokens': cache_read_tokens,
+                'cost': 0.0 if call['done'] else estimate_cost(
+                    call_model, input_tokens, output_tokens, cache_read_tokens),
+                'seconds': 0.0 if call['done'] else self.estimate_seconds(
+                    call_model, input_tokens, output_tokens)
+            })
+        return rows
+
+    def wall_clock(self, rows):
+        """
+        Expected wall-clock seconds under the configured concurrency and rate limit
+        Args:
+            rows: Output of plan()
+        Returns:
+            float: Step 3 makespan followed by step 4 (which needs every step 3 result)
+        """
+        slots = [0.0] * max(1, self.config['step3_concurrency'])
+        rpm = self.config['requests_per_minute']
+        sent = 0
+        for row in rows:
+            if row['step'] != 'step3' or row['done']:
+                continue
+            start = heapq.heappop(slots)
+            if rpm:
+                start = max(start, sent * 60.0 / rpm)
+            sent += 1
+            heapq.heappush(slots, start + row['seconds'])
+        step3_seconds = max(slots)
+        return step3_seconds + sum(row['seconds'] for row in rows if row['step'] == 'step4')
+
+    def format_report(self):
+        """Render the per-industry plan table, totals and the run cost for every model"""
+        rows = self.plan()
+        lines = [f"Run plan for model '{self.model_name}' (estimates, nothing was sent)", ""]
+        header = (f"{'step':<6} {'industry':<24} {'videos':>6} {'model':<12} {'tier':<6} "
+                  f"{'in tok':>8} {'cached':>8} {'out tok':>8} {'cost $':>9} {'est s':>7}")
+        lines += [header, '-' * len(header)]
+        for row in rows:
+            status = ' (done)' if row['done'] else ''
+            lines.append(
+                f"{row['step']:<6} {row['label'][:24]:<24} {row['video_count'] or '':>6} "
+                f"{row['model']:<12} {row['tier']:<6} {row['input_tokens']:>8} "
+                f"{row['cache_read_tokens']:>8} {row['output_tokens']:>8} "
+                f"{row['cost']:>9.4f} {row['seconds']:>7.1f}{status}")
+        lines.append('-' * len(header))
+
+        pending = [row for row in rows if not row['done']]
+        lines.append(
+            f"{len(pending)} of {len(rows)} calls to send: "
+            f"~{sum(row['input_tokens'] for row in pending)} input tokens, "
+            f"~{sum(row['output_tokens'] for row in pending)} output tokens, "
+            f"${sum(row['cost'] for row in pending):.4f}")
+        concurrency = self.config['step3_concurrency']
+        rpm = self.config['requests_per_minute']
+        lines.append(f"Estimated wall-clock: {self.wall_clock(rows) / 60:.1f} min "
+                     f"(step 3 concurrency {concurrency}, "
+                     f"{f'{rpm} requests/min' if rpm else 'no rate limit'})")
+
+        lines += ["", "Estimated cost of the remaining calls per run model:"]
+        for model_name in MODEL_CONFIGS:
+            model_rows = self.plan(model_name)
+            cost = sum(row['cost'] for row in model_rows)
+            minutes = self.wall_clock(model_rows) / 60
+            marker = '  <- selected' if model_name == self.model_name else ''
+            lines.append(f"  {model_name:<12} ${cost:>9.4f}  ~{minutes:.1f} min{marker}")
+        return '\n'.join(lines)
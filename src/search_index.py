@@ -0,0 +1,245 @@
+import os
+import sqlite3
+import logging
+import threading
+from config.config import SEARCH_INDEX_PATH
+
+logger = logging.getLogger(__name__)
+
+# Documents upserted per transaction, so streamed inputs (e.g. transcripts) are never all held at once
+INDEX_BATCH_ROWS = 500
+
+class SearchIndex:
+    """Local full-text index (SQLite FTS5) over video titles, descriptions, transcripts and insights"""
+
+    def __init__(self, db_path=SEARCH_INDEX_PATH):
+        """Open (or create) the index database
+
+        Args:
+            db_path (str): Path to the SQLite database file
+        """
+        try:
+            directory = os.path.dirname(db_path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+
+            self.db_path = db_path
+            self._lock = threading.Lock()
+            self.conn = sqlite3.connect(db_path, check_same_thread=False)
+            self.conn.row_factory = sqlite3.Row
+            self._create_schema()
+
+        except sqlite3.OperationalError as e:
+            logger.error(f"Failed to open search index {db_path}: {str(e)}")
+            raise
+
+    def _create_schema(self):
+        """Create the document table, its FTS5 shadow index, the sync triggers and the industry links"""
+        with self._lock, self.conn:
+            self.conn.executescript("""
+                CREATE TABLE IF NOT EXISTS documents (
+                    rowid INTEGER PRIMARY KEY,
+                    doc_id TEXT UNIQUE NOT NULL,
+                    kind TEXT NOT NULL,
+                    video_id TEXT,
+                    title TEXT,
+                    description TEXT,
+                    transcript TEXT,
+                    insights TEXT
+                );
+
+                CREATE VIRTUAL TABLE IF NOT EXISTS documents_fts USING fts5(
+                    title, description, transcript, insights,
+                    content='documents', content_rowid='rowid',
+                    tokenize='porter unicode61'
+                );
+
+                CREATE TRIGGER IF NOT EXISTS documents_ai AFTER INSERT ON documents BEGIN
+                    INSERT INTO documents_fts(rowid, title, description, transcript, insights)
+                    VALUES (new.rowid, new.title, new.description, new.transcript, new.insights);
+                END;
+
+                CREATE TRIGGER IF NOT EXISTS documents_ad AFTER DELETE ON documents BEGIN
+                    INSERT INTO documents_fts(documents_fts, rowid, title, description, transcript, insights)
+                    VALUES ('delete', old.rowid, old.title, old.description, old.transcript, old.insights);
+                END;
+
+                CREATE TRIGGER IF NOT EXISTS documents_au AFTER UPDATE ON documents BEGIN
+                    INSERT INTO documents_fts(documents_fts, rowid, title, description, transcript, insights)
+                    VALUES ('delete', old.rowid, old.title, old.description, old.transcript, old.insights);
+                    INSERT INTO documents_fts(rowid, title, description, transcript, insights)
+                    VALUES (new.rowid, new.title, new.description, new.transcript, new.insights);
+                END;
+
+                -- A video can belong to several industries (one industry_videos.csv row each)
+                CREATE TABLE IF NOT EXISTS document_industries (
+                    doc_id TEXT NOT NULL,
+                    industry TEXT NOT NULL,
+                    PRIMARY KEY (doc_id, industry)
+                );
+            """)
+
+    @staticmethod
+    def _text(value):
+        """Normalize a CSV/record cell to text, mapping empty and NaN cells to None"""
+        if value is None:
+            return None
+        if isinstance(value, float) and value != value:  # NaN from pandas
+            return None
+        value = str(value)
+        return value if value.strip() else None
+
+    def _upsert(self, rows):
+        """Insert or update documents, leaving unchanged rows (and their index entries) untouched
+
+        Fields passed as None keep their previously indexed value, so a row from
+        all_videos.csv does not erase the transcript added by a later step. A row's
+        industry is added to the document's industries; earlier ones are kept.
+
+        Returns:
+            int: Number of documents inserted or changed, counting new industry links
+        """
+        with self._lock, self.conn:
+            cursor = self.conn.executemany("""
+                INSERT INTO documents (doc_id, kind, video_id, title, description, transcript, insights)
+                VALUES (:doc_id, :kind, :video_id, :title, :description, :transcript, :insights)
+                ON CONFLICT(doc_id) DO UPDATE SET
+                    title = COALESCE(excluded.title, documents.title),
+                    description = COALESCE(excluded.description, documents.description),
+                    transcript = COALESCE(excluded.transcript, documents.transcript),
+                    insights = COALESCE(excluded.insights, documents.insights)
+                WHERE COALESCE(excluded.title, documents.title) IS NOT documents.title
+                   OR COALESCE(excluded.description, documents.description) IS NOT documents.description
+                   OR COALESCE(excluded.transcript, documents.transcript) IS NOT documents.transcript
+                   OR COALESCE(excluded.insights, documents.insights) IS NOT documents.insights
+            """, rows)
+            changed = max(cursor.rowcount, 0)
+            cursor = self.conn.executemany(
+                "INSERT OR IGNORE INTO document_industries (doc_id, industry) VALUES (:doc_id, :industry)",
+                [row for row in rows if row['industry']]
+            )
+            return changed + max(cursor.rowcount, 0)
+
+    def index_videos(self, videos):
+        """Index video records (title, description and, if present, transcript and industry)
+
+        Args:
+            videos (iterable): Video dictionaries as produced by steps 1/2 or add_transcripts_to_videos
+                (may be a generator, e.g. TranscriptCorpus.with_transcripts)
+
+        Returns:
+            int: Number of documents inserted or changed
+        """
+        rows = []
+        changed = 0
+        total = 0
+        for video in videos:
+            video_id = self._text(video.get('video_id'))
+            if not video_id:
+                continue
+            rows.append({
+                'doc_id': f"video:{video_id}",
+                'kind': 'video',
+                'video_id': video_id,
+                'industry': self._text(video.get('industry')),
+                'title': self._text(video.get('title')),
+                'description': self._text(video.get('description')),
+                'transcript': self._text(video.get('transcript')),
+                'insights': None
+            })
+            if len(rows) >= INDEX_BATCH_ROWS:
+                changed += self._upsert(rows)
+                total += len(rows)
+                rows = []
+
+        changed += self._upsert(rows)
+        total += len(rows)
+        logger.info(f"Search index: {changed} of {total} video documents added or updated")
+        return changed
+
+    def index_insights(self, industry_insights):
+        """Index step 3 industry insight records
+
+        Args:
+            industry_insights (list): Dictionaries with 'industry' and 'insights' keys
+
+        Returns:
+            int: Number of documents inserted or changed
+        """
+        rows = []
+        for insight in industry_insights:
+            industry = self._text(insight.get('industry'))
+            if not industry:
+                continue
+            rows.append({
+                'doc_id': f"insight:{industry}",
+                'kind': 'insight',
+                'video_id': None,
+                'industry': industry,
+                'title': f"{industry} industry insights",
+                'description': self._text(insight.get('video_titles')),
+                'transcript': None,
+                'insights': self._text(insight.get('insights'))
+            })
+
+        changed = self._upsert(rows)
+        logger.info(f"Search index: {changed} of {len(rows)} insight documents added or updated")
+        return changed
+
+    @staticmethod
+    def _quote_query(query):
+        """Turn free text into an FTS5 query of quoted terms (implicit AND)"""
+        terms = [term.replace('"', '""') for term in query.split()]
+        return ' '.join(f'"{term}"' for term in terms if term)
+
+    def search(self, query, limit=10, kind=None, industry=None):
+        """Run a ranked (BM25) full-text query
+
+        Args:
+            query (str): FTS5 query; plain text such as "SageMaker HyperPod" works as-is
+            limit (int): Maximum number of hits to return
+            kind (str): Optional filter, 'video' or 'insight'
+            industry (str): Optional industry code filter, e.g. 'FSI'
+
+        Returns:
+            list: Hit dictionaries with doc_id, kind, video_id, industry (comma-separated if several),
+                title, score and snippet
+        """
+        sql = """
+            SELECT d.doc_id, d.kind, d.video_id,
+                   (SELECT group_concat(industry, ',') FROM (
+                       SELECT industry FROM document_industries di WHERE di.doc_id = d.doc_id ORDER BY industry
+                   )) AS industry,
+                   d.title,
+                   bm25(documents_fts, 10.0, 2.0, 1.0, 1.0) AS score,
+                   snippet(documents_fts, -1, '[', ']', '...', 16) AS snippet
+            FROM documents_fts
+            JOIN documents d ON d.rowid = documents_fts.rowid
+            WHERE documents_fts MATCH ?
+        """
+        filters = []
+        if kind:
+            sql += " AND d.kind = ?"
+            filters.append(kind)
+        if industry:
+            sql += " AND EXISTS (SELECT 1 FROM document_industries di WHERE di.doc_id = d.doc_id AND di.industry = ?)"
+            filters.append(industry)
+        sql += " ORDER BY score LIMIT ?"
+
+        with self._lock:
+            try:
+                rows = self.conn.execute(sql, [query, *filters, limit]).fetchall()
+            except sqlite3.OperationalError:
+                # Punctuation such as '-' or ':' is FTS5 syntax; retry with every term quoted
+                rows = self.conn.execute(sql, [self._quote_query(query), *filters, limit]).fetchall()
+
+        return [dict(row) for row in rows]
+
+    def count(self):
+        """Return the number of indexed documents"""
+        with self._lock:
+            return self.conn.execute("SELECT COUNT(*) FROM documents").fetchone()[0]
+
+    def close(self):
+        with self._lock:
+            self.conn.close()
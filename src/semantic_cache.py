@@ -0,0 +1,180 @@
+import os
+import re
+import json
+import time
+import zlib
+import sqlite3
+import logging
+import threading
+import numpy as np
+from config.config import CACHE_DB_PATH, SEMANTIC_CACHE_CONFIG
+from src.text_utils import content_hash
+
+logger = logging.getLogger(__name__)
+
+# <video 3>title: ...</video 3> blocks of the step 3 prompt (see main.build_industry_prompt)
+_VIDEO_BLOCK = re.compile(r'<video (\d+)>(.*?)</video \1>', re.DOTALL)
+_TOKEN = re.compile(r'\w+')
+
+def _normalize(text):
+    return ' '.join((text or '').split())
+
+def canonical_prompt(prompt):
+    """
+    Order- and whitespace-insensitive form of a prompt
+    Args:
+        prompt (str): Prompt text, optionally containing numbered <video N> blocks
+    Returns:
+        tuple: (frame, blocks) - the normalized text outside the video blocks (with one
+            placeholder per block) and the normalized block contents, sorted
+    """
+    blocks = sorted(_normalize(match.group(2)) for match in _VIDEO_BLOCK.finditer(prompt))
+    frame = _normalize(_VIDEO_BLOCK.sub('<video>', prompt))
+    return frame, blocks
+
+def hashing_vector(text, dimensions, ngram=2):
+    """
+    Unit-length signed feature-hashing vector of a text's word n-grams (1..ngram)
+    Args:
+        text (str): Normalized text
+        dimensions (int): Vector size
+        ngram (int): Longest word n-gram hashed
+    Returns:
+        numpy.ndarray: float32 vector; cosine similarity is a dot product
+    """
+    words = _TOKEN.findall(text.lower())
+    vector = np.zeros(dimensions, dtype=np.float32)
+    for n in range(1, ngram + 1):
+        for i in range(len(words) - n + 1):
+            digest = zlib.crc32(' '.join(words[i:i + n]).encode('utf-8'))
+            vector[digest % dimensions] += 1.0 if digest & 0x80000000 else -1.0
+    norm = np.linalg.norm(vector)
+    if norm > 0:
+        vector /= norm
+    return vector
+
+class SemanticCache:
+    """Reuses model responses for prompts that are near-identical to an earlier one
+
+    Prompts are compared in canonical form (video blocks sorted, whitespace
+    normalized). Entries are scoped by model, instructions prefix and the text
+    around the video blocks, which must match exactly; within a scope the video
+    content is compared by cosine similarity of hashing vectors, and the best
+    entry at or above the threshold is reused. Entries live in the result cache
+    database; each scope's vectors are loaded into memory on first use.
+    """
+
+    def __init__(self, db_path=CACHE_DB_PATH, semantic_config=None):
+        """
+        Args:
+            db_path (str): Path to the SQLite database file
+            semantic_config (dict): Overrides for SEMANTIC_CACHE_CONFIG
+        """
+        directory = os.path.dirname(db_path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+        self.config = {**SEMANTIC_CACHE_CONFIG, **(semantic_config or {})}
+        self._lock = threading.Lock()
+        self._scopes = {}  # scope -> (keys, vector matrix)
+        self.stats = {'hits': 0, 'exact_hits': 0, 'misses': 0, 'stores': 0}
+        self.conn = sqlite3.connect(db_path, check_same_thread=False, timeout=30)
+        with self._lock, self.conn:
+            self.conn.execute("PRAGMA journal_mode=WAL")
+            self.conn.execute("""
+                CREATE TABLE IF NOT EXISTS semantic_cache (
+                    scope TEXT NOT NULL,
+                    key TEXT NOT NULL,
+                    vector BLOB NOT NULL,
+                    response TEXT NOT NULL,
+                    updated_at REAL NOT NULL,
+                    PRIMARY KEY (scope, key)
+                )
+            """)
+
+    def _entry(self, model_name, prompt, prefix):
+        """(scope, key, vector) of a request"""
+        frame, blocks = canonical_prompt(prompt)
+        if not blocks:
+            # Without video blocks the whole prompt is compared
+            frame, blocks = None, [frame]
+        scope = content_hash(model_name, _normalize(prefix), frame,
+                             self.config['dimensions'], self.config['ngram'])
+        key = content_hash(*blocks)
+        vector = hashing_vector('\n'.join(blocks), self.config['dimensions'], self.config['ngram'])
+        return scope, key, vector
+
+    def _load_scope(self, scope):
+        """Keys and vector matrix of a scope (caller holds the lock)"""
+        if scope not in self._scopes:
+            rows = self.conn.execute(
+                "SELECT key, vector FROM semantic_cache WHERE scope = ? ORDER BY updated_at DESC LIMIT ?",
+                (scope, self.config['max_entries_per_scope'])
+            ).fetchall()
+            keys = [row[0] for row in rows]
+            matrix = (np.vstack([np.frombuffer(row[1], dtype=np.float32) for row in rows]) if rows
+                      else np.zeros((0, self.config['dimensions']), dtype=np.float32))
+            self._scopes[scope] = (keys, matrix)
+        return self._scopes[scope]
+
+    def lookup(self, model_name, prompt, prefix=None):
+        """
+        Find a stored response for this or a near-identical request
+        Args:
+            model_name (str): Model the request is for
+            prompt (str): Prompt text
+            prefix (str): Static instructions sent before the prompt
+        Returns:
+            tuple: (response dict, similarity), or (None, best similarity seen) on a miss
+        """
+        scope, key, vector = self._entry(model_name, prompt, prefix)
+        with self._lock:
+            keys, matrix = self._load_scope(scope)
+            if key in keys:
+                match, similarity = key, 1.0
+            elif keys:
+                scores = matrix @ vector
+                best = int(np.argmax(scores))
+                match, similarity = keys[best], float(scores[best])
+            else:
+                match, similarity = None, 0.0
+
+            if match is None or similarity < self.config['threshold']:
+                self.stats['misses'] += 1
+                logger.debug(f"Semantic cache miss for {model_name} (best similarity {similarity:.4f})")
+                return None, similarity
+            row = self.conn.execute(
+                "SELECT response FROM semantic_cache WHERE scope = ? AND key = ?", (scope, match)
+            ).fetchone()
+            self.stats['hits'] += 1
+            self.stats['exact_hits'] += match == key
+        logger.info(f"Semantic cache hit for {model_name}: similarity {similarity:.4f} "
+                    f"(threshold {self.config['threshold']}), request {key} reuses {match}")
+        return json.loads(row[0]), similarity
+
+    def store(self, model_name, prompt, prefix, response):
+        """
+        Remember a response for later near-identical requests
+        Args:
+            model_name (str): Model that produced the response
+            prompt (str): Prompt text
+            prefix (str): Static instructions sent before the prompt
+            response (dict): JSON-serializable response (e.g. asdict(ModelResponse))
+        """
+        scope, key, vector = self._entry(model_name, prompt, prefix)
+        with self._lock:
+            with self.conn:
+                self.conn.execute(
+                    "INSERT OR REPLACE INTO semantic_cache (scope, key, vector, response, updated_at) "
+                    "VALUES (?, ?, ?, ?, ?)",
+                    (scope, key, vector.tobytes(), json.dumps(response), time.time())
+                )
+            if scope in self._scopes:
+                keys, matrix = self._scopes[scope]
+                if key not in keys:
+                    self._scopes[scope] = (keys + [key], np.vstack([matrix, vector]))
+            self.stats['stores'] += 1
+
+    def close(self):
+        with self._lock:
+            self.conn.close()
@@ -0,0 +1,156 @@
+import json
+import math
+import time
+import logging
+import threading
+from datetime import datetime, timezone
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import unquote, urlsplit
+from config.config import SERVE_CONFIG
+from src.resilience import RETRY_BUDGET, log_resilience_stats
+from src.text_utils import content_hash
+
+logger = logging.getLogger(__name__)
+
+def _jsonable(value):
+    """NaN cells (pandas) become null so responses are valid JSON"""
+    if isinstance(value, float) and math.isnan(value):
+        return None
+    if isinstance(value, dict):
+        return {k: _jsonable(v) for k, v in value.items()}
+    if isinstance(value, (list, tuple)):
+        return [_jsonable(v) for v in value]
+    return value
+
+class ResponseCache:
+    """Pre-rendered JSON responses with ETags, replaced as a whole on every publish
+
+    Readers do a single dict lookup on an immutable snapshot, so requests never
+    wait for a refresh and never see a half-updated set of resources.
+    """
+
+    def __init__(self):
+        self._responses = {}
+
+    def publish(self, resources):
+        """
+        Render and swap in a new snapshot
+        Args:
+            resources: Dict of path -> JSON-serializable object
+        Returns:
+            int: Number of resources whose body changed
+        """
+        responses = {}
+        changed = 0
+        for path, obj in resources.items():
+            body = json.dumps(_jsonable(obj), ensure_ascii=False).encode('utf-8')
+            etag = f'"{content_hash(body.decode("utf-8"))}"'
+            previous = self._responses.get(path)
+            changed += previous is None or previous[1] != etag
+            responses[path] = (body, etag)
+        self._responses = responses
+        return changed
+
+    def get(self, path):
+        """(body, etag) for a path, or None"""
+        return self._responses.get(path)
+
+    def paths(self):
+        return sorted(self._responses)
+
+def _handler(cache):
+    class ApiHandler(BaseHTTPRequestHandler):
+        server_version = 'reinvent-insights'
+
+        def do_GET(self):
+            path = unquote(urlsplit(self.path).path).rstrip('/') or '/'
+            if path == '/':
+                path = '/index'
+            cached = cache.get(path)
+            if cached is None:
+                self._send(404, json.dumps({'error': f"Not found: {path}", 'paths': cache.paths()}).encode('utf-8'))
+                return
+            body, etag = cached
+            if etag in (tag.strip() for tag in self.headers.get('If-None-Match', '').split(',')):
+                self._send(304, b'', etag)
+                return
+            self._send(200, body, etag)
+
+        def _send(self, status, body, etag=None):
+            self.send_response(status)
+            if etag:
+                self.send_header('ETag', etag)
+                self.send_header('Cache-Control', 'no-cache')  # revalidate with If-None-Match
+            if status != 304:
+                self.send_header('Content-Type', 'application/json; charset=utf-8')
+                self.send_header('Content-Length', str(len(body)))
+            self.end_headers()
+            if status != 304:
+                self.wfile.write(body)
+
+        def log_message(self, format, *args):
+            logger.debug(f"{self.address_string()} {format % args}")
+
+    return ApiHandler
+
+class PipelineServer:
+    """Keeps the pipeline resident: refreshes it periodically and serves its results over HTTP"""
+
+    def __init__(self, refresh, serve_config=None):
+        """
+        Args:
+            refresh: Callable running one incremental refresh; returns a dict of path -> resource
+            serve_config: Overrides for SERVE_CONFIG (host, port, refresh_seconds)
+        """
+        self.config = {**SERVE_CONFIG, **(serve_config or {})}
+        self.refresh = refresh
+        self.cache = ResponseCache()
+        self.status = {'refreshes': 0, 'last_refresh': None, 'last_refresh_seconds': None, 'last_error': None}
+        self._resources = {}
+        self._stop = threading.Event()
+        self.httpd = ThreadingHTTPServer((self.config['host'], self.config['port']), _handler(self.cache))
+
+    def run_refresh(self):
+        """One refresh; on failure the previous snapshot keeps being served"""
+        start = time.perf_counter()
+        # Each refresh is a run of its own: a long-lived server must not use up the retry budget for good
+        RETRY_BUDGET.reset()
+        try:
+            self._resources = self.refresh()
+            self.status.update(last_error=None)
+        except (Exception, SystemExit) as e:
+            # SystemExit too: a pipeline helper exiting must not end the refresh thread
+            logger.error(f"Refresh failed, still serving the previous results: {e!r}", exc_info=True)
+            self.status['last_error'] = repr(e)
+        log_resilience_stats()
+        self.status.update(
+            refreshes=self.status['refreshes'] + 1,
+            last_refresh=datetime.now(timezone.utc).isoformat(timespec='seconds'),
+            last_refresh_seconds=round(time.perf_counter() - start, 2)
+        )
+        resources = {**self._resources, '/status': dict(self.status)}
+        resources['/index'] = {'paths': sorted(set(resources) | {'/index'})}
+        changed = self.cache.publish(resources)
+        logger.info(f"Published {len(resources)} resources ({changed} changed) "
+                    f"after a {self.status['last_refresh_seconds']}s refresh")
+
+    def _refresh_loop(self):
+        while not self._stop.wait(self.config['refresh_seconds']):
+            self.run_refresh()
+
+    def serve_forever(self):
+        """Refresh once, then serve until interrupted, refreshing every refresh_seconds"""
+        self.run_refresh()
+        threading.Thread(target=self._refresh_loop, daemon=True, name='refresh').start()
+        logger.info(f"Serving on http://{self.config['host']}:{self.httpd.server_address[1]} "
+                    f"(refresh every {self.config['refresh_seconds']}s)")
+        try:
+            self.httpd.serve_forever()
+        except KeyboardInterrupt:
+            logger.info("Stopping server")
+        finally:
+            self.shutdown()
+
+    def shutdown(self):
+        self._stop.set()
+        self.httpd.server_close()
@@ -0,0 +1,67 @@
+import asyncio
+import logging
+import threading
+from concurrent.futures import Future
+
+logger = logging.getLogger(__name__)
+
+class SingleFlight:
+    """Coalesce concurrent identical calls so only one of them does the work
+
+    The first caller for a key runs the function; callers arriving while it is
+    in flight wait for and share its result or exception. Nothing is cached:
+    once the call completes, the next caller for the key runs it again.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._calls = {}
+        self._tasks = {}
+        self.leaders = 0
+        self.followers = 0
+
+    def do(self, key, fn, *args, **kwargs):
+        """Run fn(*args, **kwargs) once per key among concurrent threads"""
+        with self._lock:
+            future = self._calls.get(key)
+            leader = future is None
+            if leader:
+                future = Future()
+                self._calls[key] = future
+                self.leaders += 1
+            else:
+                self.followers += 1
+
+        if not leader:
+            logger.info(f"Joining in-flight request {key[:12]}")
+            return future.result()
+
+        try:
+            result = fn(*args, **kwargs)
+            future.set_result(result)
+            return result
+        except BaseException as e:
+            future.set_exception(e)
+            raise
+        finally:
+            with self._lock:
+                del self._calls[key]
+
+    async def ado(self, key, coro_fn, *args, **kwargs):
+        """Await coro_fn(*args, **kwargs) once per key among concurrent tasks on this event loop"""
+        loop_key = (id(asyncio.get_running_loop()), key)
+        task = self._tasks.get(loop_key)
+        if task is None:
+            task = asyncio.ensure_future(coro_fn(*args, **kwargs))
+            self._tasks[loop_key] = task
+            task.add_done_callback(lambda _: self._tasks.pop(loop_key, None))
+            self.leaders += 1
+        else:
+            logger.info(f"Joining in-flight request {key[:12]}")
+            self.followers += 1
+        # shield: one caller being cancelled must not cancel the shared call
+        return await asyncio.shield(task)
+
+    def stats(self):
+        """Calls actually made vs. calls answered by joining an in-flight request"""
+        return {'leaders': self.leaders, 'followers': self.followers}
@@ -1,92 +1,174 @@
-import boto3
-import json
+import asyncio
 import logging
-from config.config import AWS_ACCESS_KEY_ID, AWS_SECRET_ACCESS_KEY, AWS_REGION
+from config.config import MODEL_CONFIGS, SUMMARY_CONFIG
+from src.model_manager import ModelManager
+from src.result_cache import ResultCache
+from src.text_utils import content_hash, estimate_tokens, split_into_chunks
 
 logger = logging.getLogger(__name__)
 
+# Bump when the prompts below change so cached summaries are not reused
+PROMPT_VERSION = 'v1'
+
 class VideoSummarizer:
-    def __init__(self, model_type="nova"):
-        logger.info(f"Initializing VideoSummarizer with model type: {model_type}")
-        self.bedrock_runtime = boto3.client(
-            service_name='bedrock-runtime',
-            aws_access_key_id=AWS_ACCESS_KEY_ID,
-            aws_secret_access_key=AWS_SECRET_ACCESS_KEY,
-            region_name=AWS_REGION
-        )
-        
-        self.model_type = model_type
-        # Simplified model configurations
-        self.MODEL_CONFIGS = {
-            "nova": "amazon.nova-lite-v1:0",
-            "claude": "anthropic.claude-3-5-haiku-20241022-v1:0"
+    def __init__(self, model_name=None, model_manager=None, cache=None, summary_config=None, corpus=None):
+        """Batch summarizer turning transcripts (or descriptions) into compact per-video summaries
+
+        Args:
+            model_name (str): MODEL_CONFIGS entry to summarize with, defaults to SUMMARY_CONFIG['model']
+            model_manager (ModelManager): Optional shared manager; one is created otherwise
+            cache (ResultCache): Optional cache; defaults to the 'video_summary' namespace
+            summary_config (dict): Overrides for SUMMARY_CONFIG
+            corpus (TranscriptCorpus): Optional corpus transcripts are read from when a video has none
+        """
+        self.config = {**SUMMARY_CONFIG, **(summary_config or {})}
+        self.model_name = model_name or self.config['model']
+        if self.model_name not in MODEL_CONFIGS:
+            raise ValueError(f"Unsupported model type: {self.model_name}")
+
+        logger.info(f"Initializing VideoSummarizer with model: {self.model_name}")
+        self.model_manager = model_manager or ModelManager(MODEL_CONFIGS[self.model_name])
+        self.cache = cache or ResultCache('video_summary')
+        self.corpus = corpus
+
+    def _source_text(self, video):
+        """Pick the richest available text for a video: transcript, else description"""
+        transcript = video.get('transcript')
+        if transcript is None and self.corpus is not None:
+            transcript = self.corpus.get(video.get('video_id'))
+        if isinstance(transcript, str) and transcript.strip():
+            return 'transcript', transcript
+        description = video.get('description')
+        return 'description', description if isinstance(description, str) else ''
+
+    def _cache_key(self, video_id, kind, text):
+        return f"{video_id}:{content_hash(self.model_name, PROMPT_VERSION, self.config['summary_words'], kind, text)}"
+
+    def _chunk_prompt(self, video, text, index, total):
+        part = f" (part {index} of {total})" if total > 1 else ""
+        return f"""
+            Summarize this excerpt{part} of an AWS re:Invent session.
+            Title: {video.get('title', '')}
+
+            {text}
+
+            Focus on the industry use case, the AWS services used, the customer named and any announcements.
+            Answer with dense bullet points only.
+            """
+
+    def _combine_prompt(self, video, partial_summaries):
+        parts = '\n\n'.join(partial_summaries)
+        return f"""
+            These are summaries of consecutive parts of one AWS re:Invent session.
+            Title: {video.get('title', '')}
+
+            {parts}
+
+            Merge them into a single summary of at most {self.config['summary_words']} words covering:
+            the use case, the AWS services used, the customer story and any announcements.
+            """
+
+    async def _summarize_video(self, video, semaphore):
+        """Summarize one video: map over chunks concurrently, then merge if there were several"""
+        video_id = video.get('video_id', '')
+        kind, text = self._source_text(video)
+        if kind == 'description':
+            # Already short; summarizing it would only cost a call (chunks 0: no model was called)
+            return {'summary': text.strip(), 'source': kind, 'source_tokens': estimate_tokens(text),
+                    'summary_tokens': estimate_tokens(text), 'chunks': 0,
+                    'content_hash': content_hash(text), 'cached': False}
+        key = self._cache_key(video_id, kind, text)
+
+        cached = self.cache.get(key)
+        if cached is not None:
+            return {**cached, 'cached': True}
+
+        chunks = split_into_chunks(text, self.config['chunk_tokens']) or ['']
+
+        async def summarize(prompt):
+            async with semaphore:
+                return await self.model_manager.agenerate_response(self.model_name, prompt)
+
+        partial_summaries = await asyncio.gather(*(
+            summarize(self._chunk_prompt(video, chunk, i, len(chunks)))
+            for i, chunk in enumerate(chunks, 1)
+        ))
+        if len(partial_summaries) > 1:
+            summary = await summarize(self._combine_prompt(video, partial_summaries))
+        else:
+            summary = partial_summaries[0]
+
+        result = {
+            'summary': summary.strip(),
+            'source': kind,
+            'source_tokens': estimate_tokens(text),
+            'summary_tokens': estimate_tokens(summary),
+            'chunks': len(chunks),
+            'content_hash': key.split(':', 1)[1]
         }
+        self.cache.set(key, result)
+        return {**result, 'cached': False}
 
-    def _format_request_body(self, prompt):
-        logger.debug(f"Formatting request body for model type: {self.model_type}")
-        try:
-            if self.model_type == "nova":
-                return json.dumps({
-                    "inputText": prompt,
-                    "textGenerationConfig": {
-                        "temperature": 0.7,
-                        "topP": 1,
-                        "maxTokenCount": 1000,
-                        "stopSequences": []
-                    }
-                })
-            else:  # claude
-                return json.dumps({
-                    "anthropic_version": "bedrock-2023-05-31",
-                    "messages": [
-                        {
-                            "role": "system",
-                            "content": "You are an AI assistant that summarizes AWS re:Invent videos."
-                        },
-                        {
-                            "role": "user",
-                            "content": prompt
-                        }
-                    ],
-                    "temperature": 0.7
-                })
-        except Exception as e:
-            logger.error(f"Error in _format_request_body: {str(e)}")
-            raise
+    async def asummarize_videos(self, videos):
+        """Coroutine form of summarize_videos"""
+        semaphore = asyncio.Semaphore(self.config['max_concurrency'])
+        # Bounds how many source texts are loaded (e.g. from the transcript corpus) at once
+        video_slots = asyncio.Semaphore(self.config['max_videos_in_flight'])
+
+        async def summarize_video(video):
+            async with video_slots:
+                return await self._summarize_video(video, semaphore)
+
+        results = await asyncio.gather(
+            *(summarize_video(video) for video in videos),
+            return_exceptions=True
+        )
+        await self.model_manager.aclose()
+        return results
+
+    def summarize_videos(self, videos):
+        """
+        Summarize a batch of videos concurrently, reusing cached summaries
+        Args:
+            videos: List of video dictionaries (with optional 'transcript')
+        Returns:
+            list: Compact per-video records (industry, video_id, title, summary, source, ...)
+        """
+        results = asyncio.run(self.asummarize_videos(videos))
+
+        summaries = []
+        failed = 0
+        for video, result in zip(videos, results):
+            record = {
+                'industry': video.get('industry'),
+                'video_id': video.get('video_id'),
+                'title': video.get('title'),
+            }
+            if isinstance(result, Exception):
+                # Keep the batch going; step 3 falls back to the description for this video
+                logger.error(f"Error generating summary for {video.get('title', '')}: {str(result)}")
+                failed += 1
+                continue
+            record.update({k: v for k, v in result.items() if k != 'cached'})
+            summaries.append(record)
+
+        cached = sum(1 for r in results if isinstance(r, dict) and r['cached'])
+        source_tokens = sum(s['source_tokens'] for s in summaries)
+        summary_tokens = sum(s['summary_tokens'] for s in summaries)
+        logger.info(f"Summarized {len(summaries)}/{len(videos)} videos "
+                    f"({cached} from cache, {failed} failed); "
+                    f"~{source_tokens} source tokens reduced to ~{summary_tokens}")
+        return summaries
 
     def generate_summary(self, video):
+        """Summarize a single video (cached like the batch API)"""
         try:
             logger.info(f"Generating summary for video: {video.get('title', '')}")
-            
-            if self.model_type not in self.MODEL_CONFIGS:
-                raise ValueError(f"Unsupported model type: {self.model_type}")
-            
-            # Build prompt text
-            prompt = f"""
-            Please summarize the key points from this AWS re:Invent video:
-            Title: {video.get('title', '')}
-            Description: {video.get('description', '')}
-            Focus on industry-related insights and announcements.
-            """
-            
-            # Prepare request body
-            body = self._format_request_body(prompt)
-            logger.debug(f"Request body prepared: {body[:100]}...")
-            
-            # Call model
-            response = self.bedrock_runtime.invoke_model(
-                modelId=self.MODEL_CONFIGS[self.model_type],
-                body=body
-            )
-            
-            # Parse response
-            response_body = json.loads(response['body'].read())
-            
-            if self.model_type == "nova":
-                return response_body['results'][0]['outputText']
-            else:  # claude
-                return response_body['content'][0]['text']
-            
+            result = self.summarize_videos([video])
+            if not result:
+                raise RuntimeError(f"Summary failed for video {video.get('video_id', '')}")
+            return result[0]['summary']
+
         except Exception as e:
             logger.error(f"Error generating summary: {str(e)}")
-            raise
\ No newline at end of file
+            raise
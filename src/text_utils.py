@@ -0,0 +1,85 @@
+import re
+import hashlib
+
+# Rough English average for BPE tokenizers (Claude, Nova, GPT); good enough for budgeting
+CHARS_PER_TOKEN = 4
+
+_SENTENCE_BOUNDARY = re.compile(r'(?<=[.!?])\s+|\n+')
+
+def estimate_tokens(text):
+    """Estimate the token count of a text without calling a tokenizer
+
+    Args:
+        text (str): Input text
+
+    Returns:
+        int: Estimated number of tokens
+    """
+    if not text:
+        return 0
+    return max(1, len(text) // CHARS_PER_TOKEN)
+
+def content_hash(*parts):
+    """Stable short hash of one or more text parts, used as a cache key component"""
+    digest = hashlib.sha256()
+    for part in parts:
+        digest.update(str(part if part is not None else '').encode('utf-8'))
+        digest.update(b'\x1f')
+    return digest.hexdigest()[:16]
+
+def split_into_chunks(text, max_tokens):
+    """Split text into chunks of at most max_tokens, breaking on sentence or line boundaries
+
+    A single sentence longer than the budget is hard-split on whitespace.
+
+    Args:
+        text (str): Input text
+        max_tokens (int): Token budget per chunk
+
+    Returns:
+        list: Text chunks in original order
+    """
+    if not text:
+        return []
+    if estimate_tokens(text) <= max_tokens:
+        return [text]
+
+    max_chars = max_tokens * CHARS_PER_TOKEN
+    pieces = []
+    for sentence in _SENTENCE_BOUNDARY.split(text):
+        sentence = sentence.strip()
+        while len(sentence) > max_chars:
+            cut = sentence.rfind(' ', 0, max_chars)
+            cut = cut if cut > 0 else max_chars
+            pieces.append(sentence[:cut])
+            sentence = sentence[cut:].strip()
+        if sentence:
+            pieces.append(sentence)
+
+    chunks = []
+    current = []
+    current_len = 0
+    for piece in pieces:
+        if current and current_len + len(piece) + 1 > max_chars:
+            chunks.append(' '.join(current))
+            current = []
+            current_len = 0
+        current.append(piece)
+        current_len += len(piece) + 1
+    if current:
+        chunks.append(' '.join(current))
+
+    return chunks
+
+def missing_sections(text, headings):
+    """Return the headings (e.g. '### Conclusion') that do not start a line of text, in order
+
+    Args:
+        text (str): Model output
+        headings (iterable): Required section headings
+
+    Returns:
+        list: Headings not found
+    """
+    lines = {line.strip() for line in (text or '').splitlines()}
+    return [heading for heading in headings if heading not in lines]
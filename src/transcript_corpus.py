@@ -0,0 +1,200 @@
+import os
+import json
+import mmap
+import zlib
+import logging
+import threading
+from config.config import TRANSCRIPT_CORPUS_CONFIG
+from src.text_utils import content_hash
+
+logger = logging.getLogger(__name__)
+
+CODECS = (None, 'zlib')
+
+class TranscriptCorpus:
+    """Append-only transcript store: one packed data file plus a video_id -> offset index
+
+    '<path>.data' holds the UTF-8 (optionally zlib-compressed) transcripts back
+    to back; '<path>.index' is a JSON lines file with one entry per append
+    (video_id, offset, length, codec, content hash), the last entry for a video
+    winning. Readers memory-map the data file and slice single transcripts on
+    demand, so neither loading nor iterating the corpus holds it all in memory.
+    Videos without a transcript are indexed too, so they are not fetched again.
+    """
+
+    def __init__(self, path=None, corpus_config=None, read_only=False):
+        """
+        Args:
+            path (str): Path prefix of the .data and .index files; defaults to TRANSCRIPT_CORPUS_CONFIG['path']
+            corpus_config (dict): Overrides for TRANSCRIPT_CORPUS_CONFIG
+            read_only (bool): Open without append handles (e.g. in pool processes); append() then raises
+        """
+        self.config = {**TRANSCRIPT_CORPUS_CONFIG, **(corpus_config or {})}
+        if self.config['compression'] not in CODECS:
+            raise ValueError(f"Unsupported transcript compression: {self.config['compression']}")
+        path = path or self.config['path']
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+        self.path = path
+        self.data_path = path + '.data'
+        self.index_path = path + '.index'
+        self.read_only = read_only
+        self._lock = threading.Lock()
+        self._index = {}
+        self._map = None
+        self._mapped_size = 0
+        self._load_index()
+        self._data = None if read_only else open(self.data_path, 'ab')
+        self._index_file = None if read_only else open(self.index_path, 'a', encoding='utf-8')
+
+    def _load_index(self):
+        """Read the index, dropping entries that point past the end of the data file (interrupted append)"""
+        data_size = os.path.getsize(self.data_path) if os.path.exists(self.data_path) else 0
+        if not os.path.exists(self.index_path):
+            return
+        skipped = 0
+        with open(self.index_path, encoding='utf-8') as f:
+            for line in f:
+                try:
+                    entry = json.loads(line)
+                except json.JSONDecodeError:
+                    skipped += 1
+                    continue
+                if entry['offset'] is not None and entry['offset'] + entry['length'] > data_size:
+                    skipped += 1
+                    continue
+                self._index[entry['video_id']] = entry
+        if skipped:
+            logger.warning(f"Ignored {skipped} incomplete entries in {self.index_path}")
+        logger.info(f"Opened transcript corpus {self.data_path}: {len(self._index)} videos, {data_size:,} bytes")
+
+    # -- writing ----------------------------------------------------------------------------
+
+    def append(self, video_id, transcript):
+        """
+        Store a video's transcript (None records that it has none)
+        Args:
+            video_id: YouTube video ID
+            transcript: Transcript text, or None
+        Returns:
+            bool: False if the corpus already held exactly this transcript
+        """
+        if self.read_only:
+            raise ValueError(f"Transcript corpus {self.path} was opened read-only")
+        digest = content_hash(transcript) if transcript is not None else None
+        with self._lock:
+            existing = self._index.get(video_id)
+            if existing is not None and existing['hash'] == digest:
+                return False
+
+            entry = {'video_id': video_id, 'offset': None, 'length': 0, 'codec': None, 'hash': digest}
+            if transcript is not None:
+                payload = transcript.encode('utf-8')
+                codec = self.config['compression']
+                if codec == 'zlib':
+                    payload = zlib.compress(payload, self.config['compresslevel'])
+                entry.update(offset=self._data.tell(), length=len(payload), codec=codec)
+                self._data.write(payload)
+                # Data reaches the file before the index entry that points to it
+                self._data.flush()
+            self._index_file.write(json.dumps(entry) + '\n')
+            self._index_file.flush()
+            self._index[video_id] = entry
+            return True
+
+    def flush(self):
+        """fsync both files, e.g. before handing the corpus to another process"""
+        if self.read_only:
+            return
+        with self._lock:
+            for f in (self._data, self._index_file):
+                f.flush()
+                os.fsync(f.fileno())
+
+    # -- reading ----------------------------------------------------------------------------
+
+    def _mapping(self, end):
+        """Read-only mmap of the data file covering at least `end` bytes, remapped after appends"""
+        if self._map is None or end > self._mapped_size:
+            # Views handed out by get_view keep an old mapping alive until they are released
+            with open(self.data_path, 'rb') as f:
+                size = os.fstat(f.fileno()).st_size
+                self._map = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) if size else None
+            self._mapped_size = size
+        return self._map
+
+    def __contains__(self, video_id):
+        return video_id in self._index
+
+    def __len__(self):
+        return len(self._index)
+
+    def video_ids(self):
+        """Indexed video IDs, including those recorded without a transcript"""
+        return list(self._index)
+
+    def has_transcript(self, video_id):
+        entry = self._index.get(video_id)
+        return entry is not None and entry['offset'] is not None
+
+    def get_view(self, video_id):
+        """
+        Zero-copy view of a transcript's stored bytes (compressed if the corpus compresses)
+        Args:
+            video_id: YouTube video ID
+        Returns:
+            tuple: (memoryview into the mapped data file, codec), or (None, None) without a transcript
+        """
+        with self._lock:
+            entry = self._index.get(video_id)
+            if entry is None or entry['offset'] is None:
+                return None, None
+            start, end = entry['offset'], entry['offset'] + entry['length']
+            mapping = self._mapping(end)
+        return memoryview(mapping)[start:end], entry['codec']
+
+    def get(self, video_id, default=None):
+        """Decoded transcript text, or default if the video has none"""
+        view, codec = self.get_view(video_id)
+        if view is None:
+            return default
+        with view:
+            data = zlib.decompress(view) if codec == 'zlib' else view
+            return str(data, 'utf-8')
+
+    def items(self, video_ids=None):
+        """
+        Yield (video_id, transcript) one at a time, in file order for sequential reads
+        Args:
+            video_ids: Only these videos (default: every video with a transcript)
+        """
+        with self._lock:
+            entries = [entry for entry in self._index.values() if entry['offset'] is not None]
+        if video_ids is not None:
+            wanted = set(video_ids)
+            entries = [entry for entry in entries if entry['video_id'] in wanted]
+        for entry in sorted(entries, key=lambda e: e['offset']):
+            yield entry['video_id'], self.get(entry['video_id'])
+
+    def with_transcripts(self, videos):
+        """Yield each video as a dict with its 'transcript' from the corpus, loading one at a time"""
+        for video in videos:
+            yield {**video, 'transcript': self.get(video.get('video_id'))}
+
+    def stats(self):
+        """Video counts and stored bytes"""
+        with self._lock:
+            entries = list(self._index.values())
+        return {'videos': len(entries),
+                'with_transcript': sum(1 for e in entries if e['offset'] is not None),
+                'stored_bytes': sum(e['length'] for e in entries),
+                'file_bytes': os.path.getsize(self.data_path)}
+
+    def close(self):
+        with self._lock:
+            if not self.read_only:
+                self._data.close()
+                self._index_file.close()
+            self._map = None  # closed once no view refers to it
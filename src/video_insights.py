@@ -0,0 +1,213 @@
+import re
+import json
+import asyncio
+import logging
+from config.config import MODEL_CONFIGS, STRUCTURED_INSIGHTS_CONFIG
+from src.model_manager import ModelManager
+from src.model_tiering import choose_model
+from src.result_cache import ResultCache
+from src.text_utils import content_hash, estimate_tokens
+
+logger = logging.getLogger(__name__)
+
+# Bump when the prompts below change so cached records and rollups are not reused
+PROMPT_VERSION = 'v1'
+
+# Static prefixes (byte-identical across calls, so providers can cache them)
+EXTRACT_INSTRUCTIONS = """
+You extract structured facts from the description of one AWS re:Invent session.
+Respond with only a JSON object, no prose, with exactly these keys:
+- "use_case": one sentence describing the main industry use case
+- "aws_services": a list of the AWS services and technologies used, by their official names
+- "customer": the customer or partner whose story is told, or null if none is named
+"""
+
+ROLLUP_INSTRUCTIONS = """
+You will receive structured records (use case, AWS services, customer) extracted from AWS re:Invent videos of one industry.
+Write a comprehensive conclusion about how the industry is leveraging AWS services, mentioning key trends, solutions and customer examples.
+Answer with the conclusion paragraphs only, without a heading.
+"""
+
+_JSON_OBJECT = re.compile(r'\{.*\}', re.DOTALL)
+
+def parse_json_object(text):
+    """Parse the first JSON object in a model answer (tolerating code fences or stray prose)"""
+    match = _JSON_OBJECT.search(text or '')
+    if not match:
+        raise ValueError(f"No JSON object in response: {text[:100]!r}")
+    return json.loads(match.group(0))
+
+def render_industry_insight(records, conclusion):
+    """Render records and a rollup conclusion in the step 3 markdown layout"""
+    lines = ["### Detailed Analysis", ""]
+    for i, record in enumerate(records, 1):
+        lines += [
+            f"**Video {i}: {record['title']}**",
+            f"- **Use Case:** {record['use_case'] or 'Not stated'}",
+            f"- **Solution:** {record['aws_services'] or 'Not stated'}",
+            f"- **Customer Story:** {record['customer'] or 'No customer named'}",
+            ""
+        ]
+    lines += ["### Conclusion", "", conclusion.strip()]
+    return '\n'.join(lines)
+
+class VideoInsightExtractor:
+    def __init__(self, model_config, model_manager=None, cache=None, insight_config=None):
+        """Per-video structured insight records with cached, incremental industry rollups
+
+        Args:
+            model_config (dict): Configuration of the run's model; small calls use its tiering small_model
+            model_manager (ModelManager): Optional shared manager; one is created otherwise
+            cache (ResultCache): Optional cache; defaults to the 'video_insight' namespace
+            insight_config (dict): Overrides for STRUCTURED_INSIGHTS_CONFIG
+        """
+        self.model_config = model_config
+        self.config = {**STRUCTURED_INSIGHTS_CONFIG, **(insight_config or {})}
+        self.model_manager = model_manager or ModelManager(model_config)
+        self.cache = cache or ResultCache('video_insight')
+
+    def _model_for(self, video_count, input_tokens):
+        """Tiered model for a call, as long as this manager's client can serve it"""
+        model_name, _ = choose_model(self.model_config['name'], video_count, input_tokens)
+        if MODEL_CONFIGS[model_name]['type'] != self.model_config['type']:
+            return self.model_config['name']
+        return model_name
+
+    def _source_text(self, video):
+        """Summary when step 2b produced one, else the description"""
+        summary = video.get('summary')
+        if isinstance(summary, str) and summary.strip():
+            return 'summary', summary
+        description = video.get('description')
+        return 'description', description if isinstance(description, str) else ''
+
+    def _record_key(self, video):
+        kind, text = self._source_text(video)
+        return f"{video.get('video_id', '')}:{content_hash(PROMPT_VERSION, self.model_config['name'], kind, text)}"
+
+    async def _extract(self, video, semaphore, stats):
+        """Structured record for one video, cached by video_id and content hash"""
+        key = self._record_key(video)
+        cached = self.cache.get(key)
+        if cached is not None:
+            stats['cached'] += 1
+            return {**cached, 'key': key}
+
+        kind, text = self._source_text(video)
+        prompt = f"Title: {video.get('title', '')}\n\n{kind.capitalize()}: {text}"
+        model_name = self._model_for(1, estimate_tokens(EXTRACT_INSTRUCTIONS) + estimate_tokens(prompt))
+        async with semaphore:
+            response = await self.model_manager.agenerate_response(model_name, prompt, prefix=EXTRACT_INSTRUCTIONS)
+        data = parse_json_object(response)
+        services = data.get('aws_services') or []
+        if isinstance(services, str):
+            services = [services]
+        record = {
+            'use_case': data.get('use_case'),
+            'aws_services': '; '.join(str(service) for service in services),
+            'customer': data.get('customer')
+        }
+        self.cache.set(key, record)
+        stats['computed'] += 1
+        return {**record, 'key': key}
+
+    def _rollup_prompt(self, industry, records):
+        lines = [f"Industry: {industry}", ""]
+        for record in records:
+            lines.append(f"- {record['title']} | use case: {record['use_case']} | "
+                         f"services: {record['aws_services']} | customer: {record['customer'] or 'none'}")
+        return '\n'.join(lines)
+
+    async def _rollup(self, industry, records, semaphore, stats):
+        """Industry conclusion from its records; only recomputed when one of them changed"""
+        key = content_hash('rollup', PROMPT_VERSION, self.model_config['name'], industry,
+                           *(record['key'] for record in records))
+        cached = self.cache.get(key)
+        if cached is not None:
+            stats['cached'] += 1
+            return cached
+
+        prompt = self._rollup_prompt(industry, records)
+        model_name = self._model_for(len(records), estimate_tokens(ROLLUP_INSTRUCTIONS) + estimate_tokens(prompt))
+        async with semaphore:
+            conclusion = await self.model_manager.agenerate_response(model_name, prompt, prefix=ROLLUP_INSTRUCTIONS)
+        self.cache.set(key, conclusion)
+        stats['computed'] += 1
+        return conclusion
+
+    async def abuild(self, videos):
+        """Coroutine form of build"""
+        semaphore = asyncio.Semaphore(self.config['max_concurrency'])
+        videos = list(videos)
+        record_stats = {'cached': 0, 'computed': 0}
+        results = await asyncio.gather(
+            *(self._extract(video, semaphore, record_stats) for video in videos),
+            return_exceptions=True
+        )
+
+        records = []
+        failed = 0
+        for video, result in zip(videos, results):
+            if isinstance(result, Exception):
+                # Skipped in this run's rollup; not cached, so the next run retries it
+                logger.error(f"Error extracting insights for {video.get('title', '')}: {str(result)}")
+                failed += 1
+                continue
+            records.append({
+                'industry': video.get('industry'),
+                'video_id': video.get('video_id'),
+                'title': video.get('title'),
+                **result
+            })
+        logger.info(f"Per-video records: {record_stats['computed']} extracted, "
+                    f"{record_stats['cached']} reused from cache, {failed} failed")
+
+        by_industry = {}
+        for record in records:
+            by_industry.setdefault(record['industry'], []).append(record)
+        rollup_stats = {'cached': 0, 'computed': 0}
+        results = await asyncio.gather(
+            *(self._rollup(industry, industry_records, semaphore, rollup_stats)
+              for industry, industry_records in by_industry.items()),
+            return_exceptions=True
+        )
+
+        rollups = {}
+        for industry, result in zip(by_industry, results):
+            if isinstance(result, Exception):
+                # Left out of this run's step 3 and 4; the other rollups are already cached, and
+                # this one is retried on the next run
+                logger.error(f"Error rolling up insights for {industry}: {str(result)}")
+                continue
+            rollups[industry] = result
+        logger.info(f"Industry rollups: {rollup_stats['computed']} generated, {rollup_stats['cached']} reused, "
+                    f"{len(by_industry) - len(rollups)} failed")
+        await self.model_manager.aclose()
+        return records, rollups
+
+    def build(self, videos):
+        """
+        Extract per-video records and roll them up per industry
+        Args:
+            videos: Industry videos (VideoCollection or list of dicts with industry, video_id, title, description)
+        Returns:
+            tuple: (records list with use_case/aws_services/customer per video, {industry: conclusion});
+                industries whose rollup failed have records but no conclusion
+        """
+        try:
+            return asyncio.run(self.abuild(videos))
+        except Exception as e:
+            logger.error(f"Error building structured insights: {str(e)}")
+            raise
+
+    def generate_conclusion(self, prefix, prompt, required_sections=()):
+        """Cross-industry conclusion with the run's model, cached by prompt so unchanged inputs cost nothing"""
+        key = content_hash('conclusion', PROMPT_VERSION, self.model_config['name'], prefix, prompt)
+        cached = self.cache.get(key)
+        if cached is not None:
+            logger.info("Cross-industry conclusion unchanged; reusing cached result")
+            return cached
+        response = self.model_manager.generate_complete_response(
+            self.model_config['name'], prompt, prefix=prefix, required_sections=required_sections)
+        self.cache.set(key, response.text)
+        return response.text
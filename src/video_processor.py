@@ -4,11 +4,16 @@ import logging
 import pandas as pd
 from typing import List, Dict, Tuple
 from config.config import AWS_ACCESS_KEY_ID, AWS_SECRET_ACCESS_KEY, AWS_REGION, INDUSTRY_KEYWORDS
+from src.cassette import CASSETTE
+from src.video_records import VideoCollection
 
 logger = logging.getLogger(__name__)
 
 class VideoProcessor:
     def __init__(self):
+        if CASSETTE.replaying:
+            self.bedrock_runtime = None  # responses come from the cassette
+            return
         self.bedrock_runtime = boto3.client(
             service_name='bedrock-runtime',
             aws_access_key_id=AWS_ACCESS_KEY_ID,
@@ -16,9 +21,11 @@ class VideoProcessor:
             region_name=AWS_REGION
         )
     
-    def classify_by_keywords(self, videos: List[dict]) -> List[dict]:
+    def classify_by_keywords(self, videos: List[dict]) -> VideoCollection:
         """Classify videos based on industry keywords in titles"""
-        industry_videos = []
+        # Keep every column of the input (e.g. enrichment metadata) after the industry
+        columns = videos.columns if isinstance(videos, VideoCollection) else ['title', 'video_id', 'description']
+        industry_videos = VideoCollection(['industry', *[c for c in columns if c != 'industry']])
         
         for video in videos:
             title = video.get('title', '')
@@ -29,6 +36,7 @@ class VideoProcessor:
                 if keyword in title:
                     industry = keyword.strip('(')
                     industry_videos.append({
+                        **video,
                         'industry': industry,
                         'title': title,
                         'video_id': video_id,
@@ -37,7 +45,7 @@ class VideoProcessor:
         
         return industry_videos
 
-    def classify_by_llm(self, videos: List[dict]) -> List[dict]:
+    def classify_by_llm(self, videos: List[dict]) -> VideoCollection:
         """Use LLM to classify videos"""
         industry_videos = []
         
@@ -54,7 +62,7 @@ class VideoProcessor:
                 logger.error(f"Error processing video {video['title']}: {str(e)}")
                 continue
                 
-        return industry_videos
+        return VideoCollection.from_records(industry_videos)
 
     def _analyze_industry_relevance(self, description):
         """Analyze if video content is industry-related"""
@@ -82,12 +90,13 @@ class VideoProcessor:
                 "temperature": 0.7
             }
             
-            response = self.bedrock_runtime.invoke_model(
-                modelId="anthropic.claude-3-haiku-20240307-v1:0",
-                body=json.dumps(request_body)
-            )
+            model_id = "anthropic.claude-3-haiku-20240307-v1:0"
             
-            response_body = json.loads(response['body'].read())
+            def invoke():
+                response = self.bedrock_runtime.invoke_model(modelId=model_id, body=json.dumps(request_body))
+                return json.loads(response['body'].read())
+            response_body = CASSETTE.call('llm', CASSETTE.request_key(model_id, request_body), invoke,
+                                          label=model_id)
             result = response_body['content'][0]['text'].strip()
             
             lines = result.split('\n', 1)
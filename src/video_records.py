@@ -0,0 +1,308 @@
+import sys
+from array import array
+import pandas as pd
+
+# Code stored for rows without an industry
+NO_INDUSTRY = -1
+
+class VideoRecord:
+    """Lightweight row view into a VideoCollection
+
+    Behaves like a read/write dict (video['title'], video.get('transcript'),
+    {**video}) without owning any data, so iterating a collection of 100k
+    videos allocates no per-row dictionaries.
+    """
+
+    __slots__ = ('_collection', '_row')
+
+    def __init__(self, collection, row):
+        self._collection = collection
+        self._row = row
+
+    def __getitem__(self, key):
+        return self._collection._get(self._row, key)
+
+    def __setitem__(self, key, value):
+        self._collection._set(self._row, key, value)
+
+    def __contains__(self, key):
+        return key in self._collection.columns
+
+    def __iter__(self):
+        return iter(self._collection.columns)
+
+    def __len__(self):
+        return len(self._collection.columns)
+
+    def __repr__(self):
+        return f"VideoRecord({self.to_dict()!r})"
+
+    def get(self, key, default=None):
+        if key not in self._collection.columns:
+            return default
+        return self._collection._get(self._row, key)
+
+    def keys(self):
+        return list(self._collection.columns)
+
+    def items(self):
+        return [(key, self[key]) for key in self._collection.columns]
+
+    def to_dict(self):
+        return dict(self.items())
+
+    copy = to_dict
+
+class VideoCollection:
+    """Column-oriented, compact collection of video records
+
+    Text columns are plain lists holding references to (shared) string objects,
+    and 'industry' is stored categorically: an array of small integer codes into
+    a table of interned industry names. Views returned by view(),
+    sort_by_industry() and group_by_industry() share the parent's columns and
+    only hold an index array, so grouping and sorting never copy records.
+    """
+
+    __slots__ = ('columns', '_data', '_industry_codes', '_industries', '_industry_lookup', '_rows', '_count')
+
+    def __init__(self, columns=('title', 'video_id', 'description')):
+        """
+        Args:
+            columns: Column names in output order; 'industry' is stored as a categorical code
+        """
+        self.columns = list(columns)
+        self._data = {name: [] for name in self.columns if name != 'industry'}
+        self._industry_codes = array('h')
+        self._industries = []
+        self._industry_lookup = {}
+        self._rows = None  # None for a base collection, index array for a view
+        self._count = 0  # rows of a base collection, kept explicitly rather than derived from a column
+
+    # -- construction -------------------------------------------------------------------
+
+    @classmethod
+    def from_records(cls, records):
+        """Build a collection from dicts, VideoRecords or another collection (references, not copies)"""
+        if isinstance(records, VideoCollection):
+            collection = cls(records.columns)
+            for name in records.columns:
+                if name == 'industry':
+                    collection._industries = list(records._industries)
+                    collection._industry_lookup = dict(records._industry_lookup)
+                    collection._industry_codes = array(
+                        'h', (records._industry_codes[row] for row in records._row_indices()))
+                else:
+                    collection._data[name] = list(records.column(name))
+            collection._count = len(records)
+            return collection
+
+        records = list(records)
+        columns = []
+        for record in records:
+            for key in record.keys():
+                if key not in columns:
+                    columns.append(key)
+        collection = cls(columns or ('title', 'video_id', 'description'))
+        collection.extend(records)
+        return collection
+
+    @classmethod
+    def ensure(cls, videos):
+        """Return videos unchanged if already a collection, otherwise convert it"""
+        return videos if isinstance(videos, VideoCollection) else cls.from_records(videos)
+
+    @classmethod
+    def from_dataframe(cls, df):
+        """Build a collection column by column from a DataFrame (no per-row dicts)"""
+        collection = cls(df.columns)
+        for name in df.columns:
+            if name == 'industry':
+                categorical = pd.Categorical(df[name])
+                collection._industries = [sys.intern(str(c)) for c in categorical.categories]
+                collection._industry_lookup = {name: i for i, name in enumerate(collection._industries)}
+                collection._industry_codes = array('h', categorical.codes.astype('int16').tobytes())
+            else:
+                values = df[name].tolist()
+                collection._data[name] = [None if isinstance(v, float) and v != v else v for v in values]
+        collection._count = len(df)
+        return collection
+
+    def _industry_code(self, industry):
+        if industry is None or (isinstance(industry, float) and industry != industry):
+            return NO_INDUSTRY
+        code = self._industry_lookup.get(industry)
+        if code is None:
+            code = len(self._industries)
+            self._industries.append(sys.intern(str(industry)))
+            self._industry_lookup[self._industries[code]] = code
+        return code
+
+    def _require_base(self):
+        if self._rows is not None:
+            raise TypeError("Cannot append to a view; use VideoCollection.from_records(view) to copy it")
+
+    def append(self, record):
+        """Append one record (dict-like); unknown keys add a new column"""
+        self._require_base()
+        row_count = len(self)
+        for key in record.keys():
+            if key not in self.columns:
+                self.set_column(key, [None] * row_count)
+        for name in self.columns:
+            if name == 'industry':
+                self._industry_codes.append(self._industry_code(record.get('industry')))
+            else:
+                self._data[name].append(record.get(name))
+        self._count += 1
+
+    def extend(self, records):
+        for record in records:
+            self.append(record)
+
+    def set_column(self, name, values):
+        """Add or replace a whole column; values must be in view order"""
+        values = list(values) if not isinstance(values, list) else values
+        if self._rows is not None:
+            # Write through to the base rows this view refers to
+            if name not in self.columns:
+                raise TypeError("Cannot add a column to a view")
+            for row, value in zip(self._rows, values):
+                self._set_base(row, name, value)
+            return
+
+        if len(self) and len(values) != len(self):
+            raise ValueError(f"Column {name} has {len(values)} values for {len(self)} rows")
+        if not len(self) and values:
+            # The first column given to an empty collection sets its length; the others are filled with None
+            self._count = len(values)
+            for other in self.columns:
+                if other == 'industry':
+                    self._industry_codes = array('h', [NO_INDUSTRY] * self._count)
+                elif other != name:
+                    self._data[other] = [None] * self._count
+        if name not in self.columns:
+            self.columns.append(name)
+        if name == 'industry':
+            self._industry_codes = array('h', (self._industry_code(v) for v in values))
+        else:
+            self._data[name] = values
+
+    # -- access ---------------------------------------------------------------------------
+
+    def __len__(self):
+        return self._count if self._rows is None else len(self._rows)
+
+    def _base_row(self, row):
+        return row if self._rows is None else self._rows[row]
+
+    def _get_base(self, row, key):
+        if key == 'industry':
+            code = self._industry_codes[row]
+            return None if code == NO_INDUSTRY else self._industries[code]
+        if key not in self._data:
+            raise KeyError(key)
+        return self._data[key][row]
+
+    def _set_base(self, row, key, value):
+        if key not in self.columns:
+            self.set_column(key, [None] * len(self))
+        if key == 'industry':
+            self._industry_codes[row] = self._industry_code(value)
+        else:
+            self._data[key][row] = value
+
+    def _get(self, row, key):
+        return self._get_base(self._base_row(row), key)
+
+    def _set(self, row, key, value):
+        if self._rows is not None and key not in self.columns:
+            raise TypeError("Cannot add a column through a view")
+        self._set_base(self._base_row(row), key, value)
+
+    def __getitem__(self, row):
+        if row < 0:
+            row += len(self)
+        if not 0 <= row < len(self):
+            raise IndexError(row)
+        return VideoRecord(self, row)
+
+    def __iter__(self):
+        for row in range(len(self)):
+            yield VideoRecord(self, row)
+
+    def __repr__(self):
+        kind = 'view' if self._rows is not None else 'collection'
+        return f"<VideoCollection {kind}: {len(self)} videos, columns={self.columns}>"
+
+    def column(self, name):
+        """Return a column's values in view order (the stored list itself for a base collection)"""
+        if name == 'industry':
+            return [self._get_base(row, 'industry') for row in self._row_indices()]
+        if self._rows is None:
+            return self._data[name]
+        values = self._data[name]
+        return [values[row] for row in self._rows]
+
+    def industries(self):
+        """Distinct industry names present in this collection, in first-appearance order"""
+        if 'industry' not in self.columns:
+            return []
+        seen = dict.fromkeys(self._industry_codes[row] for row in self._row_indices())
+        return [self._industries[code] for code in seen if code != NO_INDUSTRY]
+
+    # -- zero-copy views ------------------------------------------------------------------
+
+    def _row_indices(self):
+        return range(len(self)) if self._rows is None else self._rows
+
+    def view(self, rows):
+        """Return a view over the given rows of this collection, sharing its storage"""
+        if self._rows is not None:
+            rows = (self._rows[row] for row in rows)
+        return self._view_base(rows)
+
+    def _view_base(self, rows):
+        view = VideoCollection.__new__(VideoCollection)
+        view.columns = self.columns
+        view._data = self._data
+        view._industry_codes = self._industry_codes
+        view._industries = self._industries
+        view._industry_lookup = self._industry_lookup
+        view._rows = array('I', rows)
+        view._count = len(view._rows)
+        return view
+
+    def sort_by_industry(self):
+        """Stable sort by industry name; returns a view (index array), records are not copied"""
+        rank = {code: i for i, code in enumerate(
+            sorted(range(len(self._industries)), key=self._industries.__getitem__))}
+        rank[NO_INDUSTRY] = len(rank)
+        codes = self._industry_codes
+        return self._view_base(sorted(self._row_indices(), key=lambda row: rank[codes[row]]))
+
+    def group_by_industry(self):
+        """Group rows by industry in first-appearance order; returns {industry: view}"""
+        groups = {}
+        codes = self._industry_codes
+        for row in self._row_indices():
+            groups.setdefault(codes[row], array('I')).append(row)
+        return {self._industries[code]: self._view_base(rows)
+                for code, rows in groups.items() if code != NO_INDUSTRY}
+
+    # -- conversion -----------------------------------------------------------------------
+
+    def to_records(self):
+        """Materialize plain dicts (only for callers that really need them)"""
+        return [record.to_dict() for record in self]
+
+    def to_dataframe(self):
+        """Build a DataFrame column by column, with industry as a pandas Categorical"""
+        frame = {}
+        for name in self.columns:
+            if name == 'industry':
+                codes = [self._industry_codes[row] for row in self._row_indices()]
+                frame[name] = pd.Categorical.from_codes(codes, categories=self._industries) \
+                    if self._industries else pd.Categorical([None] * len(codes))
+            else:
+                frame[name] = self.column(name)
+        return pd.DataFrame(frame, columns=self.columns)
@@ -0,0 +1,268 @@
+import os
+import json
+import time
+import socket
+import sqlite3
+import logging
+import threading
+from config.config import WORK_QUEUE_CONFIG, WORK_QUEUE_DB_PATH
+from src.text_utils import content_hash
+
+logger = logging.getLogger(__name__)
+
+# Jobs in these states still need a worker
+OPEN_STATUSES = ('pending', 'leased')
+
+def default_worker_id():
+    """hostname:pid, unique across the machines sharing the queue"""
+    return f"{socket.gethostname()}:{os.getpid()}"
+
+class WorkQueue:
+    """Lease-based job queue in a SQLite file, shared by worker processes on one or more machines
+
+    A worker claims a job by taking a time-limited lease on it and renews the
+    lease with heartbeats while it works. A job whose lease expired (the worker
+    crashed or lost the filesystem) is handed to the next worker that asks, until
+    it has used max_attempts. Results are stored with the job, so a coordinator
+    only needs the same file. Each enqueue opens a new generation of the queue,
+    which the coordinator marks finished when it has collected the results, so
+    workers can tell a finished run from finished jobs left by an earlier one.
+    The database uses rollback journaling instead of WAL so it also works on
+    network filesystems, which cannot share WAL's memory-mapped index.
+    """
+
+    def __init__(self, db_path=WORK_QUEUE_DB_PATH, queue_config=None):
+        """
+        Args:
+            db_path (str): Path to the SQLite database file (on a filesystem shared by all workers)
+            queue_config (dict): Overrides for WORK_QUEUE_CONFIG
+        """
+        directory = os.path.dirname(db_path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+        self.config = {**WORK_QUEUE_CONFIG, **(queue_config or {})}
+        self._lock = threading.Lock()
+        # Autocommit mode; claims open their own write transaction with BEGIN IMMEDIATE
+        self.conn = sqlite3.connect(db_path, check_same_thread=False, timeout=30, isolation_level=None)
+        with self._lock:
+            self.conn.execute("PRAGMA journal_mode=DELETE")
+            self.conn.execute("""
+                CREATE TABLE IF NOT EXISTS jobs (
+                    queue TEXT NOT NULL,
+                    job_id TEXT NOT NULL,
+                    payload TEXT NOT NULL,
+                    payload_hash TEXT NOT NULL,
+                    status TEXT NOT NULL,
+                    attempts INTEGER NOT NULL DEFAULT 0,
+                    owner TEXT,
+                    lease_expires REAL,
+                    result TEXT,
+                    error TEXT,
+                    updated_at REAL NOT NULL,
+                    PRIMARY KEY (queue, job_id)
+                )
+            """)
+            self.conn.execute("""
+                CREATE TABLE IF NOT EXISTS queues (
+                    queue TEXT PRIMARY KEY,
+                    generation INTEGER NOT NULL,
+                    status TEXT NOT NULL,
+                    updated_at REAL NOT NULL
+                )
+            """)
+
+    def enqueue(self, queue, jobs):
+        """
+        Add jobs, keeping finished ones whose payload is unchanged, and open a new generation
+
+        Jobs of earlier generations that are not in jobs (e.g. industries a resumed
+        coordinator skips) are removed, so no worker keeps paying for them.
+        Args:
+            queue: Queue name, e.g. 'step3'
+            jobs: Dict of job_id -> JSON-serializable payload
+        Returns:
+            int: Number of jobs added or reset to pending
+        """
+        now = time.time()
+        rows = []
+        for job_id, payload in jobs.items():
+            payload_json = json.dumps(payload)
+            rows.append((queue, job_id, payload_json, content_hash(payload_json), now))
+        with self._lock:
+            before = self.conn.total_changes
+            self.conn.execute("BEGIN IMMEDIATE")
+            try:
+                self.conn.executemany("""
+                    INSERT INTO jobs (queue, job_id, payload, payload_hash, status, updated_at)
+                    VALUES (?, ?, ?, ?, 'pending', ?)
+                    ON CONFLICT (queue, job_id) DO UPDATE SET
+                        payload = excluded.payload, payload_hash = excluded.payload_hash,
+                        status = 'pending', attempts = 0, owner = NULL, lease_expires = NULL,
+                        result = NULL, error = NULL, updated_at = excluded.updated_at
+                    WHERE jobs.payload_hash != excluded.payload_hash OR jobs.status = 'failed'
+                """, rows)
+                changed = self.conn.total_changes - before
+                stale = [(queue, row[0]) for row in self.conn.execute(
+                    "SELECT job_id FROM jobs WHERE queue = ?", (queue,)) if row[0] not in jobs]
+                self.conn.executemany("DELETE FROM jobs WHERE queue = ? AND job_id = ?", stale)
+                self.conn.execute("""
+                    INSERT INTO queues (queue, generation, status, updated_at) VALUES (?, 1, 'open', ?)
+                    ON CONFLICT (queue) DO UPDATE SET
+                        generation = queues.generation + 1, status = 'open', updated_at = excluded.updated_at
+                """, (queue, now))
+                self.conn.execute("COMMIT")
+            except Exception:
+                self.conn.execute("ROLLBACK")
+                raise
+        if stale:
+            logger.info(f"Removed {len(stale)} jobs of queue {queue} that are no longer requested")
+        return changed
+
+    def finish(self, queue):
+        """Mark the current generation finished (coordinator side); waiting workers then exit"""
+        with self._lock:
+            self.conn.execute("UPDATE queues SET status = 'finished', updated_at = ? WHERE queue = ?",
+                              (time.time(), queue))
+
+    def state(self, queue):
+        """(generation, 'open' or 'finished') of a queue, or (0, None) if nothing was ever enqueued"""
+        with self._lock:
+            row = self.conn.execute("SELECT generation, status FROM queues WHERE queue = ?", (queue,)).fetchone()
+        return tuple(row) if row else (0, None)
+
+    def claim(self, queue, worker_id):
+        """
+        Lease the next pending (or expired) job
+
+        An expired job that already used max_attempts (its workers kept dying
+        before they could report a failure) is marked failed instead.
+        Args:
+            queue: Queue name
+            worker_id: Identifier of the claiming worker
+        Returns:
+            dict: {'job_id', 'payload', 'attempts'}, or None if nothing is claimable
+        """
+        now = time.time()
+        with self._lock:
+            self.conn.execute("BEGIN IMMEDIATE")
+            try:
+                exhausted = [row[0] for row in self.conn.execute("""
+                    SELECT job_id FROM jobs
+                    WHERE queue = ? AND status = 'leased' AND lease_expires < ? AND attempts >= ?
+                """, (queue, now, self.config['max_attempts']))]
+                if exhausted:
+                    self.conn.executemany("""
+                        UPDATE jobs SET status = 'failed', owner = NULL, lease_expires = NULL, updated_at = ?,
+                            error = 'lease expired on every attempt (worker crashed or was killed)'
+                        WHERE queue = ? AND job_id = ?
+                    """, [(now, queue, job_id) for job_id in exhausted])
+                    logger.error(f"Jobs {exhausted} failed: lease expired after {self.config['max_attempts']} attempts")
+                row = self.conn.execute("""
+                    SELECT job_id, payload, attempts, owner FROM jobs
+                    WHERE queue = ? AND (status = 'pending' OR (status = 'leased' AND lease_expires < ?))
+                    ORDER BY attempts, job_id LIMIT 1
+                """, (queue, now)).fetchone()
+                if row is None:
+                    self.conn.execute("COMMIT")
+                    return None
+                job_id, payload, attempts, previous_owner = row
+                self.conn.execute("""
+                    UPDATE jobs SET status = 'leased', owner = ?, lease_expires = ?,
+                        attempts = attempts + 1, updated_at = ?
+                    WHERE queue = ? AND job_id = ?
+                """, (worker_id, now + self.config['lease_seconds'], now, queue, job_id))
+                self.conn.execute("COMMIT")
+            except Exception:
+                self.conn.execute("ROLLBACK")
+                raise
+        if previous_owner:
+            logger.warning(f"Reclaimed job {job_id} from {previous_owner} (lease expired)")
+        return {'job_id': job_id, 'payload': json.loads(payload), 'attempts': attempts + 1}
+
+    def heartbeat(self, queue, job_id, worker_id):
+        """Extend the lease; returns False if the worker no longer holds it"""
+        now = time.time()
+        with self._lock:
+            cursor = self.conn.execute("""
+                UPDATE jobs SET lease_expires = ?, updated_at = ?
+                WHERE queue = ? AND job_id = ? AND owner = ? AND status = 'leased'
+            """, (now + self.config['lease_seconds'], now, queue, job_id, worker_id))
+            return cursor.rowcount == 1
+
+    def complete(self, queue, job_id, worker_id, result):
+        """Store the result of a leased job; returns False if the lease was lost meanwhile"""
+        with self._lock:
+            cursor = self.conn.execute("""
+                UPDATE jobs SET status = 'done', result = ?, error = NULL, owner = NULL,
+                    lease_expires = NULL, updated_at = ?
+                WHERE queue = ? AND job_id = ? AND owner = ? AND status = 'leased'
+            """, (json.dumps(result), time.time(), queue, job_id, worker_id))
+            return cursor.rowcount == 1
+
+    def fail(self, queue, job_id, worker_id, error):
+        """Release a job after an error: back to pending, or 'failed' once max_attempts is reached"""
+        with self._lock:
+            self.conn.execute("""
+                UPDATE jobs SET status = CASE WHEN attempts >= ? THEN 'failed' ELSE 'pending' END,
+                    error = ?, owner = NULL, lease_expires = NULL, updated_at = ?
+                WHERE queue = ? AND job_id = ? AND owner = ? AND status = 'leased'
+            """, (self.config['max_attempts'], str(error), time.time(), queue, job_id, worker_id))
+
+    def counts(self, queue):
+        """Number of jobs per status"""
+        with self._lock:
+            rows = self.conn.execute(
+                "SELECT status, COUNT(*) FROM jobs WHERE queue = ? GROUP BY status", (queue,)
+            ).fetchall()
+        return dict(rows)
+
+    def results(self, queue):
+        """Dict of job_id -> result for finished jobs"""
+        with self._lock:
+            rows = self.conn.execute(
+                "SELECT job_id, result FROM jobs WHERE queue = ? AND status = 'done'", (queue,)
+            ).fetchall()
+        return {job_id: json.loads(result) for job_id, result in rows}
+
+    def errors(self, queue):
+        """Dict of job_id -> last error for jobs that exhausted their attempts"""
+        with self._lock:
+            rows = self.conn.execute(
+                "SELECT job_id, error FROM jobs WHERE queue = ? AND status = 'failed'", (queue,)
+            ).fetchall()
+        return dict(rows)
+
+    def close(self):
+        with self._lock:
+            self.conn.close()
+
+class Heartbeat:
+    """Context manager renewing a job's lease from a background thread while the job runs"""
+
+    def __init__(self, work_queue, queue, job_id, worker_id):
+        self.work_queue = work_queue
+        self.args = (queue, job_id, worker_id)
+        self.lost = False
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, daemon=True)
+
+    def _run(self):
+        while not self._stop.wait(self.work_queue.config['heartbeat_seconds']):
+            try:
+                if not self.work_queue.heartbeat(*self.args):
+                    self.lost = True
+                    logger.warning(f"Lost the lease on job {self.args[1]}")
+                    return
+            except sqlite3.Error as e:
+                # A transient lock or filesystem hiccup; the next beat retries before the lease runs out
+                logger.warning(f"Heartbeat failed for job {self.args[1]}: {str(e)}")
+
+    def __enter__(self):
+        self._thread.start()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self._stop.set()
+        self._thread.join()
+        return False
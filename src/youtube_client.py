@@ -1,15 +1,94 @@
 from googleapiclient.discovery import build
-from config.config import YOUTUBE_API_KEY
+from config.config import YOUTUBE_API_KEY, YOUTUBE_ENRICH_CONFIG
+import re
+from urllib.parse import parse_qsl, urlencode, urlsplit
+import http.client
+import httplib2
 import logging
-from youtube_transcript_api import YouTubeTranscriptApi
+import threading
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from youtube_transcript_api import NoTranscriptFound, TranscriptsDisabled, YouTubeTranscriptApi
 from youtube_transcript_api.formatters import TextFormatter
+from src.cassette import CASSETTE, ReplayedError
+from src.profiler import span
+from src.result_cache import ResultCache
+from src.video_records import VideoCollection
 import time
 
 logger = logging.getLogger(__name__)
 
+# Partial response: only the playlist item fields we turn into records
+PLAYLIST_ITEM_FIELDS = 'nextPageToken,items(snippet(title,description,resourceId/videoId))'
+VIDEO_METADATA_FIELDS = 'items(id,snippet/publishedAt,contentDetails/duration,statistics/viewCount)'
+
+# Definite "this video has no English transcript" answers; any other error is transient
+NO_TRANSCRIPT_ERRORS = (TranscriptsDisabled, NoTranscriptFound)
+
+# Columns added by enrich_videos
+METADATA_COLUMNS = ['duration_seconds', 'view_count', 'published_at']
+
+# ISO 8601 durations as returned by the API, e.g. PT1H2M3S or P1DT2H
+DURATION_PATTERN = re.compile(r'P(?:(\d+)D)?(?:T(?:(\d+)H)?(?:(\d+)M)?(?:(\d+)S)?)?$')
+
+# Bytes read off the wire (before gzip decoding) by the current thread
+_transfer = threading.local()
+
+class _CountingHTTPResponse(http.client.HTTPResponse):
+    def read(self, amt=None):
+        data = super().read(amt)
+        _transfer.bytes = getattr(_transfer, 'bytes', 0) + len(data)
+        return data
+
+class _CountingHTTPSConnection(httplib2.HTTPSConnectionWithTimeout):
+    response_class = _CountingHTTPResponse
+
+class _CountingHttp(httplib2.Http):
+    """httplib2.Http whose responses count their raw (still compressed) body bytes"""
+
+    def request(self, uri, method="GET", body=None, headers=None,
+                redirections=httplib2.DEFAULT_MAX_REDIRECTS, connection_type=None):
+        return super().request(uri, method, body, headers, redirections,
+                               connection_type or _CountingHTTPSConnection)
+
 class YouTubeClient:
     def __init__(self):
-        self.youtube = build('youtube', 'v3', developerKey=YOUTUBE_API_KEY)
+        self.youtube = build('youtube', 'v3', developerKey=YOUTUBE_API_KEY, http=_CountingHttp())
+        self._stats_lock = threading.Lock()
+        self._local = threading.local()
+        self.requests_made = 0
+        self.bytes_received = 0
+    
+    def _thread_http(self):
+        """Per-thread Http object (httplib2 connections must not be shared between threads)"""
+        if not hasattr(self._local, 'http'):
+            self._local.http = _CountingHttp()
+        return self._local.http
+    
+    def _execute(self, request, http=None):
+        """Execute an API request with gzip enabled, counting the bytes transferred"""
+        # Google APIs only compress responses for clients whose User-Agent mentions gzip
+        request.headers['accept-encoding'] = 'gzip'
+        request.headers['user-agent'] = f"{request.headers.get('user-agent', '')} (gzip)".strip()
+        start = getattr(_transfer, 'bytes', 0)
+        with span(getattr(request, 'methodId', 'youtube.request'), 'youtube') as args:
+            response = CASSETTE.call('youtube', self._request_key(request), lambda: request.execute(http=http),
+                                     label=getattr(request, 'methodId', None))
+            args['bytes'] = getattr(_transfer, 'bytes', 0) - start
+        with self._stats_lock:
+            self.requests_made += 1
+            self.bytes_received += args['bytes']
+        return response
+    
+    def _request_key(self, request):
+        """Cassette key of an API request: method, URL without the API key, and body"""
+        url = urlsplit(request.uri)
+        query = urlencode(sorted((k, v) for k, v in parse_qsl(url.query) if k != 'key'))
+        return CASSETTE.request_key(request.method, url.path, query, request.body)
+    
+    def transfer_stats(self):
+        """API requests made and response bytes received (compressed) by this client"""
+        with self._stats_lock:
+            return {'requests': self.requests_made, 'bytes': self.bytes_received}
     
     def _clean_description(self, description):
         """Clean up video description by removing redundant content"""
@@ -45,24 +124,30 @@ class YouTubeClient:
         Args:
             video_id: YouTube video ID
         Returns:
-            str: Formatted transcript text or None if not available
+            str: Formatted transcript text or None if the video has no English transcript
+        Raises:
+            Exception: On any other failure (network, rate limiting, ...), so it can be retried later
         """
         try:
             # Get transcript in English
-            transcript_list = YouTubeTranscriptApi.get_transcript(
-                video_id,
-                languages=['en']
-            )
-            
-            # Format transcript to plain text
-            formatter = TextFormatter()
-            formatted_transcript = formatter.format_transcript(transcript_list)
-            
-            return formatted_transcript
-            
+            with span('youtube.transcript', 'youtube', video_id=video_id):
+                # A missing transcript is recorded too, so replay reproduces it
+                transcript_list = CASSETTE.call('transcript', video_id, lambda: YouTubeTranscriptApi.get_transcript(
+                    video_id,
+                    languages=['en']
+                ), label=video_id, record_errors=NO_TRANSCRIPT_ERRORS)
+        except (*NO_TRANSCRIPT_ERRORS, ReplayedError) as e:
+            logger.info(f"No transcript for video {video_id}: {type(e).__name__}")
+            return None
         except Exception as e:
             logger.error(f"Error getting transcript for video {video_id}: {str(e)}")
-            return None
+            raise
+        
+        # Format transcript to plain text
+        formatter = TextFormatter()
+        formatted_transcript = formatter.format_transcript(transcript_list)
+        
+        return formatted_transcript
     
     def get_playlist_videos(self, playlist_id):
         """
@@ -70,71 +155,175 @@ class YouTubeClient:
         Args:
             playlist_id: YouTube playlist ID
         Returns:
-            list: List of dictionaries containing video information
+            VideoCollection: Videos with title, video_id and description
         """
-        videos = []
-        next_page_token = None
+        videos = VideoCollection(['title', 'video_id', 'description'])
+        start_stats = self.transfer_stats()
+        pages = 0
+        
+        def fetch_page(page_token):
+            return self._execute(self.youtube.playlistItems().list(
+                part="snippet",
+                playlistId=playlist_id,
+                maxResults=50,
+                pageToken=page_token,
+                fields=PLAYLIST_ITEM_FIELDS
+            ))
         
         try:
-            while True:
-                request = self.youtube.playlistItems().list(
-                    part="snippet",
-                    playlistId=playlist_id,
-                    maxResults=50,
-                    pageToken=next_page_token
-                )
-                response = request.execute()
-                
-                for item in response['items']:
-                    original_description = item['snippet']['description']
-                    cleaned_description = self._clean_description(original_description)
-                    
-                    video = {
-                        'title': item['snippet']['title'],
-                        'video_id': item['snippet']['resourceId']['videoId'],
-                        'description': cleaned_description
-                    }
-                    videos.append(video)
-                    logger.info(f"Processed video: {video['title']}")
-                
-                next_page_token = response.get('nextPageToken')
-                if not next_page_token:
-                    break
-                    
+            # One fetch thread: page N+1 downloads while page N is cleaned and appended
+            with ThreadPoolExecutor(max_workers=1) as executor:
+                future = executor.submit(fetch_page, None)
+                while future is not None:
+                    response = future.result()
+                    pages += 1
+                    next_page_token = response.get('nextPageToken')
+                    future = executor.submit(fetch_page, next_page_token) if next_page_token else None
+                    self._add_playlist_items(videos, response.get('items', []))
+            
+            stats = self.transfer_stats()
             logger.info(f"Successfully retrieved and cleaned {len(videos)} video descriptions")
+            logger.info(f"Fetched {pages} playlist pages: {stats['bytes'] - start_stats['bytes']:,} bytes transferred")
             return videos
             
         except Exception as e:
             logger.error(f"Error fetching playlist videos: {str(e)}")
             raise
     
-    def add_transcripts_to_videos(self, videos, delay_seconds=1):
+    def _add_playlist_items(self, videos, items):
+        """Clean and append one page of playlist items"""
+        for item in items:
+            original_description = item['snippet']['description']
+            cleaned_description = self._clean_description(original_description)
+            
+            video = {
+                'title': item['snippet']['title'],
+                'video_id': item['snippet']['resourceId']['videoId'],
+                'description': cleaned_description
+            }
+            videos.append(video)
+            logger.info(f"Processed video: {video['title']}")
+    
+    def _parse_duration(self, duration):
+        """ISO 8601 duration to seconds, or None if missing or unparseable"""
+        match = DURATION_PATTERN.match(duration or '')
+        if not match or not duration:
+            return None
+        days, hours, minutes, seconds = (int(part or 0) for part in match.groups())
+        return ((days * 24 + hours) * 60 + minutes) * 60 + seconds
+    
+    def get_video_metadata(self, video_ids):
+        """
+        Get duration, view count and publish date with one videos.list call
+        Args:
+            video_ids: Up to 50 YouTube video IDs
+        Returns:
+            dict: video_id -> metadata; IDs the API did not return (private/deleted) map to empty metadata
+        """
+        response = self._execute(self.youtube.videos().list(
+            part='snippet,contentDetails,statistics',
+            id=','.join(video_ids),
+            maxResults=50,
+            fields=VIDEO_METADATA_FIELDS
+        ), http=self._thread_http())
+        
+        metadata = {video_id: dict.fromkeys(METADATA_COLUMNS) for video_id in video_ids}
+        for item in response.get('items', []):
+            view_count = item.get('statistics', {}).get('viewCount')
+            metadata[item['id']] = {
+                'duration_seconds': self._parse_duration(item.get('contentDetails', {}).get('duration')),
+                'view_count': int(view_count) if view_count is not None else None,
+                'published_at': item.get('snippet', {}).get('publishedAt')
+            }
+        return metadata
+    
+    def enrich_videos(self, videos, cache=None, enrich_config=None):
+        """
+        Add duration, view count and publish date to videos with batched, concurrent videos.list calls
+        Args:
+            videos: VideoCollection or list of video dictionaries
+            cache: Optional ResultCache; defaults to 'video_metadata' with the configured refresh TTL
+            enrich_config: Overrides for YOUTUBE_ENRICH_CONFIG
+        Returns:
+            VideoCollection: Copy of the videos with duration_seconds, view_count and published_at columns
+        """
+        config = {**YOUTUBE_ENRICH_CONFIG, **(enrich_config or {})}
+        cache = cache or ResultCache('video_metadata', ttl_seconds=config['ttl_seconds'])
+        enriched = VideoCollection.from_records(videos)
+        video_ids = list(dict.fromkeys(v for v in enriched.column('video_id') if v))
+        
+        metadata = cache.get_many(video_ids)
+        missing = [video_id for video_id in video_ids if video_id not in metadata]
+        batch_size = config['batch_size']
+        batches = [missing[i:i + batch_size] for i in range(0, len(missing), batch_size)]
+        if len(batches) > config['max_requests']:
+            logger.warning(f"Enrichment needs {len(batches)} videos.list calls but the quota budget is "
+                           f"{config['max_requests']}; the rest stay unenriched until the next run")
+            batches = batches[:config['max_requests']]
+        
+        logger.info(f"Enriching {len(video_ids)} videos: {len(metadata)} from cache, "
+                    f"{len(missing)} in {len(batches)} videos.list calls")
+        failed = 0
+        if batches:
+            with ThreadPoolExecutor(max_workers=config['max_concurrency']) as executor:
+                futures = {executor.submit(self.get_video_metadata, batch): batch for batch in batches}
+                for future in as_completed(futures):
+                    try:
+                        batch_metadata = future.result()
+                    except Exception as e:
+                        # Leave this batch unenriched; nothing is cached for it, so it is fetched again next time
+                        logger.error(f"Error fetching metadata for {len(futures[future])} videos: {str(e)}")
+                        failed += 1
+                        continue
+                    cache.set_many(batch_metadata)
+                    metadata.update(batch_metadata)
+        
+        for column in METADATA_COLUMNS:
+            enriched.set_column(column, [metadata.get(video_id, {}).get(column)
+                                         for video_id in enriched.column('video_id')])
+        if failed:
+            logger.warning(f"{failed} of {len(batches)} videos.list calls failed")
+        return enriched
+    
+    def add_transcripts_to_videos(self, videos, delay_seconds=1, corpus=None):
         """
         Add transcripts to a list of videos
         Args:
-            videos: List of video dictionaries
+            videos: VideoCollection or list of video dictionaries
             delay_seconds: Delay between API calls to avoid rate limits
+            corpus: Optional TranscriptCorpus; transcripts are appended to it instead of held in
+                memory, and videos it already covers are not fetched again
         Returns:
-            list: List of videos with added transcripts
+            VideoCollection: Copy of the videos with 'transcript' and 'has_transcript' columns
+                (only 'has_transcript' with a corpus; read the text with corpus.get(video_id))
         """
-        videos_with_transcripts = []
-        total_videos = len(videos)
+        # Shares the string objects of the input; only the new columns are allocated
+        videos_with_transcripts = VideoCollection.from_records(videos)
+        total_videos = len(videos_with_transcripts)
+        transcripts = []
+        has_transcript = []
+        successful_transcripts = 0
+        reused = 0
+        failed = 0
         
-        for i, video in enumerate(videos, 1):
+        for i, video in enumerate(videos_with_transcripts, 1):
+            transcript = None
+            fetched = False
+            if corpus is not None and video['video_id'] in corpus and not CASSETTE.active:
+                found = corpus.has_transcript(video['video_id'])
+                successful_transcripts += found
+                reused += 1
+                has_transcript.append(found)
+                continue
             try:
                 logger.info(f"Getting transcript for video {i}/{total_videos}: {video['title']}")
                 transcript = self.get_video_transcript(video['video_id'])
-                
-                video_with_transcript = video.copy()
-                video_with_transcript['transcript'] = transcript
-                video_with_transcript['has_transcript'] = transcript is not None
-                
-                videos_with_transcripts.append(video_with_transcript)
+                fetched = True
+                successful_transcripts += transcript is not None
                 
                 # Add statistics to log
-                success_rate = sum(1 for v in videos_with_transcripts if v['has_transcript']) / len(videos_with_transcripts)
                 logger.info(f"Progress: {i}/{total_videos} ({(i/total_videos)*100:.1f}%) - "
-                          f"Success rate: {success_rate*100:.1f}%")
+                          f"Success rate: {(successful_transcripts/i)*100:.1f}%")
                 
                 # Add delay to avoid API rate limits
                 if i < total_videos and delay_seconds > 0:
@@ -142,13 +331,28 @@ class YouTubeClient:
                     
             except Exception as e:
                 logger.error(f"Error processing video {video.get('title', '')}: {str(e)}")
-                continue
+                failed += 1
+            if corpus is not None:
+                # Only a definite answer goes into the append-only corpus; failed fetches are retried next run
+                if fetched:
+                    corpus.append(video['video_id'], transcript)
+            else:
+                transcripts.append(transcript)
+            has_transcript.append(transcript is not None)
+        
+        if corpus is None:
+            videos_with_transcripts.set_column('transcript', transcripts)
+        videos_with_transcripts.set_column('has_transcript', has_transcript)
         
         # Final statistics
-        successful_transcripts = sum(1 for v in videos_with_transcripts if v['has_transcript'])
         logger.info(f"\nTranscript retrieval completed:")
-        logger.info(f"Total videos processed: {len(videos_with_transcripts)}")
+        logger.info(f"Total videos processed: {total_videos}")
+        if corpus is not None:
+            logger.info(f"Already in the transcript corpus: {reused}")
         logger.info(f"Successful transcripts: {successful_transcripts}")
-        logger.info(f"Success rate: {(successful_transcripts/len(videos_with_transcripts))*100:.1f}%")
+        if failed:
+            logger.warning(f"Failed to fetch {failed} transcripts; they are retried on the next run")
+        if total_videos:
+            logger.info(f"Success rate: {(successful_transcripts/total_videos)*100:.1f}%")
         
         return videos_with_transcripts
\ No newline at end of file
@@ -0,0 +1,15 @@
+import os
+import sys
+
+import pytest
+
+# Modules read credentials at import time; tests never reach a real provider
+os.environ.setdefault('AWS_REGION', 'us-east-1')
+os.environ.setdefault('YOUTUBE_API_KEY', 'test-key')
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+@pytest.fixture
+def workdir(tmp_path, monkeypatch):
+    """Run in an empty directory, so relative output/ paths never touch the repo's outputs"""
+    monkeypatch.chdir(tmp_path)
+    return tmp_path
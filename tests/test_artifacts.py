@@ -0,0 +1,59 @@
+import json
+import os
+
+import pandas as pd
+import pytest
+
+from src import artifacts
+
+@pytest.fixture
+def csv_path(workdir):
+    os.makedirs('output')
+    path = os.path.join('output', 'industry_videos.csv')
+    pd.DataFrame({'industry': ['Retail', 'Health', 'Retail'], 'title': ['a', 'b', None],
+                  'video_id': ['1', '2', '3'], 'description': ['x', 'y', 'z'],
+                  'view_count': [10.0, None, 30.0]}).to_csv(path, index=False)
+    return path
+
+def _sidecar_columns():
+    with open(os.path.join(artifacts._sidecar_path('industry_videos.csv'), 'meta.json')) as f:
+        return set(json.load(f)['columns'])
+
+def test_cold_load_parses_only_the_projection(csv_path):
+    df = artifacts.load_artifact(csv_path, columns=['title', 'industry'])
+    assert list(df.columns) == ['title', 'industry']
+    assert isinstance(df['industry'].dtype, pd.CategoricalDtype)
+    assert _sidecar_columns() == {'title', 'industry'}
+
+def test_sidecar_collects_columns_and_matches_the_csv(csv_path):
+    cold = artifacts.load_artifact(csv_path, columns=['industry', 'title'])
+    artifacts.load_artifact(csv_path, columns=['view_count'])
+    assert _sidecar_columns() == {'industry', 'title', 'view_count'}
+    warm = artifacts.load_artifact(csv_path, columns=['industry', 'title'])
+    pd.testing.assert_frame_equal(warm, cold)
+    assert warm['title'].isna().tolist() == [False, False, True]
+
+def test_changed_csv_rebuilds_the_sidecar(csv_path):
+    artifacts.load_artifact(csv_path, columns=['title', 'view_count'])
+    pd.DataFrame({'title': ['new'], 'industry': ['Retail'], 'view_count': [1.0]}).to_csv(csv_path, index=False)
+    df = artifacts.load_artifact(csv_path, columns=['title'])
+    assert df['title'].tolist() == ['new']
+    assert _sidecar_columns() == {'title'}
+
+def test_full_load_without_sidecar(csv_path):
+    df = artifacts.load_artifact(csv_path, use_sidecar=False)
+    assert list(df.columns) == ['industry', 'title', 'video_id', 'description', 'view_count']
+    assert not os.path.exists(artifacts._sidecar_path('industry_videos.csv'))
+
+def test_chunks_keep_the_schema_and_add_up_to_a_full_load(csv_path):
+    columns = ['industry', 'title', 'view_count']
+    chunks = list(artifacts.iter_artifact(csv_path, columns=columns, chunksize=2))
+    assert [len(chunk) for chunk in chunks] == [2, 1]
+    for chunk in chunks:
+        assert list(chunk.columns) == columns
+        assert isinstance(chunk['industry'].dtype, pd.CategoricalDtype)
+        assert chunk['view_count'].dtype == 'float64'
+    full = artifacts.load_artifact(csv_path, columns=columns, use_sidecar=False)
+    combined = pd.concat(chunks, ignore_index=True)
+    combined['industry'] = combined['industry'].astype(full['industry'].dtype)
+    pd.testing.assert_frame_equal(combined, full)
@@ -0,0 +1,46 @@
+import json
+
+import httpx
+from openai import OpenAI
+
+from src.benchmark import MOCK_MODEL, MockProvider, ProviderBenchmark
+from src.model_manager import ModelManager
+from src.resilience import THROTTLED
+
+FAST_MOCK = {'first_token_seconds': 0.0, 'output_tokens_per_second': 1e6, 'input_tokens_per_second': 1e9}
+
+def test_mock_provider_reports_tokens_and_first_token():
+    response, seconds, first_token = MockProvider(FAST_MOCK).generate_response_timed(MOCK_MODEL, 'a prompt', 'prefix')
+    assert response.output_tokens > 0 and response.input_tokens > 0
+    assert 0 <= first_token <= seconds
+
+def test_mock_provider_throttles_beyond_max_in_flight():
+    provider = MockProvider({**FAST_MOCK, 'first_token_seconds': 0.2, 'max_in_flight': 1})
+    benchmark = ProviderBenchmark([('p', None, 'prompt')], {'repeat': 4})
+    summary, samples = benchmark.run_level(provider, MOCK_MODEL, concurrency=4)
+    assert summary['requests'] == 4
+    assert any(s['error_class'] == THROTTLED for s in samples)
+    assert summary['throttle_rate'] > 0
+
+def _sse_handler(request):
+    body = json.loads(request.content)
+    assert body['stream'] is True
+    assert 'stream_options' not in body  # not accepted by the pinned openai client
+    chunks = [{'id': 'c', 'object': 'chat.completion.chunk', 'created': 0, 'model': 'm',
+               'choices': [{'index': 0, 'delta': {'content': word}, 'finish_reason': None}]}
+              for word in ('Hello ', 'world')]
+    chunks.append({'id': 'c', 'object': 'chat.completion.chunk', 'created': 0, 'model': 'm',
+                   'choices': [{'index': 0, 'delta': {}, 'finish_reason': 'stop'}]})
+    data = ''.join(f"data: {json.dumps(chunk)}\n\n" for chunk in chunks) + "data: [DONE]\n\n"
+    return httpx.Response(200, content=data.encode(), headers={'content-type': 'text/event-stream'})
+
+def test_openai_stream_without_usage_estimates_tokens():
+    manager = ModelManager({'name': 'stub', 'type': 'openai', 'model_id': 'm', 'api_key': 'k',
+                            'base_url': 'http://stub/v1'})
+    manager.openai_client = OpenAI(api_key='k', base_url='http://stub/v1',
+                                   http_client=httpx.Client(transport=httpx.MockTransport(_sse_handler)))
+    response, first_token = manager._stream_openai_gpt({'model_id': 'm'}, 'some prompt text', 'prefix')
+    assert response.text == 'Hello world'
+    assert response.stop_reason == 'stop'
+    assert response.input_tokens > 0 and response.output_tokens > 0
+    assert first_token is not None
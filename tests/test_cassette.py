@@ -0,0 +1,59 @@
+import os
+
+import pytest
+
+import main
+from src.cassette import Cassette, CASSETTE, ReplayedError
+from src.result_cache import ResultCache
+
+def test_recordings_are_readable_before_close(tmp_path):
+    recorder = Cassette()
+    recorder.record(str(tmp_path))
+    recorder.call('llm', 'k1', lambda: {'text': 'one'})
+    with pytest.raises(LookupError):
+        recorder.call('transcript', 'k2', lambda: (_ for _ in ()).throw(LookupError('no transcript')),
+                      record_errors=LookupError)
+    with pytest.raises(RuntimeError):
+        recorder.call('llm', 'k3', lambda: (_ for _ in ()).throw(RuntimeError('transient')),
+                      record_errors=LookupError)
+
+    # Still open, as if the recording run had been killed here
+    player = Cassette()
+    player.replay(str(tmp_path))
+    assert player.call('llm', 'k1', None) == {'text': 'one'}
+    with pytest.raises(ReplayedError):
+        player.call('transcript', 'k2', None)
+    with pytest.raises(KeyError):
+        player.call('llm', 'k3', None)
+    recorder.close()
+
+@pytest.fixture
+def recording(workdir, monkeypatch):
+    monkeypatch.setattr(CASSETTE, 'mode', 'record')
+    return workdir
+
+def test_caches_are_bypassed_while_recording(recording, monkeypatch):
+    cache = ResultCache('test', db_path=str(recording / 'cache.db'))
+    cache.set('key', 'value')
+    assert cache.get('key') is None
+    monkeypatch.setattr(CASSETTE, 'mode', None)
+    assert cache.get('key') == 'value'
+
+def test_step_outputs_are_not_reused_while_recording(recording):
+    os.makedirs('output')
+    with open(os.path.join('output', 'all_videos.csv'), 'w') as f:
+        f.write('title,video_id,description\nt,1,d\n')
+    assert main.check_file_exists('all_videos.csv') == (False, None)
+
+def test_existing_conclusion_is_regenerated_while_recording(recording, monkeypatch):
+    os.makedirs('output')
+    with open(os.path.join('output', 'conclusion.txt'), 'w') as f:
+        f.write('old')
+    monkeypatch.setattr(main, 'generate_overall_conclusion', lambda *args: 'new')
+
+    class Output:
+        def save_to_txt(self, content, filename):
+            self.saved = (filename, content)
+    output = Output()
+    assert main.step4_generate_conclusion([], main.MODEL_CONFIGS['nova'], output) == 'new'
+    assert output.saved == ('conclusion.txt', 'new')
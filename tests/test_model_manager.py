@@ -0,0 +1,55 @@
+import pytest
+
+from src.model_manager import ModelManager, ModelResponse
+
+class FakeProvider:
+    """Replays scripted responses and records the prefill of each request"""
+
+    def __init__(self, responses):
+        self.responses = list(responses)
+        self.prefills = []
+
+    def __call__(self, model_name, prompt, prefix=None, prefill=None):
+        self.prefills.append(prefill)
+        text, stop_reason = self.responses.pop(0)
+        return ModelResponse(text=text, input_tokens=100, output_tokens=10, cache_read_tokens=5,
+                             stop_reason=stop_reason)
+
+@pytest.fixture
+def manager(monkeypatch):
+    def make(responses):
+        instance = ModelManager.__new__(ModelManager)
+        instance.semantic_cache = None
+        provider = FakeProvider(responses)
+        monkeypatch.setattr(instance, 'generate_response_full', provider)
+        return instance, provider
+    return make
+
+SECTIONS = ('### Detailed Analysis', '### Conclusion')
+
+def test_truncated_answer_is_continued(manager):
+    instance, provider = manager([('### Detailed Analysis\nBanks use ', 'max_tokens'),
+                                  (' Bedrock.\n### Conclusion\nDone.', 'end_turn')])
+    response = instance.generate_complete_response('nova', 'prompt', required_sections=SECTIONS)
+    assert response.text == '### Detailed Analysis\nBanks use Bedrock.\n### Conclusion\nDone.'
+    assert provider.prefills == [None, '### Detailed Analysis\nBanks use']
+    assert (response.input_tokens, response.output_tokens, response.cache_read_tokens) == (200, 20, 10)
+    assert response.continuations == 1
+    assert response.stop_reason == 'end_turn'
+
+def test_missing_section_is_continued(manager):
+    instance, provider = manager([('### Detailed Analysis\nText.', 'end_turn'),
+                                  ('\n### Conclusion\nDone.', 'end_turn')])
+    response = instance.generate_complete_response('nova', 'prompt', required_sections=SECTIONS)
+    assert response.text.endswith('### Conclusion\nDone.')
+    assert len(provider.prefills) == 2
+    assert response.output_tokens == 20
+
+def test_empty_continuation_stops_the_loop(manager):
+    instance, provider = manager([('### Detailed Analysis\nText.', 'end_turn'), ('  ', 'end_turn'),
+                                  ('never requested', 'end_turn')])
+    response = instance.generate_complete_response('nova', 'prompt', required_sections=SECTIONS,
+                                                   max_continuations=3)
+    assert response.text.strip() == '### Detailed Analysis\nText.'
+    assert len(provider.prefills) == 2
+    assert (response.input_tokens, response.output_tokens, response.continuations) == (200, 20, 1)
@@ -0,0 +1,67 @@
+import csv
+import os
+import stat
+
+import pytest
+
+from src.output_manager import PARTIAL_SUFFIX, TEMP_SUFFIX, CsvSink, OutputManager, write_atomically
+
+def test_save_to_csv_raises_instead_of_exiting(workdir):
+    output_manager = OutputManager()
+    os.makedirs(os.path.join('output', 'blocked.csv'))  # a directory where the file should go
+    with pytest.raises(Exception):
+        output_manager.save_to_csv([{'a': 1}], 'blocked.csv')
+
+def _rows(path):
+    with open(path, encoding='utf-8', newline='') as f:
+        return list(csv.DictReader(f))
+
+def test_sink_resumes_from_its_last_flush(workdir):
+    path = str(workdir / 'table.csv')
+    sink = CsvSink(path, fieldnames=['n', 'text'], flush_rows=2)
+    sink.extend({'n': i, 'text': f"row {i}"} for i in range(3))  # rows 0-1 flushed, row 2 buffered
+    sink._file.write('9,torn ro')  # a crash in the middle of a write
+    sink._file.flush()
+    sink._file.close()
+
+    resumed = CsvSink(path, fieldnames=['n', 'text'], flush_rows=2, resume=True)
+    assert [row['n'] for row in resumed.read_partial()] == ['0', '1']
+    resumed.extend({'n': i, 'text': f"row {i}"} for i in (2, 3))
+    resumed.commit()
+    assert [row['n'] for row in _rows(path)] == ['0', '1', '2', '3']
+    assert not os.path.exists(path + PARTIAL_SUFFIX)
+    assert not os.path.exists(path + PARTIAL_SUFFIX + '.json')
+
+def test_sink_starts_over_without_resume_or_when_columns_change(workdir):
+    path = str(workdir / 'table.csv')
+    sink = CsvSink(path, fieldnames=['n'], flush_rows=1)
+    sink.append({'n': 1})
+    sink.close()
+    assert CsvSink(path, fieldnames=['n', 'extra'], resume=True).rows_written == 0
+    sink = CsvSink(path, fieldnames=['n'], flush_rows=1)
+    sink.append({'n': 1})
+    sink.close()
+    assert CsvSink(path, fieldnames=['n']).rows_written == 0
+    assert not os.path.exists(path + PARTIAL_SUFFIX)
+
+def test_save_to_csv_leaves_a_sinks_partial_file_alone(workdir):
+    output_manager = OutputManager()
+    sink = output_manager.open_csv_sink('table.csv', fieldnames=['n'], flush_rows=1)
+    sink.append({'n': 1})
+    output_manager.save_to_csv([{'n': 2}], 'table.csv')
+    output_manager.save_to_txt('text', 'notes.txt')
+    sink.close()
+    assert _rows(os.path.join('output', 'table.csv')) == [{'n': '2'}]
+    assert [row['n'] for row in CsvSink(os.path.join('output', 'table.csv'), resume=True).read_partial()] == ['1']
+    assert not [name for name in os.listdir('output') if name.endswith(TEMP_SUFFIX)]
+
+def test_write_atomically_keeps_permissions(workdir):
+    path = str(workdir / 'notes.txt')
+    os.chmod(workdir, 0o750)
+    write_atomically(path, lambda f: f.write('one'))
+    assert stat.S_IMODE(os.stat(path).st_mode) == 0o640
+    os.chmod(path, 0o600)
+    write_atomically(path, lambda f: f.write('two'))
+    assert stat.S_IMODE(os.stat(path).st_mode) == 0o600
+    with open(path) as f:
+        assert f.read() == 'two'
@@ -0,0 +1,51 @@
+import threading
+
+import pytest
+
+from config.config import MODEL_CONFIGS, PREWARM_CONFIG
+from src.cassette import CASSETTE
+from src.model_manager import ModelManager
+from src.prewarm import ClientPrewarmer
+from src.resilience import get_breaker
+
+@pytest.fixture
+def nova(monkeypatch):
+    monkeypatch.setenv('AWS_ACCESS_KEY_ID', 'test')
+    monkeypatch.setenv('AWS_SECRET_ACCESS_KEY', 'test')
+    monkeypatch.setenv('AWS_DEFAULT_REGION', 'us-east-1')
+    manager = ModelManager(MODEL_CONFIGS['nova'])
+    calls = []
+    monkeypatch.setattr(manager, '_call_bedrock_nova', lambda config, prompt: calls.append((config, prompt)))
+    return manager, calls
+
+def test_default_mode_sends_no_request_to_boto3_providers(nova):
+    manager, calls = nova
+    manager.prewarm(PREWARM_CONFIG['mode'])
+    assert calls == []
+
+def test_probe_is_opt_in_and_goes_through_the_breaker(nova, monkeypatch):
+    manager, calls = nova
+    breaker_calls = []
+    monkeypatch.setattr(manager, '_call_with_breaker', lambda breaker, call: breaker_calls.append(breaker) or call())
+    manager.prewarm('probe')
+    assert len(calls) == 1
+    assert calls[0][0]['max_tokens'] == 1
+    assert calls[0][1] == 'ping'
+    assert breaker_calls == [get_breaker('bedrock')]
+
+def test_no_prewarming_while_recording_or_replaying(nova, monkeypatch):
+    manager, calls = nova
+    monkeypatch.setattr(CASSETTE, 'mode', 'replay')
+    manager.prewarm('probe')
+    assert calls == []
+    prewarmer = ClientPrewarmer(MODEL_CONFIGS['nova'], {'enabled': True}).start()
+    assert prewarmer.model_managers() == {}
+
+def test_join_waits_for_the_prewarm_thread(monkeypatch):
+    release = threading.Event()
+    monkeypatch.setattr(ClientPrewarmer, '_run', lambda self: release.wait())
+    prewarmer = ClientPrewarmer(MODEL_CONFIGS['nova'], {'enabled': True, 'timeout_seconds': 0.05}).start()
+    assert not prewarmer.join()
+    assert prewarmer.model_managers() == {}
+    release.set()
+    assert prewarmer.join()
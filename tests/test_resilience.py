@@ -0,0 +1,74 @@
+import httpx
+import openai
+import pytest
+from botocore.exceptions import ClientError
+
+from src import resilience
+from src.resilience import (FATAL, RETRYABLE, THROTTLED, CircuitBreaker, CircuitOpenError, RetryBudget,
+                            classify_error, retry_after)
+
+def _client_error(code, status=400, headers=None):
+    return ClientError({'Error': {'Code': code, 'Message': code},
+                        'ResponseMetadata': {'HTTPStatusCode': status, 'HTTPHeaders': headers or {}}}, 'Converse')
+
+def _openai_error(status, headers=None):
+    request = httpx.Request('POST', 'https://api.example.com/v1/chat/completions')
+    response = httpx.Response(status, headers=headers or {}, request=request)
+    return openai.APIStatusError('error', response=response, body=None)
+
+def test_classify_error():
+    assert classify_error(_client_error('ThrottlingException', 429)) == THROTTLED
+    assert classify_error(_client_error('ServiceUnavailableException', 503)) == RETRYABLE
+    assert classify_error(_client_error('ValidationException', 400)) == FATAL
+    assert classify_error(_openai_error(429)) == THROTTLED
+    assert classify_error(_openai_error(502)) == RETRYABLE
+    assert classify_error(_openai_error(401)) == FATAL
+    assert classify_error(httpx.ReadTimeout('slow')) == RETRYABLE
+    assert classify_error(ValueError('bad request')) == FATAL
+    assert classify_error(CircuitOpenError('open')) == FATAL
+
+def test_retry_after():
+    assert retry_after(_openai_error(429, {'retry-after-ms': '1500'})) == 1.5
+    assert retry_after(_client_error('ThrottlingException', 429, {'retry-after': '7'})) == 7.0
+    assert retry_after(_openai_error(429, {'retry-after': 'Wed, 21 Oct 2015 07:28:00 GMT'})) is None
+
+def test_retry_budget():
+    budget = RetryBudget(2)
+    budget.consume(THROTTLED)
+    assert not budget.exhausted()
+    budget.consume(RETRYABLE)
+    budget.record_fatal()
+    assert budget.exhausted()
+    assert budget.stats() == {'used': 2, 'remaining': 0, 'by_class': {RETRYABLE: 1, THROTTLED: 1},
+                              'fatal_errors': 1}
+    budget.reset()
+    assert not budget.exhausted()
+    assert budget.stats()['used'] == 0
+
+def test_circuit_breaker_opens_probes_and_closes(monkeypatch):
+    now = [100.0]
+    monkeypatch.setattr(resilience.time, 'monotonic', lambda: now[0])
+    breaker = CircuitBreaker('bedrock', failure_threshold=2, reset_seconds=30)
+    breaker.before_call()
+    breaker.record_failure()
+    breaker.before_call()
+    breaker.record_failure()
+    assert breaker.state == 'open'
+    with pytest.raises(CircuitOpenError):
+        breaker.before_call()
+
+    now[0] += 30
+    breaker.before_call()  # the single probe
+    assert breaker.state == 'half_open'
+    with pytest.raises(CircuitOpenError):
+        breaker.before_call()  # concurrent calls still fail fast while the probe runs
+    breaker.record_failure()
+    assert breaker.state == 'open'
+
+    now[0] += 30
+    breaker.before_call()
+    breaker.record_success()
+    assert breaker.state == 'closed'
+    breaker.before_call()
+    assert breaker.stats() == {'state': 'closed', 'consecutive_failures': 0, 'times_opened': 2,
+                               'rejected_calls': 2}
@@ -0,0 +1,32 @@
+import os
+
+import pandas as pd
+
+from src.search_index import SearchIndex
+
+def test_video_keeps_every_industry(tmp_path):
+    index = SearchIndex(str(tmp_path / 'search.db'))
+    video = {'video_id': 'v1', 'title': 'Clean rooms on AWS', 'description': 'd'}
+    index.index_videos([{**video, 'industry': 'ADM'}, {**video, 'industry': 'RCG'}])
+    index.index_videos([{**video, 'industry': None}])  # step 1 rows carry no industry
+    for industry in ('ADM', 'RCG'):
+        hits = index.search('clean rooms', industry=industry)
+        assert [hit['doc_id'] for hit in hits] == ['video:v1']
+    assert index.search('clean rooms')[0]['industry'] == 'ADM,RCG'
+    assert index.search('clean rooms', industry='FSI') == []
+    assert index.count() == 1
+    # Unchanged rows are not rewritten
+    assert index.index_videos([{**video, 'industry': 'ADM'}]) == 0
+    index.close()
+
+def test_cached_insights_are_indexed_with_their_video_titles(workdir):
+    import main
+    os.makedirs('output')
+    pd.DataFrame([{'industry': 'FSI', 'video_count': 2, 'video_titles': 'Payments at scale; Fraud graphs',
+                   'insights': '### Detailed Analysis\nBanks use Bedrock.'}]).to_csv(
+        os.path.join('output', 'industry_insights.csv'), index=False)
+    index = SearchIndex(str(workdir / 'search.db'))
+    insights = main.step3_generate_insights([], main.MODEL_CONFIGS['nova'], None, index)
+    assert insights[0]['video_titles'] == 'Payments at scale; Fraud graphs'
+    assert [hit['doc_id'] for hit in index.search('fraud graphs', kind='insight')] == ['insight:FSI']
+    index.close()
@@ -0,0 +1,66 @@
+import json
+import threading
+import urllib.error
+import urllib.request
+
+import pytest
+
+from src.resilience import RETRY_BUDGET, RETRYABLE
+from src.serve import PipelineServer
+
+@pytest.fixture
+def server():
+    servers = []
+
+    def make(refresh):
+        instance = PipelineServer(refresh, {'host': '127.0.0.1', 'port': 0, 'refresh_seconds': 3600})
+        servers.append(instance)
+        return instance
+    yield make
+    for instance in servers:
+        instance.shutdown()
+
+def _get(instance, path, headers=None):
+    url = f"http://127.0.0.1:{instance.httpd.server_address[1]}{path}"
+    return urllib.request.urlopen(urllib.request.Request(url, headers=headers or {}), timeout=5)
+
+def test_etag_revalidation(server):
+    instance = server(lambda: {'/conclusion': {'conclusion': 'text'}})
+    instance.run_refresh()
+    threading.Thread(target=instance.httpd.serve_forever, daemon=True).start()
+    try:
+        response = _get(instance, '/conclusion')
+        assert json.loads(response.read()) == {'conclusion': 'text'}
+        etag = response.headers['ETag']
+        with pytest.raises(urllib.error.HTTPError) as not_modified:
+            _get(instance, '/conclusion', {'If-None-Match': etag})
+        assert not_modified.value.code == 304
+        with pytest.raises(urllib.error.HTTPError) as missing:
+            _get(instance, '/nope')
+        assert missing.value.code == 404
+    finally:
+        instance.httpd.shutdown()
+
+def test_failed_refresh_keeps_previous_snapshot(server):
+    results = [{'/videos': [1]}, SystemExit(1), RuntimeError('boom')]
+
+    def refresh():
+        result = results.pop(0)
+        if isinstance(result, BaseException):
+            raise result
+        return result
+    instance = server(refresh)
+    instance.run_refresh()
+    instance.run_refresh()  # SystemExit must not escape and end the refresh thread
+    instance.run_refresh()
+    assert json.loads(instance.cache.get('/videos')[0]) == [1]
+    assert 'boom' in instance.status['last_error']
+    assert instance.status['refreshes'] == 3
+
+def test_retry_budget_is_reset_per_refresh(server):
+    for _ in range(RETRY_BUDGET.max_retries):
+        RETRY_BUDGET.consume(RETRYABLE)
+    assert RETRY_BUDGET.exhausted()
+    instance = server(lambda: {})
+    instance.run_refresh()
+    assert not RETRY_BUDGET.exhausted()
@@ -0,0 +1,51 @@
+import os
+
+import main
+from src.output_manager import OutputManager
+from src.video_records import VideoCollection
+from src.youtube_client import METADATA_COLUMNS
+
+VIDEOS = [{'title': f'Session {i} (FSI20{i})', 'video_id': f'v{i}', 'description': 'd'} for i in range(3)]
+
+class FailingEnrichment:
+    """enrich_videos as it behaves when every videos.list call fails"""
+    calls = 0
+
+    def enrich_videos(self, videos):
+        FailingEnrichment.calls += 1
+        enriched = VideoCollection.from_records(videos)
+        for column in METADATA_COLUMNS:
+            enriched.set_column(column, [None] * len(enriched))
+        return enriched
+
+def _write_all_videos(output_manager, videos):
+    output_manager.save_to_csv(VideoCollection.from_records(videos), 'all_videos.csv')
+
+def test_failed_backfill_leaves_file_unchanged_and_retries(workdir, monkeypatch):
+    monkeypatch.setitem(main.YOUTUBE_ENRICH_CONFIG, 'backfill_cached', True)
+    output_manager = OutputManager()
+    _write_all_videos(output_manager, VIDEOS)
+    path = os.path.join('output', 'all_videos.csv')
+    before = open(path).read()
+
+    FailingEnrichment.calls = 0
+    for _ in range(2):
+        videos = main.step1_get_videos(FailingEnrichment(), output_manager)
+        assert len(videos) == 3
+    assert open(path).read() == before
+    assert FailingEnrichment.calls == 2  # not marked as done by the first failure
+
+def test_cached_step1_works_offline_by_default(workdir):
+    output_manager = OutputManager()
+    _write_all_videos(output_manager, VIDEOS)
+    FailingEnrichment.calls = 0
+    assert len(main.step1_get_videos(FailingEnrichment(), output_manager)) == 3
+    assert FailingEnrichment.calls == 0
+
+def test_has_video_metadata_treats_all_null_as_missing():
+    videos = VideoCollection.from_records(VIDEOS)
+    assert not main.has_video_metadata(videos)
+    videos.set_column('view_count', [None, float('nan'), None])
+    assert not main.has_video_metadata(videos)
+    videos.set_column('view_count', [None, 12.0, None])
+    assert main.has_video_metadata(videos)
@@ -0,0 +1,36 @@
+from src.summarizer import VideoSummarizer
+
+class FakeManager:
+    def __init__(self):
+        self.prompts = []
+
+    async def agenerate_response(self, model_name, prompt):
+        self.prompts.append(prompt)
+        return 'summary of the transcript'
+
+    async def aclose(self):
+        pass
+
+class FakeCache:
+    def __init__(self):
+        self.values = {}
+
+    def get(self, key, default=None):
+        return self.values.get(key, default)
+
+    def set(self, key, value):
+        self.values[key] = value
+
+def test_description_is_used_without_a_model_call():
+    manager = FakeManager()
+    summarizer = VideoSummarizer(model_manager=manager, cache=FakeCache())
+    summaries = summarizer.summarize_videos([
+        {'video_id': 'a', 'title': 't', 'description': ' Short description ', 'transcript': None},
+        {'video_id': 'b', 'title': 't', 'description': 'd', 'transcript': 'words ' * 50},
+    ])
+    assert summaries[0]['summary'] == 'Short description'
+    assert summaries[0]['source'] == 'description'
+    assert summaries[0]['chunks'] == 0
+    assert summaries[1]['summary'] == 'summary of the transcript'
+    assert summaries[1]['source'] == 'transcript'
+    assert len(manager.prompts) == 1
@@ -0,0 +1,92 @@
+import os
+
+import pytest
+from youtube_transcript_api import TranscriptsDisabled, YouTubeTranscriptApi
+
+from src.transcript_corpus import TranscriptCorpus
+from src.youtube_client import YouTubeClient
+
+@pytest.mark.parametrize('compression', [None, 'zlib'])
+def test_round_trip_and_reopen(tmp_path, compression):
+    path = str(tmp_path / 'transcripts')
+    corpus = TranscriptCorpus(path, {'compression': compression})
+    assert corpus.append('a', 'first transcript')
+    assert corpus.append('b', None)
+    assert not corpus.append('a', 'first transcript')  # unchanged: nothing written
+    corpus.append('c', 'third ' * 1000)
+    corpus.close()
+
+    corpus = TranscriptCorpus(path, {'compression': compression})
+    assert len(corpus) == 3
+    assert corpus.get('a') == 'first transcript'
+    assert 'b' in corpus and not corpus.has_transcript('b') and corpus.get('b') is None
+    assert [video_id for video_id, _ in corpus.items()] == ['a', 'c']
+    corpus.close()
+
+def test_interrupted_append_is_ignored(tmp_path):
+    path = str(tmp_path / 'transcripts')
+    corpus = TranscriptCorpus(path)
+    corpus.append('a', 'kept')
+    corpus.append('b', 'lost in a crash')
+    corpus.close()
+    # Simulate a crash after the index entry but before all data reached the disk
+    with open(path + '.data', 'r+b') as f:
+        f.truncate(os.path.getsize(path + '.data') - 3)
+    with open(path + '.index', 'a') as f:
+        f.write('{"video_id": "c", "offs')  # torn last line
+
+    corpus = TranscriptCorpus(path)
+    assert corpus.video_ids() == ['a']
+    assert corpus.get('a') == 'kept'
+    corpus.close()
+
+def _client():
+    return YouTubeClient.__new__(YouTubeClient)  # no API client needed for transcripts
+
+def test_transient_transcript_error_is_not_stored(tmp_path, monkeypatch):
+    def flaky(video_id, languages):
+        raise ConnectionError('network down')
+    monkeypatch.setattr(YouTubeTranscriptApi, 'get_transcript', flaky)
+    corpus = TranscriptCorpus(str(tmp_path / 'transcripts'))
+    videos = _client().add_transcripts_to_videos([{'title': 't', 'video_id': 'a', 'description': ''}],
+                                                 delay_seconds=0, corpus=corpus)
+    assert list(videos.column('has_transcript')) == [False]
+    assert 'a' not in corpus  # fetched again next run
+
+def test_disabled_transcript_is_stored_as_none(tmp_path, monkeypatch):
+    def disabled(video_id, languages):
+        raise TranscriptsDisabled(video_id)
+    monkeypatch.setattr(YouTubeTranscriptApi, 'get_transcript', disabled)
+    corpus = TranscriptCorpus(str(tmp_path / 'transcripts'))
+    _client().add_transcripts_to_videos([{'title': 't', 'video_id': 'a', 'description': ''}],
+                                        delay_seconds=0, corpus=corpus)
+    assert 'a' in corpus and not corpus.has_transcript('a')
+
+
+def test_read_only_corpus_never_writes(tmp_path):
+    path = str(tmp_path / 'transcripts')
+    writer = TranscriptCorpus(path)
+    writer.append('a', 'text')
+    writer.flush()
+    reader = TranscriptCorpus(path, read_only=True)
+    assert reader.get('a') == 'text'
+    with pytest.raises(ValueError):
+        reader.append('b', 'text')
+    reader.close()
+    writer.close()
+
+
+def test_pool_workers_read_the_corpus_without_writing(tmp_path):
+    from src.extractive_summarizer import ExtractiveSummarizer
+    path = str(tmp_path / 'transcripts')
+    corpus = TranscriptCorpus(path)
+    text = ' '.join(f"Sentence number {i} explains how Amazon Bedrock helps the retail customer." for i in range(40))
+    videos = [{'video_id': f"v{i}", 'title': 't', 'description': 'd', 'industry': 'Retail'} for i in range(4)]
+    for video in videos:
+        corpus.append(video['video_id'], text)
+    index_size = os.path.getsize(path + '.index')
+    summarizer = ExtractiveSummarizer({'max_workers': 2, 'min_videos_for_pool': 1}, corpus=corpus)
+    summaries = summarizer.summarize_videos(videos)
+    assert [s['source'] for s in summaries] == ['transcript'] * 4
+    assert os.path.getsize(path + '.index') == index_size
+    corpus.close()
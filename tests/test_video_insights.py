@@ -0,0 +1,48 @@
+import json
+
+from config.config import MODEL_CONFIGS
+from src.video_insights import VideoInsightExtractor, ROLLUP_INSTRUCTIONS
+
+class FakeManager:
+    def __init__(self):
+        self.calls = []
+
+    async def agenerate_response(self, model_name, prompt, prefix=None):
+        self.calls.append(prompt)
+        if prefix == ROLLUP_INSTRUCTIONS:
+            if prompt.startswith('Industry: FSI'):
+                raise RuntimeError('throttled')
+            return 'RCG conclusion'
+        return json.dumps({'use_case': 'search', 'aws_services': ['Amazon S3'], 'customer': None})
+
+    async def aclose(self):
+        pass
+
+class FakeCache:
+    def __init__(self):
+        self.data = {}
+
+    def get(self, key):
+        return self.data.get(key)
+
+    def set(self, key, value):
+        self.data[key] = value
+
+VIDEOS = [
+    {'industry': 'RCG', 'video_id': '1', 'title': 'a', 'description': 'retail'},
+    {'industry': 'FSI', 'video_id': '2', 'title': 'b', 'description': 'banking'},
+]
+
+def test_failed_rollup_keeps_the_others():
+    manager, cache = FakeManager(), FakeCache()
+    extractor = VideoInsightExtractor(MODEL_CONFIGS['nova'], model_manager=manager, cache=cache)
+    records, rollups = extractor.build(VIDEOS)
+    assert [record['industry'] for record in records] == ['RCG', 'FSI']
+    assert rollups == {'RCG': 'RCG conclusion'}
+    assert 'RCG conclusion' in cache.data.values()
+
+    # The RCG rollup is reused and only FSI is asked for again
+    manager.calls.clear()
+    records, rollups = extractor.build(VIDEOS)
+    assert rollups == {'RCG': 'RCG conclusion'}
+    assert len(manager.calls) == 1 and manager.calls[0].startswith('Industry: FSI')
@@ -0,0 +1,50 @@
+import pandas as pd
+import pytest
+
+from src.video_records import VideoCollection
+
+RECORDS = [
+    {'title': 'a', 'video_id': '1', 'industry': 'RCG'},
+    {'title': 'b', 'video_id': '2', 'industry': 'FSI'},
+    {'title': 'c', 'video_id': '3', 'industry': None},
+    {'title': 'd', 'video_id': '4', 'industry': 'RCG'},
+]
+
+def test_views_share_storage_and_write_through():
+    videos = VideoCollection.from_records(RECORDS)
+    groups = videos.group_by_industry()
+    assert list(groups) == ['RCG', 'FSI']
+    assert [v['title'] for v in groups['RCG']] == ['a', 'd']
+    assert [v['title'] for v in videos.sort_by_industry()] == ['b', 'a', 'd', 'c']
+
+    view = groups['RCG'].view([1])
+    assert len(view) == 1 and view[0]['video_id'] == '4'
+    view[0]['title'] = 'd2'
+    groups['RCG'].set_column('industry', ['AUTO', 'AUTO'])
+    assert videos[3]['title'] == 'd2'
+    assert videos.column('industry') == ['AUTO', 'FSI', None, 'AUTO']
+    with pytest.raises(TypeError):
+        view.append({'title': 'e'})
+    with pytest.raises(TypeError):
+        view[0]['summary'] = 'new column'
+
+def test_row_count_is_explicit():
+    videos = VideoCollection(columns=('industry', 'title'))
+    assert len(videos) == 0
+    videos.set_column('title', ['a', 'b'])
+    assert len(videos) == 2
+    assert videos.to_records() == [{'industry': None, 'title': 'a'}, {'industry': None, 'title': 'b'}]
+    videos.append({'title': 'c', 'industry': 'FSI', 'summary': 's'})
+    assert len(videos) == 3
+    assert videos.column('summary') == [None, None, 's']
+    assert videos[-1]['industry'] == 'FSI'
+    assert len(VideoCollection.from_records(videos.view([2, 0]))) == 2
+
+def test_dataframe_round_trip():
+    videos = VideoCollection.from_records(RECORDS)
+    df = videos.to_dataframe()
+    assert isinstance(df['industry'].dtype, pd.CategoricalDtype)
+    again = VideoCollection.from_dataframe(df)
+    assert len(again) == 4
+    assert again.to_records() == videos.to_records()
+    assert len(VideoCollection.from_dataframe(df[['title']])) == 4
@@ -0,0 +1,137 @@
+import threading
+import time
+
+import pytest
+
+import main
+from src.work_queue import Heartbeat, WorkQueue
+
+QUEUE = 'test'
+
+class FakeManager:
+    def __init__(self, model_config):
+        pass
+
+    def log_usage(self):
+        pass
+
+@pytest.fixture
+def make_queue(tmp_path):
+    queues = []
+
+    def make(**config):
+        work_queue = WorkQueue(str(tmp_path / 'queue.db'), {'poll_seconds': 0.01, **config})
+        queues.append(work_queue)
+        return work_queue
+    yield make
+    for work_queue in queues:
+        work_queue.close()
+
+def test_claim_complete_and_reuse(make_queue):
+    work_queue = make_queue()
+    assert work_queue.enqueue(QUEUE, {'a': {'n': 1}, 'b': {'n': 2}}) == 2
+    job = work_queue.claim(QUEUE, 'w1')
+    assert job['attempts'] == 1
+    assert work_queue.complete(QUEUE, job['job_id'], 'w1', {'done': job['payload']['n']})
+    assert work_queue.results(QUEUE) == {job['job_id']: {'done': job['payload']['n']}}
+    # Unchanged finished jobs are kept; only the changed one is queued again
+    assert work_queue.enqueue(QUEUE, {'a': {'n': 1}, 'b': {'n': 3}}) == (2 if job['job_id'] == 'b' else 1)
+
+def test_jobs_no_longer_requested_are_removed(make_queue):
+    work_queue = make_queue(max_attempts=1)
+    work_queue.enqueue(QUEUE, {'a': {}, 'b': {}, 'c': {}})
+    work_queue.claim(QUEUE, 'w1')  # a
+    work_queue.fail(QUEUE, 'a', 'w1', RuntimeError('boom'))
+    work_queue.claim(QUEUE, 'w1')  # b, leased when the coordinator restarts
+    # A resumed coordinator that already has a and b only asks for c
+    assert work_queue.enqueue(QUEUE, {'c': {}}) == 0
+    assert work_queue.counts(QUEUE) == {'pending': 1}
+    assert work_queue.errors(QUEUE) == {}
+    assert not work_queue.complete(QUEUE, 'b', 'w1', 'late')
+    assert work_queue.claim(QUEUE, 'w2')['job_id'] == 'c'
+    assert work_queue.claim(QUEUE, 'w2') is None
+
+def test_expired_lease_is_reclaimed_and_old_owner_cannot_complete(make_queue):
+    work_queue = make_queue(lease_seconds=-1, max_attempts=3)
+    work_queue.enqueue(QUEUE, {'a': {}})
+    assert work_queue.claim(QUEUE, 'w1')['attempts'] == 1
+    job = work_queue.claim(QUEUE, 'w2')
+    assert job['attempts'] == 2
+    assert not work_queue.heartbeat(QUEUE, 'a', 'w1')
+    assert not work_queue.complete(QUEUE, 'a', 'w1', 'stale')
+    assert work_queue.complete(QUEUE, 'a', 'w2', 'fresh')
+    assert work_queue.results(QUEUE) == {'a': 'fresh'}
+
+def test_expired_lease_fails_after_max_attempts(make_queue):
+    work_queue = make_queue(lease_seconds=-1, max_attempts=2)
+    work_queue.enqueue(QUEUE, {'a': {}})
+    assert work_queue.claim(QUEUE, 'w1')
+    assert work_queue.claim(QUEUE, 'w2')
+    assert work_queue.claim(QUEUE, 'w3') is None
+    assert 'lease expired' in work_queue.errors(QUEUE)['a']
+
+def test_fail_requeues_until_max_attempts(make_queue):
+    work_queue = make_queue(max_attempts=2)
+    work_queue.enqueue(QUEUE, {'a': {}})
+    for worker_id in ('w1', 'w2'):
+        work_queue.claim(QUEUE, worker_id)
+        work_queue.fail(QUEUE, 'a', worker_id, RuntimeError('boom'))
+    assert work_queue.counts(QUEUE) == {'failed': 1}
+    assert work_queue.errors(QUEUE) == {'a': 'boom'}
+    assert work_queue.claim(QUEUE, 'w3') is None
+
+def test_heartbeat_notices_a_lost_lease(make_queue):
+    work_queue = make_queue(lease_seconds=-1, heartbeat_seconds=0.01)
+    work_queue.enqueue(QUEUE, {'a': {}})
+    work_queue.claim(QUEUE, 'w1')
+    work_queue.claim(QUEUE, 'w2')
+    with Heartbeat(work_queue, QUEUE, 'a', 'w1') as heartbeat:
+        deadline = time.time() + 5
+        while not heartbeat.lost and time.time() < deadline:
+            time.sleep(0.01)
+    assert heartbeat.lost
+
+def test_generations(make_queue):
+    work_queue = make_queue()
+    assert work_queue.state(QUEUE) == (0, None)
+    work_queue.enqueue(QUEUE, {'a': {}})
+    assert work_queue.state(QUEUE) == (1, 'open')
+    work_queue.finish(QUEUE)
+    assert work_queue.state(QUEUE) == (1, 'finished')
+    work_queue.enqueue(QUEUE, {'a': {}})
+    assert work_queue.state(QUEUE) == (2, 'open')
+
+def test_worker_waits_for_the_coordinator_despite_old_finished_jobs(make_queue, monkeypatch):
+    monkeypatch.setitem(main.WORK_QUEUE_CONFIG, 'poll_seconds', 0.01)
+    monkeypatch.setattr(main, 'ModelManager', FakeManager)
+    monkeypatch.setattr(main, 'generate_industry_insight',
+                        lambda industry, videos, *args: {'industry': industry, 'videos': len(videos)})
+    work_queue = make_queue()
+    job = {'model': 'nova', 'industry': 'Retail', 'videos': [{'title': 't', 'description': 'd'}]}
+    # A finished run from earlier: every job done, generation finished
+    work_queue.enqueue(main.STEP3_QUEUE, {'Retail': job})
+    work_queue.claim(main.STEP3_QUEUE, 'old')
+    work_queue.complete(main.STEP3_QUEUE, 'Retail', 'old', {'industry': 'Retail'})
+    work_queue.finish(main.STEP3_QUEUE)
+
+    completed = []
+    worker = threading.Thread(target=lambda: completed.append(main.run_worker(work_queue, 'w1')))
+    worker.start()
+    time.sleep(0.1)
+    assert worker.is_alive()
+
+    work_queue.enqueue(main.STEP3_QUEUE, {'Retail': job, 'Health': {**job, 'industry': 'Health'}})
+    results = main.collect_industry_insights({'Retail': job, 'Health': job}, work_queue)
+    work_queue.finish(main.STEP3_QUEUE)
+    worker.join(5)
+    assert not worker.is_alive()
+    assert completed == [1]
+    assert sorted(record['industry'] for record in results) == ['Health', 'Retail']
+
+def test_coordinator_timeout(make_queue, monkeypatch):
+    monkeypatch.setitem(main.WORK_QUEUE_CONFIG, 'poll_seconds', 0.01)
+    monkeypatch.setitem(main.WORK_QUEUE_CONFIG, 'coordinator_timeout_seconds', 0.05)
+    work_queue = make_queue()
+    work_queue.enqueue(main.STEP3_QUEUE, {'Retail': {}})
+    with pytest.raises(RuntimeError, match='timed out'):
+        main.collect_industry_insights({'Retail': {}}, work_queue)